@@ -1,5 +1,6 @@
-from tictactoe.game import Game
+import sys
+
+from tictactoe.cli import main
 
 if __name__ == '__main__':
-    game = Game()
-    game.run()
\ No newline at end of file
+    sys.exit(main())
@@ -161,17 +161,18 @@ def check_cells(player: str, board: Board, idx: int,
     :return: True if player has marked nb_marks consecutive cells in board in any direction starting from cell index
     False otherwise
     """
-    if nb_marks == 0:
-        return True
+    for _ in range(nb_marks):
+        if not has_idx(player, board, idx):
+            return False
 
-    (x, y) = get_xy(idx)
-    x += add_x
-    y += add_y
-    next_idx = get_idx(x, y)
-    if x < 1 or x > width or y < 1 or y > height:  # Board overflow detection
-        next_idx = -1
+        (x, y) = get_xy(idx)
+        x += add_x
+        y += add_y
+        idx = get_idx(x, y)
+        if x < 1 or x > width or y < 1 or y > height:  # Board overflow detection
+            idx = -1
 
-    return has_idx(player, board, idx) and check_cells(player, board, next_idx, add_x, add_y, nb_marks - 1)
+    return True
 
 
 def check_win(player: str, board: Board, win_size: int = BOARD_WIN_SIZE) -> bool:
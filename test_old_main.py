@@ -10,3 +10,17 @@ def test_get_xy(idx, expected):
 
 def test_has_idx():
     assert has_idx('X', ['X'], 0)
+
+
+@pytest.mark.parametrize("board,add_x,add_y,expected", [
+    (['X', 'X', 'X', ' ', ' ', ' ', ' ', ' ', ' '], 1, 0, True),
+    (['X', 'X', ' ', ' ', ' ', ' ', ' ', ' ', ' '], 1, 0, False),
+    (['X', ' ', ' ', 'X', ' ', ' ', 'X', ' ', ' '], 0, 1, True),
+    ([' ', ' ', 'X', ' ', 'X', ' ', 'X', ' ', ' '], 1, 0, False),
+])
+def test_check_cells(board, add_x, add_y, expected):
+    assert check_cells('X', board, 0 if board[0] == 'X' else 2, add_x, add_y) is expected
+
+
+def test_check_win_forward_diagonal():
+    assert check_win('X', [' ', ' ', 'X', ' ', 'X', ' ', 'X', ' ', ' '])
@@ -0,0 +1,5 @@
+import sys
+
+from tictactoe.cli import main
+
+sys.exit(main())
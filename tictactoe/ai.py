@@ -0,0 +1,292 @@
+import time
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from tictactoe.board import Board, BoardSnapshot
+from tictactoe.threats import ThreatTracker
+
+if TYPE_CHECKING:
+    from tictactoe.game import Game
+
+WIN = 1_000_000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def to_table(value: int, ply: int) -> int:
+    """
+    Make a win or loss value relative to the position it is stored for, instead of the search root.
+
+    :param value: Position value, WIN - ply for a win at given ply from root
+    :param ply: Number of moves played since root
+    :return: Value to store
+    """
+    if value > WIN // 2:
+        return value + ply
+    if value < -WIN // 2:
+        return value - ply
+    return value
+
+
+def from_table(value: int, ply: int) -> int:
+    """
+    Make a stored win or loss value relative to the search root again.
+
+    :param value: Stored value
+    :param ply: Number of moves played since root
+    :return: Position value
+    """
+    if value > WIN // 2:
+        return value - ply
+    if value < -WIN // 2:
+        return value + ply
+    return value
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised inside search when the time or node budget of current move is spent.
+    """
+
+
+class TranspositionTable:
+    """
+    Fixed size transposition table indexed by Zobrist hash.
+
+    An entry is replaced by an entry of another position if it comes from a previous search,
+    or if the new entry has been searched at least as deep.
+    """
+
+    def __init__(self, size: int = 1 << 16) -> None:
+        if size <= 0 or size & (size - 1):
+            raise ValueError(f'Transposition table size must be a power of 2, got {size}')
+        self.mask = size - 1
+        self.entries: List[Optional[Tuple[int, int, int, int, int, int]]] = [None] * size
+        self.generation = 0
+
+    def new_search(self) -> None:
+        """
+        Mark current entries as coming from a previous search, making them first candidates for replacement.
+        """
+        self.generation += 1
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        self.entries = [None] * len(self.entries)
+
+    def get(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Get stored search result for given position.
+
+        :param key: Position hash
+        :return: (depth, value, flag, best move) or None if position is not stored
+        """
+        entry = self.entries[key & self.mask]
+        if entry is None or entry[0] != key:
+            return None
+        return entry[1:5]
+
+    def put(self, key: int, depth: int, value: int, flag: int, move: int) -> None:
+        """
+        Store search result for given position, following replacement policy.
+
+        :param key: Position hash
+        :param depth: Searched depth
+        :param value: Position value for the player to move
+        :param flag: EXACT, LOWER (value is a lower bound) or UPPER (value is an upper bound)
+        :param move: Best move found (cell number)
+        """
+        idx = key & self.mask
+        entry = self.entries[idx]
+        if entry is None or entry[0] == key or entry[5] != self.generation or depth >= entry[1]:
+            self.entries[idx] = (key, depth, value, flag, move, self.generation)
+
+
+class NegamaxPlayer:
+    """
+    Computer player searching moves with negamax, alpha-beta pruning, iterative deepening
+    and a Zobrist-hashed transposition table.
+
+    With more than 2 players, the search is paranoid: every other player is considered as an opponent of the player to
+    choose a move. Stored values then depend on that player, so the table is cleared when it changes.
+
+    On large boards, moves are generated by a ThreatTracker: only cells near existing marks are searched,
+    most threatening first, and positions at depth limit are evaluated from open runs.
+    """
+
+    def __init__(self, max_time: float = 1.0, max_nodes: Optional[int] = None, table_size: int = 1 << 16,
+                 threats_from: int = 17, max_candidates: Optional[int] = 12) -> None:
+        """
+        :param max_time: Time budget per move, in seconds
+        :param max_nodes: Node budget per move, None for no limit
+        :param table_size: Number of transposition table entries (power of 2)
+        :param threats_from: Board size (number of cells) from which threat-space search is used
+        :param max_candidates: Maximum number of moves searched per position in threat-space search, None for all
+        """
+        self.max_time = max_time
+        self.max_nodes = max_nodes
+        self.threats_from = threats_from
+        self.max_candidates = max_candidates
+        self.tracker: Optional[ThreatTracker] = None
+        self.table = TranspositionTable(table_size)
+        self.nodes = 0
+        self.deadline = 0.0
+        self.clock_mask = 1023
+        self.depth_reached = 0
+        self.root_player: Optional[str] = None
+
+    def get_choice(self, game: 'Game', player: str) -> int:
+        """
+        Choose a cell for given player, searching as deep as the budget allows.
+
+        :param game: Game to play
+        :param player: Player marker
+        :return: Best cell number found
+        """
+        board = Board.from_snapshot(BoardSnapshot(game.board.width, game.board.height, tuple(game.board.cells)))
+        players = list(game.players)
+        root = players.index(player)
+        self.tracker = None
+        if len(board) >= self.threats_from:
+            self.tracker = ThreatTracker(board, game.nb_marks, players).attach()
+        moves = self.order_moves(board, player, None)
+        if not moves:
+            raise ValueError('Board is full, no move can be chosen')
+
+        if len(players) > 2 and player != self.root_player:
+            self.table.clear()
+        self.root_player = player
+        self.table.new_search()
+        self.nodes = 0
+        self.deadline = time.perf_counter() + self.max_time
+        # Threat-space nodes are slow enough to read the clock at each of them, plain nodes only every 1024
+        self.clock_mask = 0 if self.tracker is not None else 1023
+        self.depth_reached = 0
+
+        best_move = moves[0]
+        for depth in range(1, board.cells.count(' ') + 1):
+            try:
+                value, move = self.search(board, game.nb_marks, players, root, root, depth, 0, -WIN - 1, WIN + 1)
+            except BudgetExceeded:
+                break
+            best_move = move
+            self.depth_reached = depth
+            if abs(value) >= WIN - len(board):
+                break
+        return best_move
+
+    def order_moves(self, board: Board, player: str, first: Optional[int]) -> List[int]:
+        """
+        List available cells, best move candidate first, then from the center of the board outwards,
+        or by threat level in threat-space search.
+
+        :param board: Board to play on
+        :param player: Player to move
+        :param first: Cell to try first, if any
+        :return: Available cell numbers
+        """
+        if self.tracker is not None:
+            moves = self.tracker.ordered_moves(player, self.max_candidates)
+            if first in moves:
+                moves.remove(first)
+                moves.insert(0, first)
+            return moves
+
+        center_x = (board.width - 1) / 2
+        center_y = (board.height - 1) / 2
+        moves = [cell_id + 1 for cell_id, cell in enumerate(board.cells) if cell == ' ']
+        moves.sort(key=lambda c: abs((c - 1) % board.width - center_x) + abs((c - 1) // board.width - center_y))
+        if first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def evaluate(self, board: Board, players: List[str], mover: int) -> int:
+        """
+        Heuristic value of a non terminal position for the player to move, used when depth is reached.
+
+        :param board: Board to evaluate
+        :param players: Players markers
+        :param mover: Index of player to move
+        :return: Position value
+        """
+        if self.tracker is None:
+            return 0
+        return max(-WIN // 2, min(WIN // 2, self.tracker.evaluate(players[mover])))
+
+    def search(self, board: Board, nb_marks: int, players: List[str], root: int, mover: int, depth: int,
+               ply: int, alpha: int, beta: int) -> Tuple[int, int]:
+        """
+        Negamax search of given position.
+
+        :param board: Board to search, restored as is when returning
+        :param nb_marks: Number of adjacent marks to get a victory
+        :param players: Players markers
+        :param root: Index of player choosing a move
+        :param mover: Index of player to move
+        :param depth: Remaining depth to search
+        :param ply: Number of moves played since root
+        :param alpha: Lower bound of interesting values
+        :param beta: Upper bound of interesting values
+        :return: Position value for player to move and best move found
+        """
+        self.nodes += 1
+        if self.nodes & self.clock_mask == 0 and time.perf_counter() > self.deadline:
+            raise BudgetExceeded()
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise BudgetExceeded()
+
+        alpha_orig = alpha
+        tt_move = None
+        key = board.key(players[mover])
+        entry = self.table.get(key)
+        if entry is not None:
+            tt_depth, tt_value, tt_flag, tt_move = entry
+            tt_value = from_table(tt_value, ply)
+            if tt_depth >= depth and ply > 0:
+                if tt_flag == EXACT:
+                    return tt_value, tt_move
+                if tt_flag == LOWER:
+                    alpha = max(alpha, tt_value)
+                elif tt_flag == UPPER:
+                    beta = min(beta, tt_value)
+                if alpha >= beta:
+                    return tt_value, tt_move
+
+        player = players[mover]
+        nxt = (mover + 1) % len(players)
+        same_side = (mover == root) == (nxt == root)
+
+        best_value, best_move = -WIN - 1, 0
+        for cell in self.order_moves(board, player, tt_move):
+            board.place_choice(cell, player)
+            if board.check_victory_at(cell, player, nb_marks):
+                value = WIN - ply
+            elif board.is_full():
+                value = 0
+            elif depth <= 1:
+                value = self.evaluate(board, players, nxt)
+                value = value if same_side else -value
+            else:
+                if same_side:
+                    value, _ = self.search(board, nb_marks, players, root, nxt, depth - 1, ply + 1, alpha, beta)
+                else:
+                    value, _ = self.search(board, nb_marks, players, root, nxt, depth - 1, ply + 1, -beta, -alpha)
+                    value = -value
+            board.undo()
+
+            if value > best_value:
+                best_value, best_move = value, cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= alpha_orig:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.put(key, depth, to_table(best_value, ply), flag, best_move)
+        return best_value, best_move
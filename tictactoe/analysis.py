@@ -0,0 +1,375 @@
+"""
+Streaming analysis of archived games, built from lazy generator stages.
+
+    records = read_inputs(['games.txt', 'games.ttr'], Config())
+    games = annotate(records, solver=SolvedPositions(3, 3, 3, ('X', 'O')))
+    stats = aggregate(games)
+
+Each stage pulls one game at a time from the previous one, so memory does not depend on the number of games.
+Input files are independent shards: analyze() aggregates each of them in a pool worker and merges the aggregates.
+
+Text inputs hold one game per line, as cell numbers separated by spaces or commas. Empty lines and lines starting
+with "#" are skipped, as well as lines with moves that are not cell numbers of the board or that repeat a cell,
+reported on standard error. Binary inputs are game records files (see tictactoe.record), recognized by their magic
+bytes. Blunders of each game are detected with the solver of its own board configuration. Games without one, like
+games of more than 2 players or on boards too large to solve in memory, are aggregated without blunders.
+"""
+import argparse
+import json
+import sys
+from collections import Counter
+from functools import lru_cache
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Protocol, Sequence, TextIO, Tuple
+
+from tictactoe.cli import EXACT_SOLVE_SIZE
+from tictactoe.record import MAGIC, GameRecord, read_stream, replay
+from tictactoe.simulation import Config
+from tictactoe.tablebase import SolvedPositions, Tablebase
+
+
+class Solver(Protocol):
+    """
+    Game-theoretic values of positions, like a Tablebase.
+    """
+
+    def lookup(self, cells: Sequence[str]) -> Optional[Tuple[int, List[int]]]:
+        """
+        Get game-theoretic value and best moves of given position.
+
+        :param cells: Board cells
+        :return: (value for player to move: 1 win, 0 draw, -1 loss, best cell numbers)
+        or None if position is not reachable
+        """
+
+
+class Position(NamedTuple):
+    """
+    Position reached by a move of a game.
+    """
+    ply: int
+    player: str
+    cell: int
+    won: bool
+    full: bool
+    value: Optional[int] = None
+    """Game-theoretic value of the move for its player, None without solver"""
+    blunder: bool = False
+    """True if the move is worse than the best move of the position it was played from"""
+
+
+class AnnotatedGame(NamedTuple):
+    record: GameRecord
+    positions: List[Position]
+    winner: Optional[str]
+
+
+def invalid_move(moves: Sequence[str], size: int) -> Optional[str]:
+    """
+    Find the first invalid move of a text game.
+
+    :param moves: Moves of the game
+    :param size: Number of cells of the board
+    :return: First move which is not a cell number of the board or repeats a cell, None if every move is valid
+    """
+    played = set()
+    for move in moves:
+        if not move.isdigit() or not 1 <= int(move) <= size or int(move) in played:
+            return move
+        played.add(int(move))
+    return None
+
+
+def parse_moves(lines: Iterable[str], config: Config) -> Iterator[GameRecord]:
+    """
+    Parse text games, one per line. Lines with an invalid move are reported on standard error and skipped.
+
+    :param lines: Text lines
+    :param config: Board configuration and players of the games
+    :return: Game records
+    """
+    size = config.width * config.height
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        moves = line.replace(',', ' ').split()
+        move = invalid_move(moves, size)
+        if move is not None:
+            print(f'Skipping line {number}: "{move}" is not an available cell number', file=sys.stderr)
+            continue
+        yield GameRecord(config.width, config.height, config.nb_marks, tuple(config.players),
+                         tuple(int(move) for move in moves))
+
+
+def read_input(path: str, config: Config) -> Iterator[GameRecord]:
+    """
+    Read games of an input file.
+
+    :param path: Text or game records file path, "-" for standard input (text only)
+    :param config: Board configuration and players of text games
+    :return: Game records
+    """
+    if path == '-':
+        yield from parse_moves(sys.stdin, config)
+        return
+    with open(path, 'rb') as f:
+        binary = f.read(len(MAGIC)) == MAGIC
+        f.seek(0)
+        if binary:
+            yield from read_stream(f)
+            return
+    with open(path) as text:
+        yield from parse_moves(text, config)
+
+
+def read_inputs(paths: Iterable[str], config: Config) -> Iterator[GameRecord]:
+    """
+    Read games of input files, one after the other.
+
+    :param paths: Text or game records files paths, "-" for standard input
+    :param config: Board configuration and players of text games
+    :return: Game records
+    """
+    for path in paths:
+        yield from read_input(path, config)
+
+
+def annotate(records: Iterable[GameRecord], solver: Optional[Solver] = None) -> Iterator[AnnotatedGame]:
+    """
+    Replay games, and annotate each position with its victory and draw status, and its value if a solver is given.
+
+    Replay stops at the first winning move: moves recorded after it are ignored.
+
+    :param records: Game records
+    :param solver: Solver of the records configuration, to detect blunders
+    :return: Annotated games
+    """
+    for record in records:
+        positions = []
+        winner = None
+        expected = solver.lookup([' '] * (record.width * record.height)) if solver else None
+        for ply, board in enumerate(replay(record)):
+            player = record.players[ply % len(record.players)]
+            cell = record.moves[ply]
+            won = board.check_victory_at(cell, player, record.nb_marks)
+            position = Position(ply, player, cell, won, board.is_full())
+            if expected is not None:
+                result = solver.lookup(board.cells)
+                if result is not None:
+                    value = -result[0]
+                    position = position._replace(value=value, blunder=value < expected[0])
+                expected = result
+            positions.append(position)
+            if won:
+                winner = player
+                break
+            if position.full:
+                break
+        yield AnnotatedGame(record, positions, winner)
+
+
+def blunders(games: Iterable[AnnotatedGame]) -> Iterator[Tuple[AnnotatedGame, Position]]:
+    """
+    Select blunders of annotated games.
+
+    :param games: Games annotated with a solver
+    :return: (game, position reached by the blunder) pairs
+    """
+    for game in games:
+        for position in game.positions:
+            if position.blunder:
+                yield game, position
+
+
+class Aggregates:
+    """
+    Statistics of annotated games, which can be merged across shards.
+    """
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.moves = 0
+        self.wins: Counter = Counter()
+        self.draws = 0
+        self.unfinished = 0
+        self.first_moves: Counter = Counter()
+        self.first_move_wins: Counter = Counter()
+        self.blunders: Counter = Counter()
+
+    def add(self, game: AnnotatedGame) -> None:
+        """
+        Add a game to statistics.
+
+        :param game: Annotated game
+        """
+        self.games += 1
+        self.moves += len(game.positions)
+        if game.winner is not None:
+            self.wins[game.winner] += 1
+        elif game.positions and game.positions[-1].full:
+            self.draws += 1
+        else:
+            self.unfinished += 1
+        if game.positions:
+            first = game.positions[0]
+            self.first_moves[first.cell] += 1
+            if game.winner == first.player:
+                self.first_move_wins[first.cell] += 1
+        for position in game.positions:
+            if position.blunder:
+                self.blunders[position.player] += 1
+
+    def merge(self, other: 'Aggregates') -> None:
+        """
+        Add statistics of other games.
+
+        :param other: Statistics to add
+        """
+        self.games += other.games
+        self.moves += other.moves
+        self.wins.update(other.wins)
+        self.draws += other.draws
+        self.unfinished += other.unfinished
+        self.first_moves.update(other.first_moves)
+        self.first_move_wins.update(other.first_move_wins)
+        self.blunders.update(other.blunders)
+
+    def to_dict(self) -> Dict:
+        """
+        :return: JSON serializable statistics
+        """
+        return {
+            'games': self.games,
+            'average_length': self.moves / self.games if self.games else 0.0,
+            'wins': dict(self.wins),
+            'draws': self.draws,
+            'unfinished': self.unfinished,
+            'first_move_win_rates': {cell: self.first_move_wins[cell] / count
+                                     for cell, count in sorted(self.first_moves.items())},
+            'blunders': dict(self.blunders),
+        }
+
+
+def aggregate(games: Iterable[AnnotatedGame]) -> Aggregates:
+    """
+    Consume annotated games into statistics.
+
+    :param games: Annotated games
+    :return: Statistics
+    """
+    stats = Aggregates()
+    for game in games:
+        stats.add(game)
+    return stats
+
+
+@lru_cache(maxsize=None)
+def get_tablebase(path: str) -> Tablebase:
+    """
+    Open a tablebase, once per process.
+
+    :param path: Tablebase file path
+    :return: Tablebase
+    """
+    return Tablebase(path)
+
+
+@lru_cache(maxsize=None)
+def get_solver(config: Config, tablebase: Optional[str] = None, solve: bool = False) -> Optional[Solver]:
+    """
+    Get the solver of a configuration, once per process and configuration.
+
+    :param config: Board configuration and players
+    :param tablebase: Tablebase file path, used if it matches configuration
+    :param solve: Whether to solve positions in memory when no matching tablebase is given, only for 2 players
+    and boards of at most EXACT_SOLVE_SIZE cells
+    :return: Solver, None if there is none for this configuration
+    """
+    if tablebase:
+        found = get_tablebase(tablebase)
+        if found.matches(*config):
+            return found
+    if solve and len(config.players) == 2 and config.width * config.height <= EXACT_SOLVE_SIZE:
+        return SolvedPositions(config.width, config.height, config.nb_marks, config.players)
+    return None
+
+
+def annotate_solved(records: Iterable[GameRecord], tablebase: Optional[str] = None, solve: bool = False
+                    ) -> Iterator[AnnotatedGame]:
+    """
+    Annotate games, each with the solver of its own configuration.
+
+    :param records: Game records
+    :param tablebase: Tablebase file path, used for records of the same configuration
+    :param solve: Whether to solve positions in memory for records without a matching tablebase
+    :return: Annotated games
+    """
+    for record in records:
+        config = Config(record.width, record.height, record.nb_marks, tuple(record.players))
+        yield from annotate((record,), get_solver(config, tablebase, solve))
+
+
+def analyze_shard(path: str, config: Config, tablebase: Optional[str] = None, solve_blunders: bool = False
+                  ) -> Aggregates:
+    """
+    Analyze games of an input file.
+
+    :param path: Text or game records file path, "-" for standard input
+    :param config: Board configuration and players of text games
+    :param tablebase: Tablebase file path to detect blunders with, in games of the same configuration
+    :param solve_blunders: Whether to detect blunders, solving positions in memory if no tablebase matches
+    :return: Statistics of the file games
+    """
+    return aggregate(annotate_solved(read_input(path, config), tablebase, solve_blunders))
+
+
+def _analyze_shard(args: Tuple[str, Config, Optional[str], bool]) -> Aggregates:
+    return analyze_shard(*args)
+
+
+def analyze(paths: Sequence[str], config: Config, tablebase: Optional[str] = None, solve_blunders: bool = False,
+            processes: Optional[int] = None) -> Aggregates:
+    """
+    Analyze games of several input files, each file being a shard analyzed in a pool worker.
+
+    :param paths: Text or game records files paths, "-" for standard input
+    :param config: Board configuration and players of text games
+    :param tablebase: Tablebase file path to detect blunders with
+    :param solve_blunders: Whether to detect blunders, solving positions in memory if no tablebase is given
+    :param processes: Number of worker processes, None for one per CPU, 1 to analyze in current process
+    :return: Statistics of all games
+    """
+    tasks = [(path, config, tablebase, solve_blunders) for path in paths]
+    stats = Aggregates()
+    if processes == 1 or '-' in paths:
+        for shard in map(_analyze_shard, tasks):
+            stats.merge(shard)
+    else:
+        with Pool(processes) as pool:
+            for shard in pool.imap_unordered(_analyze_shard, tasks):
+                stats.merge(shard)
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None, stdout: TextIO = sys.stdout) -> int:
+    parser = argparse.ArgumentParser(description='Analyze archived games')
+    parser.add_argument('paths', nargs='*', default=['-'], help='text or game records files, "-" for stdin')
+    parser.add_argument('--width', type=int, default=3)
+    parser.add_argument('--height', type=int, default=3)
+    parser.add_argument('--nb-marks', type=int, default=3)
+    parser.add_argument('--players', default='XO', help='players markers, e.g. XO')
+    parser.add_argument('--blunders', action='store_true', help='detect blunders, solving positions in memory')
+    parser.add_argument('--tablebase', help='tablebase file to detect blunders with')
+    parser.add_argument('--processes', type=int, help='number of worker processes, one per CPU by default')
+    args = parser.parse_args(argv)
+
+    config = Config(args.width, args.height, args.nb_marks, tuple(args.players))
+    stats = analyze(args.paths, config, args.tablebase, args.blunders, args.processes)
+    json.dump(stats.to_dict(), stdout, indent=2)
+    stdout.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
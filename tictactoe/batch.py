@@ -0,0 +1,319 @@
+"""
+Batch evaluation of many boards of the same dimensions at once, using NumPy.
+
+Boards are stored in an int8 array of shape (N, height, width), where 0 is an empty cell
+and i + 1 is a mark of i-th player of the game players list.
+"""
+from functools import lru_cache
+from typing import NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from tictactoe.bitboard import win_masks
+from tictactoe.board import DIRECTIONS, Board
+
+
+def to_array(boards: Sequence[Board], players: Sequence[str]) -> np.ndarray:
+    """
+    Convert boards of the same dimensions into a batch array.
+
+    :param boards: Boards to convert
+    :param players: Players markers, giving the value stored for each marker
+    :return: int8 array of shape (N, height, width)
+    """
+    width, height = boards[0].width, boards[0].height
+    codes = {player: i + 1 for i, player in enumerate(players)}
+    array = np.zeros((len(boards), height * width), dtype=np.int8)
+    for i, board in enumerate(boards):
+        array[i] = [codes.get(cell, 0) for cell in board.cells]
+    return array.reshape(len(boards), height, width)
+
+
+def has_line(marks: np.ndarray, nb_marks: int) -> np.ndarray:
+    """
+    Check, for each board, if marked cells contain nb_marks adjacent cells in any of the four directions.
+
+    Each direction is a sliding window reduction: cells starting a line are AND-ed with their nb_marks - 1 successors.
+
+    :param marks: bool array of shape (N, height, width)
+    :param nb_marks: Number of adjacent marks to look for
+    :return: bool array of shape (N,)
+    """
+    n, height, width = marks.shape
+    span = nb_marks - 1
+    found = np.zeros(n, dtype=bool)
+    for add_x, add_y in DIRECTIONS:
+        rows = height - span * add_y
+        cols = width - span * abs(add_x)
+        if rows <= 0 or cols <= 0:
+            continue
+        x0 = span if add_x < 0 else 0
+        window = marks[:, 0:rows, x0:x0 + cols].copy()
+        for k in range(1, nb_marks):
+            y = k * add_y
+            x = x0 + k * add_x
+            window &= marks[:, y:y + rows, x:x + cols]
+        found |= window.reshape(n, -1).any(axis=1)
+    return found
+
+
+def check_victories(boards: np.ndarray, nb_marks: int, nb_players: int) -> np.ndarray:
+    """
+    Check victory of every player on every board.
+
+    Gives the same result as calling Board.check_victory for each player on each board.
+
+    :param boards: int8 array of shape (N, height, width)
+    :param nb_marks: Number of adjacent marks to get a victory
+    :param nb_players: Number of players
+    :return: bool array of shape (N, nb_players), True where player has won on board
+    """
+    if nb_marks < 1:
+        raise ValueError(f'nb_marks must be at least 1, got {nb_marks}')
+
+    wins = np.zeros((boards.shape[0], nb_players), dtype=bool)
+    for i in range(nb_players):
+        wins[:, i] = has_line(boards == i + 1, nb_marks)
+    return wins
+
+
+def evaluate(boards: np.ndarray, nb_marks: int, nb_players: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get winner and terminal status of every board.
+
+    :param boards: int8 array of shape (N, height, width)
+    :param nb_marks: Number of adjacent marks to get a victory
+    :param nb_players: Number of players
+    :return: Winners as int8 array of shape (N,), 0 if no winner, i + 1 for i-th player
+    (first one in players order if several players have won),
+    and terminal status as bool array of shape (N,), True if board has a winner or is full
+    """
+    wins = check_victories(boards, nb_marks, nb_players)
+    has_winner = wins.any(axis=1)
+    winners = np.where(has_winner, wins.argmax(axis=1) + 1, 0).astype(np.int8)
+    full = (boards != 0).reshape(boards.shape[0], -1).all(axis=1)
+    return winners, has_winner | full
+
+
+class PlayoutResult(NamedTuple):
+    """
+    Outcome of a batch of playouts.
+    """
+    winners: np.ndarray
+    """int8 array of shape (K,), 0 for a draw, i + 1 if i-th player has won"""
+    moves: np.ndarray
+    """Integer array of shape (K, height * width), cell numbers played in order, 0 after the end of the game.
+    int16 unless the board has more cells"""
+    lengths: np.ndarray
+    """Integer array of shape (K,), number of moves played, with the same type as moves"""
+
+    def distribution(self, nb_players: int) -> np.ndarray:
+        """
+        Get frequencies of game outcomes.
+
+        :param nb_players: Number of players
+        :return: float array of shape (nb_players + 1,): draws frequency, then each player's winning frequency
+        """
+        return np.bincount(self.winners, minlength=nb_players + 1) / len(self.winners)
+
+
+LOOKUP_SIZE = 20
+
+
+def int_type(limit: int) -> type:
+    """
+    :param limit: Largest value to store
+    :return: Smallest signed integer type of at least 16 bits holding values up to limit
+    """
+    for dtype in (np.int16, np.int32):
+        if limit <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+@lru_cache(maxsize=None)
+def win_table(width: int, height: int, nb_marks: int) -> np.ndarray:
+    """
+    Winning status of every possible set of marks of a player, for boards of at most LOOKUP_SIZE cells.
+
+    :param width: Board width
+    :param height: Board height
+    :param nb_marks: Number of adjacent marks to get a victory
+    :return: bool array of shape (2 ** (height * width),), indexed by marks bitmask (bit i for cell i + 1)
+    """
+    masks, _ = win_masks(width, height, nb_marks)
+    marks = np.arange(1 << (width * height), dtype=np.int64)
+    table = np.zeros(len(marks), dtype=bool)
+    for mask in masks:
+        table |= (marks & mask) == mask
+    return table
+
+
+class LookupChecker:
+    """
+    Victory checks of boards of at most LOOKUP_SIZE cells, looking each player's marks bitmask up in win_table.
+    """
+
+    def __init__(self, flat: np.ndarray, width: int, height: int, nb_marks: int, nb_players: int) -> None:
+        """
+        :param flat: int8 array of shape (K, height * width)
+        :param width: Board width
+        :param height: Board height
+        :param nb_marks: Number of adjacent marks to get a victory
+        :param nb_players: Number of players
+        """
+        self.table = win_table(width, height, nb_marks)
+        weights = np.left_shift(1, np.arange(width * height, dtype=np.int64))
+        self.bits = np.stack([(flat == i + 1) @ weights for i in range(nb_players)], axis=1)
+
+    def place(self, cells: np.ndarray, movers: np.ndarray) -> np.ndarray:
+        """
+        Place a mark on every board, and check if it wins.
+
+        :param cells: Cell indexes (0 based), shape (K,)
+        :param movers: Player indexes (0 based), shape (K,)
+        :return: bool array of shape (K,)
+        """
+        indexes = np.arange(len(cells))
+        marks = self.bits[indexes, movers] | np.left_shift(1, cells)
+        self.bits[indexes, movers] = marks
+        return self.table[marks]
+
+    def keep(self, kept: np.ndarray) -> None:
+        """
+        Drop boards of finished games.
+
+        :param kept: bool array of shape (K,), True for boards to keep
+        """
+        self.bits = self.bits[kept]
+
+
+class ScanChecker:
+    """
+    Victory checks of large boards, counting marks on both sides of the played cell like Board.check_victory_at.
+
+    Boards are surrounded by nb_marks - 1 empty cells, so that scans never need bounds checks.
+    """
+
+    def __init__(self, flat: np.ndarray, width: int, height: int, nb_marks: int, nb_players: int) -> None:
+        """
+        :param flat: int8 array of shape (K, height * width)
+        :param width: Board width
+        :param height: Board height
+        :param nb_marks: Number of adjacent marks to get a victory
+        :param nb_players: Number of players
+        """
+        span = nb_marks - 1
+        self.nb_marks = nb_marks
+        self.stride = width + 2 * span
+        padded = np.zeros((len(flat), height + 2 * span, self.stride), dtype=np.int8)
+        padded[:, span:span + height, span:span + width] = flat.reshape(-1, height, width)
+        self.boards = padded.reshape(len(flat), -1)
+        cells = np.arange(width * height)
+        self.positions = (cells // width + span) * self.stride + cells % width + span
+        self.offsets = [add_x + add_y * self.stride for add_x, add_y in DIRECTIONS]
+
+    def place(self, cells: np.ndarray, movers: np.ndarray) -> np.ndarray:
+        """
+        Place a mark on every board, and check if it wins.
+
+        :param cells: Cell indexes (0 based), shape (K,)
+        :param movers: Player indexes (0 based), shape (K,)
+        :return: bool array of shape (K,)
+        """
+        positions = np.arange(len(cells)) * self.boards.shape[1] + self.positions[cells]
+        codes = (movers + 1).astype(np.int8)
+        marks = self.boards.reshape(-1)
+        marks[positions] = codes
+        indexes = np.arange(len(cells))
+        won = np.zeros(len(cells), dtype=bool)
+        count_type = int_type(2 * self.nb_marks)
+        for offset in self.offsets:
+            count = np.ones(len(cells), dtype=count_type)
+            for step in (offset, -offset):
+                # Boards whose run of marks still goes on
+                run = indexes
+                for k in range(1, self.nb_marks):
+                    run = run[marks.take(positions[run] + k * step) == codes[run]]
+                    if not len(run):
+                        break
+                    count[run] += 1
+            won |= count >= self.nb_marks
+        return won
+
+    def keep(self, kept: np.ndarray) -> None:
+        """
+        Drop boards of finished games.
+
+        :param kept: bool array of shape (K,), True for boards to keep
+        """
+        self.boards = self.boards[kept]
+
+
+def playout(boards: np.ndarray, nb_marks: int, nb_players: int, to_move: Union[int, np.ndarray] = 0,
+            rng: Optional[np.random.Generator] = None) -> PlayoutResult:
+    """
+    Play random moves on every board until it has a winner or is full, advancing all games one ply at a time.
+
+    Playing uniformly random legal moves is the same as playing empty cells in a random order, so each game's order
+    is drawn once for all, with a single argsort of random keys where occupied cells sort last.
+    Players play in turn, rolling on players list like Game.get_next_player, and each move is checked like
+    Board.check_victory_at. Finished games are dropped from the working arrays.
+
+    :param boards: int8 array of shape (K, height, width), left unchanged
+    :param nb_marks: Number of adjacent marks to get a victory
+    :param nb_players: Number of players
+    :param to_move: Index (0 based) of the player to play first, for all boards or as an array of shape (K,)
+    :param rng: NumPy random generator, a new unseeded one if not given
+    :return: Outcome of each game
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    k, height, width = boards.shape
+    size = width * height
+    flat = boards.reshape(k, size)
+
+    winners, terminal = evaluate(boards, nb_marks, nb_players)
+    keys = rng.random(flat.shape)
+    keys[flat != 0] = 2.0
+    cell_type = int_type(size)
+    orders = np.argsort(keys, axis=1).astype(cell_type)
+    lengths = np.zeros(k, dtype=cell_type)
+
+    rows = np.flatnonzero(~terminal)
+    nb_free = (flat[rows] == 0).sum(axis=1)
+    first = np.broadcast_to(np.asarray(to_move, dtype=np.intp), (k,))[rows]
+    checker_class = LookupChecker if size <= LOOKUP_SIZE else ScanChecker
+    checker = checker_class(flat[rows], width, height, nb_marks, nb_players)
+
+    for ply in range(size):
+        if not len(rows):
+            break
+        movers = (first + ply) % nb_players
+        won = checker.place(orders[rows, ply].astype(np.intp), movers)
+        ended = won | (nb_free <= ply + 1)
+        if ended.any():
+            winners[rows[won]] = movers[won] + 1
+            lengths[rows[ended]] = ply + 1
+            kept = ~ended
+            rows, nb_free, first = rows[kept], nb_free[kept], first[kept]
+            checker.keep(kept)
+
+    moves = np.where(np.arange(size) < lengths[:, None], orders + 1, 0).astype(cell_type)
+    return PlayoutResult(winners, moves, lengths)
+
+
+def random_playouts(nb_games: int, width: int = 3, height: int = 3, nb_marks: int = 3, nb_players: int = 2,
+                    seed: Optional[int] = None) -> PlayoutResult:
+    """
+    Play random games from an empty board.
+
+    :param nb_games: Number of games to play
+    :param width: Board width
+    :param height: Board height
+    :param nb_marks: Number of adjacent marks to get a victory
+    :param nb_players: Number of players
+    :param seed: Random seed, for reproducible playouts
+    :return: Outcome of each game
+    """
+    boards = np.zeros((nb_games, height, width), dtype=np.int8)
+    return playout(boards, nb_marks, nb_players, rng=np.random.default_rng(seed))
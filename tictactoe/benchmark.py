@@ -0,0 +1,199 @@
+"""
+Benchmarks of Board and Game hot paths over a matrix of board sizes, nb_marks and player counts.
+
+Results are written as JSON, and can be compared with a saved baseline to catch regressions::
+
+    python -m tictactoe.benchmark --output baseline.json
+    python -m tictactoe.benchmark --compare baseline.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from tictactoe.board import Board
+from tictactoe.cli import parse_ints, parse_sizes
+from tictactoe.game import Game
+from tictactoe.simulation import RandomPolicy
+
+PLAYERS = ('X', 'O', '#', '@', '%')
+DEFAULT_SIZES = ((3, 3), (10, 10), (100, 100), (1000, 1000))
+MAX_GAME_CELLS = 10_000
+
+
+def measure(func: Callable[[], object], min_time: float = 0.05, repeat: int = 3) -> float:
+    """
+    Time given function.
+
+    :param func: Function to call
+    :param min_time: Minimum duration of a timed batch of calls, in seconds
+    :param repeat: Number of timed batches
+    :return: Best time per call, in seconds
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def half_filled_board(width: int, height: int, players: Sequence[str], rnd: random.Random) -> Board:
+    """
+    Build a board with half of its cells marked at random, in players order.
+
+    :param width: Board width
+    :param height: Board height
+    :param players: Players markers
+    :param rnd: Random generator
+    :return: Board
+    """
+    board = Board(width, height)
+    cells = list(range(1, width * height + 1))
+    rnd.shuffle(cells)
+    for i, cell in enumerate(cells[:len(cells) // 2]):
+        board.place_choice(cell, players[i % len(players)])
+    return board
+
+
+def cases(width: int, height: int, nb_marks: int, players: Sequence[str], seed: int = 0
+          ) -> Iterator[Tuple[str, Callable[[], object]]]:
+    """
+    Generate benchmarked functions of a configuration.
+
+    :param width: Board width
+    :param height: Board height
+    :param nb_marks: Number of adjacent marks to get a victory
+    :param players: Players markers
+    :param seed: Random seed
+    :return: (benchmark name, function to time) pairs
+    """
+    rnd = random.Random(seed)
+    board = half_filled_board(width, height, players, rnd)
+    player = players[0]
+    cell = board.cells.index(player) + 1
+    free = board.cells.index(' ') + 1
+
+    yield 'check_victory', lambda: board.check_victory(player, nb_marks)
+    yield 'check_victory_at', lambda: board.check_victory_at(cell, player, nb_marks)
+    yield 'check_cells', lambda: board.check_cells(cell, player, 1, 0, nb_marks)
+    yield 'next_cell', lambda: board.next_cell(cell, 1, 1)
+    yield 'is_full', board.is_full
+
+    def place_choice():
+        board.place_choice(free, player)
+        board.undo()
+
+    yield 'place_choice', place_choice
+
+    def render():
+        board.renderer.invalidate()
+        return str(board)
+
+    yield '__str__', render
+    yield '__str__ cached', board.__str__
+
+    if width * height <= MAX_GAME_CELLS:
+        def game():
+            engines = {p: RandomPolicy(rnd) for p in players}
+            Game(width, height, nb_marks, list(players), engines=engines).play()
+
+        yield 'game', game
+
+
+def run(sizes: Sequence[Tuple[int, int]], nb_marks_values: Sequence[int], nb_players_values: Sequence[int],
+        min_time: float = 0.05) -> List[Dict[str, object]]:
+    """
+    Run every benchmark of the configuration matrix.
+
+    :param sizes: Board (width, height) sizes
+    :param nb_marks_values: Numbers of adjacent marks to get a victory
+    :param nb_players_values: Numbers of players
+    :param min_time: Minimum duration of a timed batch of calls, in seconds
+    :return: Results, one per benchmark and configuration
+    """
+    results = []
+    for width, height in sizes:
+        for nb_marks in nb_marks_values:
+            for nb_players in nb_players_values:
+                players = PLAYERS[:nb_players]
+                for name, func in cases(width, height, nb_marks, players):
+                    results.append({
+                        'name': name, 'width': width, 'height': height, 'nb_marks': nb_marks,
+                        'players': nb_players, 'seconds': measure(func, min_time),
+                    })
+    return results
+
+
+def result_key(result: Dict[str, object]) -> Tuple:
+    return result['name'], result['width'], result['height'], result['nb_marks'], result['players']
+
+
+def compare(results: List[Dict[str, object]], baseline: List[Dict[str, object]], threshold: float = 0.1
+            ) -> List[Dict[str, object]]:
+    """
+    Compare results with a baseline.
+
+    :param results: Current results
+    :param baseline: Baseline results
+    :param threshold: Relative slowdown above which a benchmark is a regression
+    :return: Current results found in baseline, with their baseline time, ratio and regression flag
+    """
+    baseline_seconds = {result_key(result): result['seconds'] for result in baseline}
+    comparison = []
+    for result in results:
+        base = baseline_seconds.get(result_key(result))
+        if base is None:
+            continue
+        ratio = result['seconds'] / base if base else float('inf')
+        comparison.append({**result, 'baseline': base, 'ratio': ratio, 'regression': ratio > 1 + threshold})
+    return comparison
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark Board and Game hot paths')
+    parser.add_argument('--sizes', type=parse_sizes, default=DEFAULT_SIZES, help='e.g. 3x3,100x100')
+    parser.add_argument('--nb-marks', type=parse_ints, default=[3, 5], help='e.g. 3,5')
+    parser.add_argument('--players', type=parse_ints, default=[2, 3], help='numbers of players, e.g. 2,3')
+    parser.add_argument('--min-time', type=float, default=0.05, help='minimum duration of a timed batch')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare results with')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative slowdown considered a regression')
+    args = parser.parse_args(argv)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': run(args.sizes, args.nb_marks, args.players, args.min_time),
+    }
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            report['comparison'] = compare(report['results'], json.load(f)['results'], args.threshold)
+        regressions = [result for result in report['comparison'] if result['regression']]
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from tictactoe.board import DIRECTIONS
+from tictactoe.renderer import render
+
+
+@lru_cache(maxsize=None)
+def win_masks(width: int, height: int, nb_marks: int) -> Tuple[Tuple[int, ...], Tuple[Tuple[int, ...], ...]]:
+    """
+    Compute bitmasks of every winning line on a board, once per board configuration.
+
+    Bit i of a mask stands for cell number i + 1.
+
+    :param width: Board width
+    :param height: Board height
+    :param nb_marks: Number of adjacent marks to get a victory
+    :return: All winning masks, and for each cell (0 based) the winning masks going through it
+    """
+    masks = []
+    cell_masks: List[List[int]] = [[] for _ in range(width * height)]
+    for y in range(height):
+        for x in range(width):
+            for add_x, add_y in DIRECTIONS:
+                end_x = x + add_x * (nb_marks - 1)
+                end_y = y + add_y * (nb_marks - 1)
+                if not (0 <= end_x < width and end_y < height):
+                    continue
+                cell_ids = [x + add_x * i + (y + add_y * i) * width for i in range(nb_marks)]
+                mask = 0
+                for cell_id in cell_ids:
+                    mask |= 1 << cell_id
+                masks.append(mask)
+                for cell_id in cell_ids:
+                    cell_masks[cell_id].append(mask)
+
+    return tuple(masks), tuple(tuple(m) for m in cell_masks)
+
+
+class BitBoard:
+    """
+    Board storing each player's marks as an integer bitboard.
+
+    Exposes the same API as Board, victory checks being a few AND/compare operations on precomputed winning masks.
+    """
+
+    def __init__(self, width: int = 3, height: int = 3):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.full_mask = (1 << self.size) - 1
+        self.occupied = 0
+        self.bits: Dict[str, int] = {}
+
+    @property
+    def cells(self) -> List[str]:
+        """
+        Board cells as a list of markers, as stored by Board. Built on each access.
+        """
+        cells = [' '] * self.size
+        for player, bits in self.bits.items():
+            for cell_id in range(self.size):
+                if bits >> cell_id & 1:
+                    cells[cell_id] = player
+        return cells
+
+    def __str__(self):
+        return render(self.cells, self.width, self.height)
+
+    def __len__(self):
+        return self.size
+
+    def count(self) -> int:
+        """
+        Count markers placed on board.
+
+        :return: Number of marked cells
+        """
+        return self.occupied.bit_count()
+
+    def is_full(self) -> bool:
+        """
+        Checks whether board is full, i.e. no more marker can be added.
+
+        :return: True if no more marker can be added. False otherwise
+        """
+        return self.occupied == self.full_mask
+
+    def is_available(self, cell: int) -> bool:
+        """
+        Checks whether given cell is on board and has no marker yet.
+
+        :param cell: Cell number (1 = top left, board size = bottom right)
+        :return: True if a marker can be placed on given cell. False otherwise
+        """
+        return 1 <= cell <= self.size and not self.occupied >> (cell - 1) & 1
+
+    def place_choice(self, cell: int, player: str) -> None:
+        """
+        Place given player's choice on board.
+
+        :param cell: Cell number (1 = top left, board size = bottom right)
+        :param player: Player marker
+        """
+        if not 1 <= cell <= self.size:
+            return None
+
+        bit = 1 << (cell - 1)
+        if self.occupied & bit:
+            for other in self.bits:
+                self.bits[other] &= ~bit
+        self.bits[player] = self.bits.get(player, 0) | bit
+        self.occupied |= bit
+
+    def has_mark_at(self, cell: int, player: str) -> bool:
+        """
+        Check if player has marked given cell on board
+
+        :param cell: Cell number (1 = top left, board size = bottom right)
+        :param player: Player marker
+        :return: True if player has marked corresponding cell
+        or False if not or if index is out of board
+        """
+        return 0 < cell <= self.size and bool(self.bits.get(player, 0) >> (cell - 1) & 1)
+
+    def check_victory(self, player: str, nb_marks: int) -> bool:
+        """
+        Check if given player has marked enough adjacent markers on board.
+
+        :param player: Player marker to look for
+        :param nb_marks: Number of adjacent marks to get a victory
+        :return: True if given player has marked enough adjacent marks on board. False otherwise
+        """
+        bits = self.bits.get(player, 0)
+        if not bits:
+            return False
+
+        masks, _ = win_masks(self.width, self.height, nb_marks)
+        return any(bits & mask == mask for mask in masks)
+
+    def check_victory_at(self, cell: int, player: str, nb_marks: int) -> bool:
+        """
+        Check if given player's mark at given cell is part of enough adjacent markers on board.
+
+        :param cell: Cell number of the last placed marker
+        :param player: Player marker to look for
+        :param nb_marks: Number of adjacent marks to get a victory
+        :return: True if given player has marked enough adjacent marks through given cell. False otherwise
+        """
+        if not self.has_mark_at(cell, player):
+            return False
+
+        bits = self.bits[player]
+        _, cell_masks = win_masks(self.width, self.height, nb_marks)
+        return any(bits & mask == mask for mask in cell_masks[cell - 1])
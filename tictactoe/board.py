@@ -1,4 +1,110 @@
-from math import log10
+import random
+from collections import Counter
+from functools import wraps
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Protocol, Tuple
+
+from tictactoe.renderer import BoardRenderer
+
+DIRECTIONS = ((1, 0), (1, 1), (0, 1), (-1, 1))
+
+ZOBRIST_KEYS: Dict[Tuple[int, str], int] = {}
+
+
+def zobrist_key(cell: int, marker: str) -> int:
+    """
+    Get the 64 bits Zobrist key of a marker on a cell, seeded by both so that keys are the same for any board,
+    players list or process. Cell 0 stands for the marker of the player to move.
+
+    :param cell: Cell number, 0 for player to move
+    :param marker: Player marker
+    :return: Zobrist key
+    """
+    key = ZOBRIST_KEYS.get((cell, marker))
+    if key is None:
+        key = ZOBRIST_KEYS[cell, marker] = random.Random(f'{cell}:{marker}').getrandbits(64)
+    return key
+
+
+class BoardListener(Protocol):
+    """
+    Incremental state kept up to date by a board, e.g. threat counts.
+    """
+
+    def on_place(self, cell: int, player: str) -> None:
+        """
+        Called by place_choice once a player's marker has been placed.
+
+        :param cell: Cell number
+        :param player: Player marker
+        """
+
+    def on_remove(self, cell: int, player: str) -> None:
+        """
+        Called by undo once a player's marker has been removed.
+
+        :param cell: Cell number
+        :param player: Player marker
+        """
+
+    def on_reset(self) -> None:
+        """
+        Called once board cells have been replaced or changed other than cell by cell, to rebuild state from them.
+        """
+
+
+class BoardSnapshot(NamedTuple):
+    """
+    Immutable copy of a board state, cheap to keep for branching.
+    """
+    width: int
+    height: int
+    cells: Tuple[str, ...]
+
+
+class Cells(list):
+    """
+    List of board cells, which keeps board incremental state up to date when it is changed in place.
+
+    Writing a single cell goes through Board.set_cell, like place_choice does. Any other change (slices, length
+    changes) rebuilds the whole state and resets board listeners, like replacing the list does.
+    """
+
+    __slots__ = ('board',)
+
+    def __init__(self, board: 'Board', cells: Iterable[str] = ()) -> None:
+        super().__init__(cells)
+        self.board = board
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            super().__setitem__(index, value)
+            self.changed()
+        else:
+            self.board.set_cell(range(len(self))[index] + 1, value)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def changed(self) -> None:
+        """
+        Rebuild board incremental state after an untracked change.
+        """
+        self.board.track()
+        self.board.renderer.invalidate()
+
+
+def _retracked(method: Callable) -> Callable:
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self.changed()
+        return result
+    return wrapper
+
+
+for _name in ('__delitem__', '__iadd__', '__imul__', 'append', 'extend', 'insert', 'pop', 'remove', 'clear', 'sort',
+              'reverse'):
+    setattr(Cells, _name, _retracked(getattr(list, _name)))
 
 
 class Board:
@@ -6,23 +112,58 @@ class Board:
     def __init__(self, width: int = 3, height: int = 3):
         self.width = width
         self.height = height
+        self.listeners: List[BoardListener] = []
+        self.history: List[Tuple[int, str]] = []
+        self.undone: List[Tuple[int, str]] = []
         self.cells = [' '] * (width * height)
+        self.renderer = BoardRenderer(self)
+
+    @property
+    def cells(self) -> List[str]:
+        """
+        Board cells, ' ' for an empty cell. Changes made in place are tracked, and so is a replaced list.
+        """
+        return self._cells
+
+    @cells.setter
+    def cells(self, cells: Iterable[str]) -> None:
+        self._cells = Cells(self, cells)
+        self.track()
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cells = self._cells
 
     def __str__(self):
-        idx_pad = 1 + int(log10(self.width * self.height))
-        row_sep = '\n' + '-+-'.join(['-' * (3 + idx_pad)] * self.width) + '\n'
-
-        rows = []
-        index = 1
-        for r in range(0, self.height):
-            cells = []
-            for c in range(0, self.width):
-                val = self.cells[r * self.width + c]
-                idx = str(index).rjust(idx_pad, ' ')
-                cells.append(f'{idx}: {val}')
-                index += 1
-            rows.append(' | '.join(cells))
-        return row_sep.join(rows)
+        return self.renderer.render()
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __hash__(self):
+        return self.cells_key
+
+    def __eq__(self, other):
+        if not isinstance(other, Board):
+            return NotImplemented
+        return (self.width, self.height, self.cells) == (other.width, other.height, other.cells)
+
+    def key(self, to_move: Optional[str] = None) -> int:
+        """
+        Get Zobrist hash of board position: cells markers, and player to move if given, so that the same cells with
+        different players to move have different keys.
+
+        Only cells are hashed by default: with a given players order, they tell which player is to move. Positions
+        restored from snapshots, or reached by different move orders, get the same key.
+
+        Cells part is updated incrementally by set_cell, so this takes constant time.
+
+        :param to_move: Marker of the player to move, if it should be part of the key
+        :return: 64 bits position hash
+        """
+        if to_move is None:
+            return self.cells_key
+        return self.cells_key ^ zobrist_key(0, to_move)
 
     def is_full(self) -> bool:
         """
@@ -30,7 +171,57 @@ class Board:
 
         :return: True if no more marker can be added. False otherwise
         """
-        return ' ' not in self.cells
+        return self.filled == len(self.cells)
+
+    def track(self) -> None:
+        """
+        Rebuild occupancy counters, free cells index and position hash from board cells, and reset listeners.
+        """
+        self.counts: Counter = Counter(cell for cell in self.cells if cell != ' ')
+        self.filled = sum(self.counts.values())
+        self.free = [cell_id + 1 for cell_id, cell in enumerate(self.cells) if cell == ' ']
+        self.free_index: Dict[int, int] = {cell: idx for idx, cell in enumerate(self.free)}
+        self.cells_key = 0
+        for cell_id, cell in enumerate(self.cells):
+            if cell != ' ':
+                self.cells_key ^= zobrist_key(cell_id + 1, cell)
+        for listener in self.listeners:
+            listener.on_reset()
+
+    def count(self, player: Optional[str] = None) -> int:
+        """
+        Count markers placed on board.
+
+        :param player: Player marker to count, None to count every marker
+        :return: Number of marked cells
+        """
+        return self.filled if player is None else self.counts[player]
+
+    def free_cells(self) -> List[int]:
+        """
+        Get cells where a marker can be placed, in no particular order. Returned list must not be modified.
+
+        :return: Available cell numbers
+        """
+        return self.free
+
+    def random_cell(self, rnd: random.Random) -> Optional[int]:
+        """
+        Pick an available cell at random, in constant time.
+
+        :param rnd: Random generator to use
+        :return: Available cell number, None if board is full
+        """
+        return rnd.choice(self.free) if self.free else None
+
+    def is_available(self, cell: int) -> bool:
+        """
+        Checks whether given cell is on board and has no marker yet.
+
+        :param cell: Cell number (1 = top left, board size = bottom right)
+        :return: True if a marker can be placed on given cell. False otherwise
+        """
+        return 1 <= cell <= len(self.cells) and self.cells[cell - 1] == ' '
 
     def place_choice(self, cell: int, player: str) -> None:
         """
@@ -42,7 +233,92 @@ class Board:
         if not 1 <= cell <= len(self.cells):
             return None
 
-        self.cells[cell - 1] = player
+        self.history.append((cell, self.cells[cell - 1]))
+        self.undone.clear()
+        self.set_cell(cell, player)
+
+    def set_cell(self, cell: int, player: str) -> None:
+        """
+        Change a cell marker, updating incremental state. Does not record the move in history.
+
+        :param cell: Cell number
+        :param player: New marker, ' ' to clear the cell
+        """
+        cells = self._cells
+        previous = cells[cell - 1]
+        if previous != ' ':
+            self.counts[previous] -= 1
+            self.filled -= 1
+            self.cells_key ^= zobrist_key(cell, previous)
+            for listener in self.listeners:
+                listener.on_remove(cell, previous)
+        else:
+            # Swap with last free cell to remove in constant time
+            idx = self.free_index.pop(cell)
+            last = self.free.pop()
+            if last != cell:
+                self.free[idx] = last
+                self.free_index[last] = idx
+        list.__setitem__(cells, cell - 1, player)
+        if player != ' ':
+            self.counts[player] += 1
+            self.filled += 1
+            self.cells_key ^= zobrist_key(cell, player)
+        else:
+            self.free_index[cell] = len(self.free)
+            self.free.append(cell)
+        self.renderer.invalidate(cell)
+        if player != ' ':
+            for listener in self.listeners:
+                listener.on_place(cell, player)
+
+    def undo(self) -> Optional[int]:
+        """
+        Take back last move placed with place_choice, restoring the cell as it was.
+
+        :return: Cell number of the move taken back, None if there is no move to take back
+        """
+        if not self.history:
+            return None
+
+        cell, previous = self.history.pop()
+        self.undone.append((cell, self.cells[cell - 1]))
+        self.set_cell(cell, previous)
+        return cell
+
+    def redo(self) -> Optional[int]:
+        """
+        Place again last move taken back with undo.
+
+        :return: Cell number of the move placed again, None if there is no move to redo
+        """
+        if not self.undone:
+            return None
+
+        cell, player = self.undone.pop()
+        self.history.append((cell, self.cells[cell - 1]))
+        self.set_cell(cell, player)
+        return cell
+
+    def snapshot(self) -> BoardSnapshot:
+        """
+        Get an immutable copy of board cells.
+
+        :return: Board snapshot
+        """
+        return BoardSnapshot(self.width, self.height, tuple(self.cells))
+
+    @classmethod
+    def from_snapshot(cls, snapshot: BoardSnapshot) -> 'Board':
+        """
+        Create a board with the cells of a snapshot, and an empty history.
+
+        :param snapshot: Board snapshot
+        :return: New board
+        """
+        board = cls(snapshot.width, snapshot.height)
+        board.cells = list(snapshot.cells)
+        return board
 
     def next_cell(self, cell: int, add_x: int, add_y: int) -> int:
         """
@@ -75,6 +351,23 @@ class Board:
 
         pass
 
+    def scan_line(self, cell: int, player: str, add_x: int, add_y: int, nb_marks: int) -> List[int]:
+        """
+        Walk player's consecutive marks from given position, into add_x/add_y direction, up to nb_marks.
+
+        :param cell: Starting cell position on board
+        :param player: Player marker to look for
+        :param add_x: Offset to add to x coordinate
+        :param add_y: Offset to add to y coordinate
+        :param nb_marks: Maximum number of player markers to walk
+        :return: Cell numbers of consecutive player marks found, starting from cell
+        """
+        line = []
+        while len(line) < nb_marks and self.has_mark_at(cell, player):
+            line.append(cell)
+            cell = self.next_cell(cell, add_x, add_y)
+        return line
+
     def check_cells(self, cell: int, player: str, add_x: int, add_y: int, nb_marks: int) -> bool:
         """
         Check if player marked cells at given position, into add_x/add_y direction, up to nb_marks.
@@ -87,11 +380,55 @@ class Board:
         :return: True if player has marked nb_marks consecutive cells on board in given direction starting from cell
         False otherwise
         """
-        if nb_marks == 0:
-            return True
+        return len(self.scan_line(cell, player, add_x, add_y, nb_marks)) == nb_marks
 
-        next_cell = self.next_cell(cell, add_x, add_y)
-        return self.has_mark_at(cell, player) and self.check_cells(next_cell, player, add_x, add_y, nb_marks - 1)
+    def lines(self, add_x: int, add_y: int) -> Iterator[Tuple[int, int]]:
+        """
+        Generate every full line of board into add_x/add_y direction.
+
+        :param add_x: Offset to add to x coordinate
+        :param add_y: Offset to add to y coordinate
+        :return: (first cell index (0 based), number of cells) of each line
+        """
+        for cell_id in range(len(self.cells)):
+            x = cell_id % self.width
+            y = cell_id // self.width
+            if 0 <= x - add_x < self.width and 0 <= y - add_y < self.height:
+                # Not the first cell of its line
+                continue
+            length = self.height - y if add_y else self.width
+            if add_x > 0:
+                length = min(length, self.width - x)
+            elif add_x < 0:
+                length = min(length, x + 1)
+            yield cell_id, length
+
+    def winning_line(self, player: str, nb_marks: int) -> Optional[List[int]]:
+        """
+        Find nb_marks adjacent markers of given player on board, counting runs of marks along every line of board.
+
+        :param player: Player marker to look for
+        :param nb_marks: Number of adjacent marks to get a victory
+        :return: Cell numbers of the first winning line found, None if player has not won
+        """
+        if not self.count(player):
+            return None
+
+        for add_x, add_y in DIRECTIONS:
+            step = add_x + add_y * self.width
+            for start, length in self.lines(add_x, add_y):
+                if length < nb_marks:
+                    continue
+                run = 0
+                for i, cell in enumerate(self.cells[start:start + length * step:step]):
+                    if cell != player:
+                        run = 0
+                        continue
+                    run += 1
+                    if run >= nb_marks:
+                        end = start + i * step
+                        return [1 + end - k * step for k in range(nb_marks - 1, -1, -1)]
+        return None
 
     def check_victory(self, player: str, nb_marks: int) -> bool:
         """
@@ -101,18 +438,47 @@ class Board:
         :param nb_marks: Number of adjacent marks to het a victory
         :return: True if given player has marked enough adjacent marks on board. False otherwise
         """
-        if player not in self.cells:
+        return self.winning_line(player, nb_marks) is not None
+
+    def count_marks(self, cell: int, player: str, add_x: int, add_y: int, limit: int) -> int:
+        """
+        Count player's consecutive marks next to given cell, into add_x/add_y direction, up to limit.
+
+        Given cell itself is not counted.
+
+        :param cell: Cell to count from
+        :param player: Player marker to look for
+        :param add_x: Offset to add to x coordinate
+        :param add_y: Offset to add to y coordinate
+        :param limit: Maximum number of marks to count
+        :return: Number of consecutive player marks found after given cell
+        """
+        count = 0
+        cell = self.next_cell(cell, add_x, add_y)
+        while count < limit and self.has_mark_at(cell, player):
+            count += 1
+            cell = self.next_cell(cell, add_x, add_y)
+        return count
+
+    def check_victory_at(self, cell: int, player: str, nb_marks: int) -> bool:
+        """
+        Check if given player's mark at given cell is part of enough adjacent markers on board.
+
+        Only lines going through given cell are inspected, so the cost depends on nb_marks and not on board size.
+        Meant to be called right after place_choice, with the cell just placed.
+
+        :param cell: Cell number of the last placed marker
+        :param player: Player marker to look for
+        :param nb_marks: Number of adjacent marks to get a victory
+        :return: True if given player has marked enough adjacent marks through given cell. False otherwise
+        """
+        if not self.has_mark_at(cell, player):
             return False
 
-        index = 1
-        for cell in self.cells:
-            if cell == player:
-                if (
-                        self.check_cells(index, player, 1, 0, nb_marks)
-                        or self.check_cells(index, player, 1, 1, nb_marks)
-                        or self.check_cells(index, player, 0, 1, nb_marks)
-                        or self.check_cells(index, player, -1, 1, nb_marks)
-                ):
-                    return True
-            index += 1
+        for add_x, add_y in DIRECTIONS:
+            count = 1 + self.count_marks(cell, player, add_x, add_y, nb_marks - 1)
+            if count < nb_marks:
+                count += self.count_marks(cell, player, -add_x, -add_y, nb_marks - count)
+            if count >= nb_marks:
+                return True
         return False
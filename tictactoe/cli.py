@@ -0,0 +1,199 @@
+"""
+Command line entry point.
+
+    python -m tictactoe [play] [--width 3] [--height 3] [--nb-marks 3] [--players XO] [--ai O]
+    python -m tictactoe solve --moves "5 1" [--tablebase 3x3.ttt]
+    python -m tictactoe batch --policies X=search,O=random --games 1000
+    python -m tictactoe [board options] bench [benchmark options]
+    python -m tictactoe replay games.ttr
+
+Only argparse is imported at start: each command imports the modules it needs when it runs, so that short commands
+called from scripts do not pay for engines or NumPy they do not use.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+EXACT_SOLVE_SIZE = 12
+BOARD_DEFAULTS = {'width': 3, 'height': 3, 'nb_marks': 3, 'players': 'XO'}
+
+
+def parse_policies(value: str) -> Dict[str, str]:
+    return dict(item.split('=', 1) for item in value.split(','))
+
+
+def parse_moves(value: str) -> List[int]:
+    return [int(move) for move in value.replace(',', ' ').split()]
+
+
+def parse_sizes(value: str) -> List[Tuple[int, int]]:
+    return [tuple(int(v) for v in size.split('x')) for size in value.split(',')]
+
+
+def parse_ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(',')]
+
+
+def board_options() -> argparse.ArgumentParser:
+    """
+    Board options are accepted before and after the command. They have no defaults in parsers (see BOARD_DEFAULTS,
+    applied by main), so that a command does not override options given before it.
+
+    :return: Parser of board options, shared by every command
+    """
+    parser = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    parser.add_argument('--width', type=int, help='board width (default: 3)')
+    parser.add_argument('--height', type=int, help='board height (default: 3)')
+    parser.add_argument('--nb-marks', type=int, help='number of adjacent marks to get a victory (default: 3)')
+    parser.add_argument('--players', help='players markers, in playing order, e.g. XO# (default: XO)')
+    return parser
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='tictactoe', description='Tic-tac-toe on any board',
+                                     parents=[board_options()])
+    # Parents share their actions: commands get their own board options
+    parser.set_defaults(ai='', max_time=1.0)
+    common = board_options()
+    commands = parser.add_subparsers(dest='command')
+
+    play = commands.add_parser('play', parents=[common], help='play an interactive game (default)')
+    play.add_argument('--ai', default='', help='markers of players played by the computer, e.g. O')
+    play.add_argument('--max-time', type=float, default=1.0, help='computer thinking time per move, in seconds')
+
+    solve = commands.add_parser('solve', parents=[common], help='find the best moves of a position')
+    solve.add_argument('--moves', type=parse_moves, default=[], help='cell numbers played so far, e.g. "5 1"')
+    solve.add_argument('--max-time', type=float, default=1.0,
+                       help=f'search time on boards larger than {EXACT_SOLVE_SIZE} cells, in seconds')
+    solve.add_argument('--tablebase', help='tablebase file of the board configuration, solved in memory otherwise')
+
+    batch = commands.add_parser('batch', parents=[common], help='play computer games and print statistics')
+    batch.add_argument('--policies', type=parse_policies, help='policy by marker, e.g. X=search,O=random. '
+                                                               'Policies: random, heuristic, search')
+    batch.add_argument('--games', type=int, default=100)
+    batch.add_argument('--processes', type=int, help='number of worker processes, one per CPU by default')
+    batch.add_argument('--seed', type=int, default=0)
+
+    commands.add_parser('bench', help='benchmark hot paths of the board configuration given before the command, '
+                                      'see python -m tictactoe.benchmark --help', add_help=False)
+
+    replay = commands.add_parser('replay', help='print games of a record file')
+    replay.add_argument('path', help='game records file')
+    replay.add_argument('--all', action='store_true', help='print board after every move, not only the last one')
+    return parser
+
+
+def play(args: argparse.Namespace) -> int:
+    from tictactoe.game import Game
+
+    engines = {}
+    if args.ai:
+        from tictactoe.ai import NegamaxPlayer
+        engines = {player: NegamaxPlayer(max_time=args.max_time) for player in args.ai}
+    Game(args.width, args.height, args.nb_marks, list(args.players), engines=engines).run()
+    return 0
+
+
+def solve(args: argparse.Namespace) -> int:
+    from tictactoe.board import Board
+
+    players = list(args.players)
+    board = Board(args.width, args.height)
+    for i, cell in enumerate(args.moves):
+        if not board.is_available(cell):
+            raise ValueError(f'Cell {cell} is not available')
+        board.place_choice(cell, players[i % len(players)])
+        if board.check_victory_at(cell, players[i % len(players)], args.nb_marks) or board.is_full():
+            raise ValueError('Game is already over')
+    player = players[len(args.moves) % len(players)]
+    result = {'player': player}
+
+    if args.tablebase:
+        from tictactoe.tablebase import Tablebase
+
+        with Tablebase(args.tablebase) as tablebase:
+            if not tablebase.matches(args.width, args.height, args.nb_marks, players):
+                raise ValueError(f'Tablebase {args.tablebase} does not match board options')
+            result['value'], result['moves'] = tablebase.lookup(board.cells)
+    elif len(players) == 2 and len(board) <= EXACT_SOLVE_SIZE:
+        from tictactoe.tablebase import SolvedPositions
+
+        solved = SolvedPositions(args.width, args.height, args.nb_marks, players)
+        result['value'], result['moves'] = solved.lookup(board.cells)
+    else:
+        from tictactoe.ai import NegamaxPlayer
+        from tictactoe.game import Game
+
+        game = Game(args.width, args.height, args.nb_marks, players)
+        game.board = board
+        engine = NegamaxPlayer(max_time=args.max_time)
+        result['moves'] = [engine.get_choice(game, player)]
+        result['depth'] = engine.depth_reached
+    print(json.dumps(result))
+    return 0
+
+
+def batch(args: argparse.Namespace) -> int:
+    from tictactoe.simulation import Config, simulate
+
+    players = tuple(args.players)
+    policies = args.policies or dict.fromkeys(players, 'random')
+    config = Config(args.width, args.height, args.nb_marks, players)
+    stats = simulate([config], policies, args.games, processes=args.processes, seed=args.seed)[config]
+    print(json.dumps({'games': stats.games, 'draws': stats.draws, 'players': stats.to_dict(players)}))
+    return 0
+
+
+def replay(args: argparse.Namespace) -> int:
+    from tictactoe.record import read_records, replay as replay_record
+
+    for number, record in enumerate(read_records(args.path), start=1):
+        print(f'Game {number}: {record.width}x{record.height}, {record.nb_marks} marks, moves {list(record.moves)}')
+        board = None
+        for board in replay_record(record):
+            if args.all:
+                print(board)
+        if board is not None and not args.all:
+            print(board)
+    return 0
+
+
+def bench(args: argparse.Namespace, extras: List[str]) -> int:
+    """
+    Run benchmarks, board options given before the command selecting the benchmarked configuration.
+
+    :param args: Parsed arguments, board options being only set when given
+    :param extras: Benchmark options, given after the command. They override board options
+    :return: Exit status
+    """
+    from tictactoe import benchmark
+
+    options = []
+    if 'width' in args or 'height' in args:
+        width = getattr(args, 'width', BOARD_DEFAULTS['width'])
+        height = getattr(args, 'height', BOARD_DEFAULTS['height'])
+        options += ['--sizes', f'{width}x{height}']
+    if 'nb_marks' in args:
+        options += ['--nb-marks', str(args.nb_marks)]
+    if 'players' in args:
+        options += ['--players', str(len(args.players))]
+    return benchmark.main(options + extras)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    parser = build_parser()
+    args, extras = parser.parse_known_args(argv)
+    if args.command == 'bench':
+        return bench(args, extras)
+    if extras:
+        parser.error(f'unrecognized arguments: {" ".join(extras)}')
+
+    for name, value in BOARD_DEFAULTS.items():
+        vars(args).setdefault(name, value)
+    handler = {'solve': solve, 'batch': batch, 'replay': replay}.get(args.command, play)
+    try:
+        return handler(args)
+    except ValueError as e:
+        parser.error(str(e))
@@ -0,0 +1,192 @@
+"""
+Compact position encodings, for caches and archives holding many positions.
+
+- Integer keys: cells as a base (nb_players + 1) number, cell number 1 being the least significant digit,
+  0 for an empty cell and i + 1 for i-th player. A 3x3 position with 2 players fits in 15 bits.
+- Packed bytes: a fixed number of bits per cell (2 for up to 3 players), cell number 1 in the lowest bits of the
+  first byte. A 3x3 position takes 3 bytes.
+
+Position wraps an integer key with its board dimensions and players, and takes about 80 bytes where a Board takes
+a few kilobytes.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+from tictactoe.board import Board, BoardSnapshot
+
+
+def codes(players: Sequence[str]) -> Dict[str, int]:
+    """
+    :param players: Players markers
+    :return: Digit of each cell content, by marker
+    """
+    return {' ': 0, **{player: i + 1 for i, player in enumerate(players)}}
+
+
+def encode(cells: Sequence[str], players: Sequence[str]) -> int:
+    """
+    Encode board cells as a base (nb_players + 1) integer, cell number 1 being the least significant digit.
+
+    :param cells: Board cells
+    :param players: Players markers
+    :return: Position key
+    """
+    base = len(players) + 1
+    digits = codes(players)
+    key = 0
+    for cell in reversed(cells):
+        key = key * base + digits[cell]
+    return key
+
+
+def decode(key: int, size: int, players: Sequence[str]) -> List[str]:
+    """
+    Decode a position key made by encode.
+
+    :param key: Position key
+    :param size: Number of cells
+    :param players: Players markers
+    :return: Board cells
+    """
+    base = len(players) + 1
+    markers = [' '] + list(players)
+    cells = []
+    for _ in range(size):
+        key, digit = divmod(key, base)
+        cells.append(markers[digit])
+    return cells
+
+
+def bits_per_cell(nb_players: int) -> int:
+    """
+    :param nb_players: Number of players
+    :return: Number of bits needed to store any cell content
+    """
+    return nb_players.bit_length()
+
+
+def pack(cells: Sequence[str], players: Sequence[str]) -> bytes:
+    """
+    Pack board cells into bytes, with a fixed number of bits per cell.
+
+    :param cells: Board cells
+    :param players: Players markers
+    :return: Packed cells, (len(cells) * bits per cell + 7) // 8 bytes
+    """
+    bits = bits_per_cell(len(players))
+    digits = codes(players)
+    value = 0
+    for cell in reversed(cells):
+        value = value << bits | digits[cell]
+    return value.to_bytes((len(cells) * bits + 7) // 8, 'little')
+
+
+def unpack(data: bytes, size: int, players: Sequence[str]) -> List[str]:
+    """
+    Unpack board cells packed by pack.
+
+    :param data: Packed cells
+    :param size: Number of cells
+    :param players: Players markers
+    :return: Board cells
+    """
+    bits = bits_per_cell(len(players))
+    mask = (1 << bits) - 1
+    markers = [' '] + list(players)
+    value = int.from_bytes(data, 'little')
+    return [markers[value >> (bits * cell_id) & mask] for cell_id in range(size)]
+
+
+class Position:
+    """
+    Immutable board position, storing cells as an integer key.
+
+    Positions are hashable and equal when they have the same dimensions, players and cells.
+    """
+
+    __slots__ = ('width', 'height', 'players', 'key')
+
+    def __init__(self, width: int, height: int, players: Tuple[str, ...], key: int) -> None:
+        """
+        :param width: Board width
+        :param height: Board height
+        :param players: Players markers. Positions of the same game should share the same tuple
+        :param key: Cells encoded by encode
+        """
+        object.__setattr__(self, 'width', width)
+        object.__setattr__(self, 'height', height)
+        object.__setattr__(self, 'players', players)
+        object.__setattr__(self, 'key', key)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Position is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Position is immutable')
+
+    def __eq__(self, other):
+        if not isinstance(other, Position):
+            return NotImplemented
+        return (self.key, self.width, self.height, self.players) == (other.key, other.width, other.height,
+                                                                     other.players)
+
+    def __hash__(self):
+        return hash((self.key, self.width, self.height))
+
+    def __repr__(self):
+        return f'Position({self.width}, {self.height}, {self.players!r}, {self.key})'
+
+    def __reduce__(self):
+        return Position, (self.width, self.height, self.players, self.key)
+
+    @classmethod
+    def from_cells(cls, width: int, height: int, players: Tuple[str, ...], cells: Sequence[str]) -> 'Position':
+        """
+        Encode board cells.
+
+        :param width: Board width
+        :param height: Board height
+        :param players: Players markers
+        :param cells: Board cells
+        :return: Position
+        """
+        return cls(width, height, players, encode(cells, players))
+
+    @classmethod
+    def from_board(cls, board: Board, players: Tuple[str, ...]) -> 'Position':
+        """
+        Encode a board position.
+
+        :param board: Board to encode
+        :param players: Players markers
+        :return: Position
+        """
+        return cls.from_cells(board.width, board.height, players, board.cells)
+
+    @classmethod
+    def from_bytes(cls, width: int, height: int, players: Tuple[str, ...], data: bytes) -> 'Position':
+        """
+        Decode a position packed by to_bytes.
+
+        :param width: Board width
+        :param height: Board height
+        :param players: Players markers
+        :param data: Packed cells
+        :return: Position
+        """
+        return cls.from_cells(width, height, players, unpack(data, width * height, players))
+
+    @property
+    def cells(self) -> List[str]:
+        return decode(self.key, self.width * self.height, self.players)
+
+    def to_board(self) -> Board:
+        """
+        :return: New board with position cells, and an empty history
+        """
+        return Board.from_snapshot(BoardSnapshot(self.width, self.height, tuple(self.cells)))
+
+    def to_bytes(self) -> bytes:
+        """
+        :return: Cells packed by pack
+        """
+        return pack(self.cells, self.players)
@@ -1,42 +1,126 @@
-from typing import List
+from typing import Dict, List, Optional, Protocol, Type, Union
 
+from tictactoe.bitboard import BitBoard
 from tictactoe.board import Board
+from tictactoe.instrument import Instrumentation
+from tictactoe.sparse import SparseBoard
+
+TAKE_BACK = 'u'
+
+
+class Engine(Protocol):
+    """
+    Computer player, choosing moves without user input.
+    """
+
+    def get_choice(self, game: 'Game', player: str) -> int:
+        """
+        Choose a cell for given player.
+
+        :param game: Game to play
+        :param player: Player marker
+        :return: Chosen cell number, valid and available
+        """
 
 
 class Game:
 
-    def __init__(self, width: int = 3, height: int = 3, nb_marks: int = 3, players: List[str] = ('X', 'O')) -> None:
-        self.board = Board(width, height)
+    def __init__(self, width: int = 3, height: int = 3, nb_marks: int = 3, players: List[str] = ('X', 'O'),
+                 board_class: Type[Union[Board, BitBoard, SparseBoard]] = Board,
+                 engines: Optional[Dict[str, Engine]] = None,
+                 instrumentation: Optional[Instrumentation] = None) -> None:
+        """
+        :param width: Board width
+        :param height: Board height
+        :param nb_marks: Number of adjacent marks to get a victory
+        :param players: Players markers, in playing order
+        :param board_class: Board implementation to use
+        :param engines: Computer players, by player marker. Other players are asked for their moves
+        :param instrumentation: Metrics collector to attach to the game, if any
+        """
+        self.board = board_class(width, height)
         self.nb_marks = nb_marks
         self.players = players
+        self.engines = engines or {}
+        self.moves: List[int] = []
+        self.winner: Optional[str] = None
+        if instrumentation is not None:
+            instrumentation.attach(self)
+
+    def is_valid_choice(self, choice: str) -> bool:
+        """
+        Checks whether given player input is a cell number of the board.
+
+        :param choice: Player input
+        :return: True if choice is a number between 1 and board size. False otherwise
+        """
+        return choice.isdigit() and 1 <= int(choice) <= len(self.board)
+
+    def is_available_choice(self, choice: str) -> bool:
+        """
+        Checks whether given valid player input is a cell with no marker yet.
+
+        :param choice: Player input, a valid cell number
+        :return: True if corresponding cell is empty. False otherwise
+        """
+        return self.board.is_available(int(choice))
 
     def get_player_choice(self, player: str) -> int:
         """
         Ask the player to choose a cell number in given grid, and retries until the choice is valid and available.
 
-        Payer must give a number between 1 and board size, and corresponding to an empty cell
+        Computer players from engines are asked for their choice instead.
+
+        Payer must give a number between 1 and board size, and corresponding to an empty cell,
+        or "u" to take back last move when possible.
 
         :param player: Player marker
-        :return: Cell number chosen by the player
+        :return: Cell number chosen by the player, 0 to take back last move
         """
-
-        def is_valid(player_choice):
-            return player_choice.isdigit() and 1 <= int(player_choice) <= len(self.board.cells)
-
-        def is_available(player_choice):
-            return self.board.cells[int(player_choice) - 1] == ' '
+        if player in self.engines:
+            return self.engines[player].get_choice(self, player)
 
         choice = 'wrong'
 
-        while not is_valid(choice) or not is_available(choice):
-            choice = input(f'Player {player}, please choose a cell number [1 - {len(self.board.cells)}]: ')
-            if not is_valid(choice):
+        while not self.is_valid_choice(choice) or not self.is_available_choice(choice):
+            hint = f' or "{TAKE_BACK}" to take back last move' if self.can_take_back() else ''
+            choice = input(f'Player {player}, please choose a cell number [1 - {len(self.board)}]{hint}: ')
+            if choice == TAKE_BACK and self.can_take_back():
+                return 0
+            if not self.is_valid_choice(choice):
                 print(f'Sorry, but "{choice}" is not a valid cell number. Please try again.')
-            elif not is_available(choice):
+            elif not self.is_available_choice(choice):
                 print(f'Sorry, but "{choice}" cell is already taken. Please choose another one.')
 
         return int(choice)
 
+    def can_take_back(self) -> bool:
+        """
+        Checks whether last move can be taken back.
+
+        :return: True if a player without engine has played a move and board supports undo. False otherwise
+        """
+        return hasattr(self.board, 'undo') and any(
+            self.players[i % len(self.players)] not in self.engines for i in range(len(self.moves)))
+
+    def take_back(self, current_player: str) -> str:
+        """
+        Take back last moves, up to the last move played by a player without engine.
+
+        Moves of computer players are taken back too, else they would play them again right away.
+
+        :param current_player: Current player marker
+        :return: Marker of the player who played the last move taken back, playing again
+        """
+        player = current_player
+        while self.moves:
+            self.board.undo()
+            self.moves.pop()
+            player = self.players[self.players.index(player) - 1]
+            if player not in self.engines:
+                break
+        return player
+
     def get_next_player(self, current_player: str) -> str:
         """
         Get next playing player marker, rolling on players list.
@@ -49,6 +133,34 @@ class Game:
             idx = 0
         return self.players[idx]
 
+    def play_move(self, cell: int, player: str) -> bool:
+        """
+        Place player's choice on board and record it in moves history.
+
+        :param cell: Cell number chosen by the player
+        :param player: Player marker
+        :return: True if the move wins the game. False otherwise
+        """
+        self.board.place_choice(cell, player)
+        self.moves.append(cell)
+        return self.board.check_victory_at(cell, player, self.nb_marks)
+
+    def play(self) -> Optional[str]:
+        """
+        Plays a game without any terminal I/O. Every player should have a computer player in engines.
+
+        :return: Winner marker, or None if it's a draw
+        """
+        current_player = self.players[0]
+
+        while not self.board.is_full():
+            cell = self.get_player_choice(current_player)
+            if self.play_move(cell, current_player):
+                self.winner = current_player
+                return current_player
+            current_player = self.get_next_player(current_player)
+        return None
+
     def run(self):
         """
         Starts a tic-tac-toe game
@@ -59,8 +171,11 @@ class Game:
         while not player_won and not self.board.is_full():
             print(self.board)
             cell = self.get_player_choice(current_player)
-            self.board.place_choice(cell, current_player)
-            if self.board.check_victory(current_player, self.nb_marks):
+            if cell == 0:
+                current_player = self.take_back(current_player)
+                continue
+            if self.play_move(cell, current_player):
+                self.winner = current_player
                 player_won = True
                 break
             current_player = self.get_next_player(current_player)
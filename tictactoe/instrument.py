@@ -0,0 +1,327 @@
+import json
+import math
+from collections import Counter
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+PHASES = ('input', 'place', 'check', 'full', 'render')
+EVENTS = ('on_move', 'on_check', 'on_render', 'on_game_end')
+BOUNDS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0, math.inf)
+
+
+class Histogram:
+    """
+    Latency histogram with fixed, cumulative buckets.
+    """
+
+    def __init__(self, bounds: Sequence[float] = BOUNDS) -> None:
+        """
+        :param bounds: Sorted upper bounds of the buckets, in seconds. Last one should be infinity
+        """
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * len(self.bounds)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Record a value.
+
+        :param value: Observed value, in seconds
+        """
+        self.count += 1
+        self.sum += value
+        for idx, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.buckets[idx] += 1
+                return
+
+    def cumulative(self) -> List[int]:
+        """
+        :return: Number of values lower or equal to each bound
+        """
+        total, counts = 0, []
+        for count in self.buckets:
+            total += count
+            counts.append(total)
+        return counts
+
+    def to_dict(self) -> Dict:
+        """
+        :return: JSON serializable histogram
+        """
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': {format_bound(bound): count for bound, count in zip(self.bounds, self.cumulative())},
+        }
+
+
+def format_bound(bound: float) -> str:
+    """
+    Format a bucket bound the Prometheus way.
+
+    :param bound: Bucket upper bound
+    :return: "+Inf" for infinity, the shortest float representation otherwise
+    """
+    return '+Inf' if bound == math.inf else repr(bound)
+
+
+def config_of(game) -> str:
+    """
+    Label identifying the board configuration of a game.
+
+    :param game: Instrumented game
+    :return: Configuration label, like "3x3/3"
+    """
+    return f'{game.board.width}x{game.board.height}/{game.nb_marks}'
+
+
+class Instrumentation:
+    """
+    Per-phase latency histograms, counters and hooks for games.
+
+    Games are instrumented by wrapping the methods of the game and board instances when attached, so games which are
+    not attached run exactly the same code as before, without any overhead.
+
+    Hooks are called with:
+        - on_move(game, player, cell, seconds)
+        - on_check(game, player, cell, won, cells_visited, seconds)
+        - on_render(game, seconds)
+        - on_game_end(game, winner)
+    """
+
+    def __init__(self, bounds: Sequence[float] = BOUNDS) -> None:
+        """
+        :param bounds: Histograms buckets upper bounds, in seconds
+        """
+        self.bounds = bounds
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.counters: Counter = Counter()
+        self.games: Counter = Counter()
+        self.hooks: Dict[str, List[Callable]] = {event: [] for event in EVENTS}
+
+    def add_hook(self, event: str, hook: Callable) -> None:
+        """
+        Register a hook.
+
+        :param event: One of EVENTS
+        :param hook: Callable to call on event
+        """
+        if event not in self.hooks:
+            raise ValueError(f'Unknown event "{event}"')
+        self.hooks[event].append(hook)
+
+    def observe(self, config: str, phase: str, seconds: float) -> None:
+        """
+        Record the latency of a phase.
+
+        :param config: Board configuration label
+        :param phase: One of PHASES
+        :param seconds: Duration of the phase
+        """
+        key = (config, phase)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram(self.bounds)
+        self.histograms[key].observe(seconds)
+
+    def timed(self, config: str, phase: str, func: Callable) -> Callable:
+        """
+        Wrap a function to record its latency.
+
+        :param config: Board configuration label
+        :param phase: One of PHASES
+        :param func: Function to time
+        :return: Wrapped function
+        """
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.observe(config, phase, perf_counter() - start)
+        return wrapper
+
+    def attach(self, game) -> None:
+        """
+        Instrument a game and its board.
+
+        Board placements and victory checks are only recorded while the game plays a move: the ones engines make to
+        probe positions while choosing a move are part of the input phase.
+
+        :param game: Game to instrument
+        """
+        config = config_of(game)
+        board = game.board
+        visited = [0]
+        state = {'choosing': False, 'moving': False}
+
+        get_player_choice = game.get_player_choice
+        play_move = game.play_move
+        is_full = board.is_full
+        timed_is_full = self.timed(config, 'full', is_full)
+
+        @wraps(get_player_choice)
+        def timed_get_player_choice(player):
+            state['choosing'] = True
+            start = perf_counter()
+            try:
+                return get_player_choice(player)
+            finally:
+                self.observe(config, 'input', perf_counter() - start)
+                state['choosing'] = False
+
+        @wraps(play_move)
+        def recorded_play_move(cell, player):
+            state['moving'] = True
+            try:
+                return play_move(cell, player)
+            finally:
+                state['moving'] = False
+
+        @wraps(is_full)
+        def game_is_full():
+            return is_full() if state['choosing'] else timed_is_full()
+
+        game.get_player_choice = timed_get_player_choice
+        game.play_move = recorded_play_move
+        board.is_full = game_is_full
+
+        place_choice = board.place_choice
+        check_victory_at = board.check_victory_at
+
+        @wraps(place_choice)
+        def timed_place_choice(cell, player):
+            if not state['moving']:
+                return place_choice(cell, player)
+            start = perf_counter()
+            place_choice(cell, player)
+            seconds = perf_counter() - start
+            self.observe(config, 'place', seconds)
+            self.counters['moves', config] += 1
+            for hook in self.hooks['on_move']:
+                hook(game, player, cell, seconds)
+
+        @wraps(check_victory_at)
+        def timed_check_victory_at(cell, player, nb_marks):
+            if not state['moving']:
+                return check_victory_at(cell, player, nb_marks)
+            visited[0] = 0
+            start = perf_counter()
+            won = check_victory_at(cell, player, nb_marks)
+            seconds = perf_counter() - start
+            self.observe(config, 'check', seconds)
+            self.counters['checks', config] += 1
+            self.counters['cells_visited', config] += visited[0]
+            for hook in self.hooks['on_check']:
+                hook(game, player, cell, won, visited[0], seconds)
+            return won
+
+        board.place_choice = timed_place_choice
+        board.check_victory_at = timed_check_victory_at
+
+        if hasattr(board, 'count_marks'):
+            count_marks = board.count_marks
+
+            @wraps(count_marks)
+            def counted_count_marks(*args):
+                count = count_marks(*args)
+                if state['moving']:
+                    # Cells holding a mark, plus the probe which stopped the scan
+                    visited[0] += count + (count < args[-1])
+                return count
+            board.count_marks = counted_count_marks
+
+        renderer = getattr(board, 'renderer', None)
+        if renderer is not None:
+            render = renderer.render
+
+            @wraps(render)
+            def timed_render():
+                start = perf_counter()
+                text = render()
+                seconds = perf_counter() - start
+                self.observe(config, 'render', seconds)
+                for hook in self.hooks['on_render']:
+                    hook(game, seconds)
+                return text
+            renderer.render = timed_render
+
+        for name in ('play', 'run'):
+            method = getattr(game, name)
+            setattr(game, name, self.ended(game, config, method))
+
+    def ended(self, game, config: str, method: Callable) -> Callable:
+        """
+        Wrap a game playing method to record game ends.
+
+        :param game: Instrumented game
+        :param config: Board configuration label
+        :param method: Game method playing a whole game
+        :return: Wrapped method
+        """
+        @wraps(method)
+        def wrapper():
+            result = method()
+            self.games[config, game.winner or 'draw'] += 1
+            for hook in self.hooks['on_game_end']:
+                hook(game, game.winner)
+            return result
+        return wrapper
+
+    def to_dict(self) -> Dict:
+        """
+        :return: JSON serializable metrics, by board configuration
+        """
+        configs: Dict[str, Dict] = {}
+
+        def metrics(config: str) -> Dict:
+            return configs.setdefault(config, {'phases': {}, 'counters': {}, 'games': {}})
+
+        for (config, phase), histogram in sorted(self.histograms.items()):
+            metrics(config)['phases'][phase] = histogram.to_dict()
+        for (name, config), value in sorted(self.counters.items()):
+            metrics(config)['counters'][name] = value
+        for (config, result), value in sorted(self.games.items()):
+            metrics(config)['games'][result] = value
+        return configs
+
+    def to_prometheus(self) -> str:
+        """
+        :return: Metrics in Prometheus text exposition format
+        """
+        lines = ['# TYPE tictactoe_phase_seconds histogram']
+        for (config, phase), histogram in sorted(self.histograms.items()):
+            labels = f'config="{config}",phase="{phase}"'
+            for bound, count in zip(histogram.bounds, histogram.cumulative()):
+                lines.append(f'tictactoe_phase_seconds_bucket{{{labels},le="{format_bound(bound)}"}} {count}')
+            lines.append(f'tictactoe_phase_seconds_sum{{{labels}}} {histogram.sum!r}')
+            lines.append(f'tictactoe_phase_seconds_count{{{labels}}} {histogram.count}')
+
+        for name in ('moves', 'checks', 'cells_visited'):
+            lines.append(f'# TYPE tictactoe_{name}_total counter')
+            for (counter, config), value in sorted(self.counters.items()):
+                if counter == name:
+                    lines.append(f'tictactoe_{name}_total{{config="{config}"}} {value}')
+
+        lines.append('# TYPE tictactoe_games_total counter')
+        for (config, result), value in sorted(self.games.items()):
+            lines.append(f'tictactoe_games_total{{config="{config}",result="{result}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str, fmt: Optional[str] = None) -> None:
+        """
+        Export metrics to a file, for a node exporter textfile collector or any JSON consumer.
+
+        :param path: Output file path
+        :param fmt: "json" or "prometheus". Guessed from path extension when not given
+        """
+        if fmt is None:
+            fmt = 'json' if path.endswith('.json') else 'prometheus'
+        with open(path, 'w') as f:
+            if fmt == 'json':
+                json.dump(self.to_dict(), f, indent=2)
+            else:
+                f.write(self.to_prometheus())
@@ -0,0 +1,289 @@
+"""
+Monte Carlo Tree Search (UCT) computer player, for boards and player counts out of reach of alpha-beta.
+
+Playouts run on OverlayBoard, a copy-on-write view of the searched position: placed marks are stored in a dict over
+the shared cells list of the position, which is never copied.
+"""
+import math
+import random
+import time
+from multiprocessing import Pool
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from tictactoe.board import DIRECTIONS
+
+if TYPE_CHECKING:
+    from tictactoe.game import Game
+
+
+class OverlayBoard:
+    """
+    Copy-on-write board over a shared cells list.
+    """
+
+    __slots__ = ('cells', 'width', 'height', 'free', 'overlay')
+
+    def __init__(self, cells: Sequence[str], width: int, height: int, free: Sequence[int]) -> None:
+        """
+        :param cells: Shared cells of the position, left unchanged
+        :param width: Board width
+        :param height: Board height
+        :param free: Indexes (0 based) of empty cells of the position
+        """
+        self.cells = cells
+        self.width = width
+        self.height = height
+        self.free = free
+        self.overlay: Dict[int, str] = {}
+
+    def get(self, cell_id: int) -> str:
+        return self.overlay.get(cell_id) or self.cells[cell_id]
+
+    def place(self, cell_id: int, player: str) -> None:
+        self.overlay[cell_id] = player
+
+    def is_full(self) -> bool:
+        return len(self.overlay) >= len(self.free)
+
+    def random_free(self, rnd: random.Random) -> int:
+        """
+        Draw an empty cell index at random, board must not be full.
+
+        :param rnd: Random generator
+        :return: Cell index (0 based)
+        """
+        free, overlay = self.free, self.overlay
+        while True:
+            cell_id = free[rnd.randrange(len(free))]
+            if cell_id not in overlay:
+                return cell_id
+
+    def check_victory_at(self, cell_id: int, player: str, nb_marks: int) -> bool:
+        """
+        Check if given player's mark at given cell index is part of enough adjacent markers.
+
+        :param cell_id: Cell index (0 based) of the last placed marker
+        :param player: Player marker
+        :param nb_marks: Number of adjacent marks to get a victory
+        :return: True if player won. False otherwise
+        """
+        width, height = self.width, self.height
+        x0, y0 = cell_id % width, cell_id // width
+        for add_x, add_y in DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                x, y = x0 + sign * add_x, y0 + sign * add_y
+                while count < nb_marks and 0 <= x < width and 0 <= y < height and self.get(x + y * width) == player:
+                    count += 1
+                    x, y = x + sign * add_x, y + sign * add_y
+            if count >= nb_marks:
+                return True
+        return False
+
+
+class Node:
+    """
+    Search tree node, reached by a move of a player.
+    """
+
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried', 'visits', 'value', 'winner', 'terminal')
+
+    def __init__(self, move: Optional[int], player: int, parent: Optional['Node'], untried: List[int]) -> None:
+        """
+        :param move: Cell index (0 based) played to reach this node, None for root
+        :param player: Index of player who played the move
+        :param parent: Parent node
+        :param untried: Cell indexes of moves not expanded yet
+        """
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children: Dict[int, Node] = {}
+        self.untried = untried
+        self.visits = 0
+        self.value = 0.0
+        self.winner: Optional[int] = None
+        self.terminal = False
+
+    def select(self, exploration: float) -> 'Node':
+        log_visits = math.log(self.visits)
+        return max(
+            self.children.values(),
+            key=lambda c: c.value / c.visits + exploration * math.sqrt(log_visits / c.visits)
+        )
+
+
+def search(root: Node, cells: Sequence[str], width: int, height: int, nb_marks: int, players: Sequence[str],
+           deadline: float, max_iterations: Optional[int], exploration: float, rnd: random.Random) -> int:
+    """
+    Run UCT iterations from root position until deadline or iterations count is reached.
+
+    :param root: Root node, whose player is the one who played last
+    :param cells: Cells of root position
+    :param width: Board width
+    :param height: Board height
+    :param nb_marks: Number of adjacent marks to get a victory
+    :param players: Players markers
+    :param deadline: perf_counter time at which search stops
+    :param max_iterations: Maximum number of iterations, None for no limit
+    :param exploration: UCT exploration constant
+    :param rnd: Random generator
+    :return: Number of playouts run
+    """
+    nb_players = len(players)
+    free = [cell_id for cell_id, cell in enumerate(cells) if cell == ' ']
+    draw_reward = 1 / nb_players
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        if iterations and time.perf_counter() > deadline:
+            break
+        iterations += 1
+        board = OverlayBoard(cells, width, height, free)
+        node = root
+
+        # Selection
+        while not node.terminal and not node.untried and node.children:
+            node = node.select(exploration)
+            board.place(node.move, players[node.player])
+
+        # Expansion
+        if not node.terminal and node.untried:
+            move = node.untried.pop(rnd.randrange(len(node.untried)))
+            player = (node.player + 1) % nb_players
+            board.place(move, players[player])
+            child = Node(move, player, node, [c for c in free if c not in board.overlay])
+            if board.check_victory_at(move, players[player], nb_marks):
+                child.terminal, child.winner = True, player
+            elif board.is_full():
+                child.terminal = True
+            node.children[move] = child
+            node = child
+
+        # Playout
+        winner = node.winner
+        if not node.terminal:
+            player = node.player
+            while not board.is_full():
+                player = (player + 1) % nb_players
+                move = board.random_free(rnd)
+                board.place(move, players[player])
+                if board.check_victory_at(move, players[player], nb_marks):
+                    winner = player
+                    break
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.value += draw_reward
+            elif winner == node.player:
+                node.value += 1
+            node = node.parent
+    return iterations
+
+
+def _search_visits(args: Tuple[List[str], int, int, int, List[str], int, float, Optional[int], float, int]
+                   ) -> Tuple[Dict[int, int], int]:
+    cells, width, height, nb_marks, players, last_player, max_time, max_iterations, exploration, seed = args
+    root = Node(None, last_player, None, [c for c, cell in enumerate(cells) if cell == ' '])
+    playouts = search(root, cells, width, height, nb_marks, players, time.perf_counter() + max_time, max_iterations,
+                      exploration, random.Random(seed))
+    return {move: child.visits for move, child in root.children.items()}, playouts
+
+
+class MCTSPlayer:
+    """
+    Computer player searching moves with UCT, within a time budget per move.
+
+    In a single process, the tree is kept between moves and reused from the position reached.
+    With several processes, each one searches its own tree from current position (root parallelization),
+    and the most visited move over all trees is played.
+    """
+
+    def __init__(self, max_time: float = 1.0, max_iterations: Optional[int] = None, exploration: float = 1.4,
+                 processes: int = 1, seed: int = 0) -> None:
+        """
+        :param max_time: Time budget per move, in seconds
+        :param max_iterations: Maximum number of playouts per move and process, None for no limit
+        :param exploration: UCT exploration constant
+        :param processes: Number of processes searching in parallel
+        :param seed: Random seed
+        """
+        self.max_time = max_time
+        self.max_iterations = max_iterations
+        self.exploration = exploration
+        self.processes = processes
+        self.rnd = random.Random(seed)
+        self.pool: Optional[Pool] = None
+        self.root: Optional[Node] = None
+        self.history: List[int] = []
+        self.playouts = 0
+        self.playouts_per_second = 0.0
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def reuse_tree(self, game: 'Game', last_player: int) -> Node:
+        """
+        Get tree node of current position, if played moves since last search are in the tree.
+
+        :param game: Game to play
+        :param last_player: Index of player who played last
+        :return: Root node for the search
+        """
+        node = self.root
+        moves = game.moves
+        if node is not None and moves[:len(self.history)] == self.history:
+            for cell in moves[len(self.history):]:
+                node = node.children.get(cell - 1)
+                if node is None:
+                    break
+            if node is not None and node.player == last_player:
+                node.parent = None
+                return node
+        return Node(None, last_player, None, [c for c, cell in enumerate(game.board.cells) if cell == ' '])
+
+    def get_choice(self, game: 'Game', player: str) -> int:
+        """
+        Choose a cell for given player.
+
+        :param game: Game to play
+        :param player: Player marker
+        :return: Most visited cell number
+        """
+        players = list(game.players)
+        last_player = (players.index(player) - 1) % len(players)
+        cells = list(game.board.cells)
+        if ' ' not in cells:
+            raise ValueError('Board is full, no move can be chosen')
+
+        start = time.perf_counter()
+        if self.processes > 1:
+            if self.pool is None:
+                self.pool = Pool(self.processes)
+            tasks = [
+                (cells, game.board.width, game.board.height, game.nb_marks, players, last_player, self.max_time,
+                 self.max_iterations, self.exploration, self.rnd.getrandbits(32))
+                for _ in range(self.processes)
+            ]
+            visits: Dict[int, int] = {}
+            self.playouts = 0
+            for tree_visits, playouts in self.pool.map(_search_visits, tasks):
+                self.playouts += playouts
+                for move, count in tree_visits.items():
+                    visits[move] = visits.get(move, 0) + count
+            move = max(visits, key=visits.get)
+        else:
+            root = self.reuse_tree(game, last_player)
+            self.playouts = search(root, cells, game.board.width, game.board.height, game.nb_marks, players,
+                                   start + self.max_time, self.max_iterations, self.exploration, self.rnd)
+            move = max(root.children, key=lambda m: root.children[m].visits)
+            self.root = root.children[move]
+            self.root.parent = None
+            self.history = list(game.moves) + [move + 1]
+
+        self.playouts_per_second = self.playouts / max(time.perf_counter() - start, 1e-9)
+        return move + 1
@@ -0,0 +1,246 @@
+"""
+Compact binary game records, written to append-only files and read back as a stream.
+
+A record holds the board configuration, players and cell numbers played, encoded as unsigned LEB128 varints:
+width, height, nb_marks, number of players, then each player marker (byte length and UTF-8 bytes),
+number of moves, then each move as cell number - 1.
+
+A file starts with magic ``TTTR`` and a version byte, followed by chunks. A chunk is the compressed length and
+the number of records (varints), then the zlib compressed records, each one prefixed by its byte length (varint).
+"""
+import zlib
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple, Type, Union
+
+from tictactoe.bitboard import BitBoard
+from tictactoe.board import Board
+from tictactoe.game import Game
+
+MAGIC = b'TTTR'
+VERSION = 1
+
+
+class GameRecord(NamedTuple):
+    width: int
+    height: int
+    nb_marks: int
+    players: Tuple[str, ...]
+    moves: Tuple[int, ...]
+
+    @classmethod
+    def from_game(cls, game: Game) -> 'GameRecord':
+        """
+        Record configuration and moves played of a game.
+
+        :param game: Game to record
+        :return: Game record
+        """
+        board = game.board
+        return cls(board.width, board.height, game.nb_marks, tuple(game.players), tuple(game.moves))
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """
+    Append an unsigned integer to given buffer as a LEB128 varint.
+
+    :param value: Integer to encode, positive or zero
+    :param out: Buffer to append to
+    """
+    while value >= 0x80:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data: Union[bytes, bytearray, memoryview], pos: int) -> Tuple[int, int]:
+    """
+    Decode a LEB128 varint.
+
+    :param data: Encoded data
+    :param pos: Position of the varint in data
+    :return: Decoded integer and position following the varint
+    """
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def read_varint(stream: BinaryIO) -> Optional[int]:
+    """
+    Read a LEB128 varint from a stream.
+
+    :param stream: Binary stream
+    :return: Decoded integer, None at end of stream
+    """
+    value = shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise ValueError('Truncated varint')
+            return None
+        value |= (byte[0] & 0x7f) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def encode_record(record: GameRecord) -> bytes:
+    """
+    Encode a game record.
+
+    :param record: Game record
+    :return: Encoded record, without its length prefix
+    """
+    out = bytearray()
+    for value in (record.width, record.height, record.nb_marks, len(record.players)):
+        encode_varint(value, out)
+    for player in record.players:
+        marker = player.encode()
+        encode_varint(len(marker), out)
+        out += marker
+    encode_varint(len(record.moves), out)
+    for cell in record.moves:
+        encode_varint(cell - 1, out)
+    return bytes(out)
+
+
+def decode_record(data: Union[bytes, memoryview], pos: int = 0) -> Tuple[GameRecord, int]:
+    """
+    Decode a game record.
+
+    :param data: Encoded data
+    :param pos: Position of the record in data
+    :return: Game record and position following the record
+    """
+    width, pos = decode_varint(data, pos)
+    height, pos = decode_varint(data, pos)
+    nb_marks, pos = decode_varint(data, pos)
+    nb_players, pos = decode_varint(data, pos)
+    players = []
+    for _ in range(nb_players):
+        size, pos = decode_varint(data, pos)
+        players.append(bytes(data[pos:pos + size]).decode())
+        pos += size
+    nb_moves, pos = decode_varint(data, pos)
+    moves = []
+    for _ in range(nb_moves):
+        cell, pos = decode_varint(data, pos)
+        moves.append(cell + 1)
+    return GameRecord(width, height, nb_marks, tuple(players), tuple(moves)), pos
+
+
+class RecordWriter:
+    """
+    Appends game records to a file, compressing them by chunks.
+    """
+
+    def __init__(self, file: Union[str, BinaryIO], chunk_size: int = 1 << 16, level: int = 6) -> None:
+        """
+        :param file: Records file path, created if needed, or binary stream to append to
+        :param chunk_size: Uncompressed size from which buffered records are written as a chunk
+        :param level: zlib compression level
+        """
+        self.file = open(file, 'ab') if isinstance(file, str) else file
+        if self.file.tell() == 0:
+            self.file.write(MAGIC + bytes([VERSION]))
+        self.chunk_size = chunk_size
+        self.level = level
+        self.buffer = bytearray()
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, record: GameRecord) -> None:
+        """
+        Buffer a record, writing buffered records if chunk size is reached.
+
+        :param record: Game record
+        """
+        data = encode_record(record)
+        encode_varint(len(data), self.buffer)
+        self.buffer += data
+        self.count += 1
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered records as a chunk.
+        """
+        if not self.count:
+            return
+        compressed = zlib.compress(self.buffer, self.level)
+        header = bytearray()
+        encode_varint(len(compressed), header)
+        encode_varint(self.count, header)
+        self.file.write(header + compressed)
+        self.file.flush()
+        self.buffer.clear()
+        self.count = 0
+
+    def close(self) -> None:
+        self.flush()
+        self.file.close()
+
+
+def read_records(path: str) -> Iterator[GameRecord]:
+    """
+    Read game records of a file, one chunk at a time.
+
+    :param path: Records file path
+    :return: Game records, in writing order
+    """
+    with open(path, 'rb') as f:
+        yield from read_stream(f)
+
+
+def read_stream(stream: BinaryIO) -> Iterator[GameRecord]:
+    """
+    Read game records of a binary stream, one chunk at a time.
+
+    :param stream: Records file content
+    :return: Game records, in writing order
+    """
+    header = stream.read(len(MAGIC) + 1)
+    if header[:len(MAGIC)] != MAGIC or header[len(MAGIC):] != bytes([VERSION]):
+        raise ValueError(f'Not a version {VERSION} game records stream')
+
+    while True:
+        size = read_varint(stream)
+        if size is None:
+            return
+        count = read_varint(stream)
+        compressed = stream.read(size)
+        if count is None or len(compressed) != size:
+            raise ValueError('Truncated game records chunk')
+        data = memoryview(zlib.decompress(compressed))
+        pos = 0
+        for _ in range(count):
+            length, pos = decode_varint(data, pos)
+            record, _ = decode_record(data, pos)
+            pos += length
+            yield record
+
+
+def replay(record: GameRecord, board_class: Type[Union[Board, BitBoard]] = Board) -> Iterator[Board]:
+    """
+    Replay a game record move by move.
+
+    :param record: Game record
+    :param board_class: Board implementation to use
+    :return: The same board, after each move
+    """
+    board = board_class(record.width, record.height)
+    for i, cell in enumerate(record.moves):
+        board.place_choice(cell, record.players[i % len(record.players)])
+        yield board
+
@@ -0,0 +1,138 @@
+from math import log10
+from typing import TYPE_CHECKING, List, Optional, Sequence, Set
+
+if TYPE_CHECKING:
+    from tictactoe.board import Board
+
+
+def render_row(cells: Sequence[str], width: int, row: int, idx_pad: int) -> str:
+    """
+    Render a row of cells, with cell numbers counted from 1 = top left.
+
+    :param cells: Cell markers, row by row
+    :param width: Board width
+    :param row: Row number (0 based)
+    :param idx_pad: Width of cell numbers
+    :return: Row representation
+    """
+    start = row * width
+    return ' | '.join(f'{str(start + c + 1).rjust(idx_pad)}: {cells[start + c]}' for c in range(width))
+
+
+def render(cells: Sequence[str], width: int, height: int) -> str:
+    """
+    Render given cells as a grid, with cell numbers counted from 1 = top left to (board size) = bottom right.
+
+    :param cells: Cell markers, row by row
+    :param width: Board width
+    :param height: Board height
+    :return: Grid representation of the cells
+    """
+    idx_pad = 1 + int(log10(width * height))
+    row_sep = '\n' + '-+-'.join(['-' * (3 + idx_pad)] * width) + '\n'
+    return row_sep.join(render_row(cells, width, r, idx_pad) for r in range(height))
+
+
+class BoardRenderer:
+    """
+    Renders a board, caching row strings and only re-rendering rows where a cell changed.
+
+    The board reports its changes with invalidate: each cell set on its own, and every cell when cells are replaced
+    or changed other than cell by cell.
+    """
+
+    def __init__(self, board: 'Board') -> None:
+        self.board = board
+        self.idx_pad = 1 + int(log10(board.width * board.height))
+        self.cell_width = 3 + self.idx_pad
+        self.row_sep = '-+-'.join(['-' * self.cell_width] * board.width)
+        self.rows: List[Optional[str]] = [None] * board.height
+        self.dirty: Set[int] = set()
+        self.changed: Set[int] = set()
+        self.cells = board.cells
+
+    def invalidate(self, cell: Optional[int] = None) -> None:
+        """
+        Mark given cell as changed, so that its row gets rendered again.
+
+        :param cell: Changed cell number, None if every cell may have changed
+        """
+        if cell is None:
+            self.rows = [None] * self.board.height
+            self.dirty.clear()
+            self.changed.clear()
+        else:
+            self.dirty.add((cell - 1) // self.board.width)
+            self.changed.add(cell)
+
+    def row(self, r: int) -> str:
+        """
+        Get representation of given row, rendering it only if needed.
+
+        :param r: Row number (0 based)
+        :return: Row representation
+        """
+        if self.cells is not self.board.cells:
+            self.cells = self.board.cells
+            self.invalidate()
+        if r in self.dirty:
+            self.dirty.discard(r)
+            self.rows[r] = None
+        row = self.rows[r]
+        if row is None:
+            row = self.rows[r] = render_row(self.board.cells, self.board.width, r, self.idx_pad)
+        return row
+
+    def render(self) -> str:
+        """
+        Render the whole board.
+
+        :return: Grid representation of the board, as given by render
+        """
+        return f'\n{self.row_sep}\n'.join(self.row(r) for r in range(self.board.height))
+
+    def render_window(self, x: int, y: int, width: int, height: int) -> str:
+        """
+        Render a window of the board, for boards too large to be printed.
+
+        :param x: Left column of the window (0 based)
+        :param y: Top row of the window (0 based)
+        :param width: Window width, in cells
+        :param height: Window height, in cells
+        :return: Grid representation of the window cells, with their board cell numbers
+        """
+        end_x, end_y = min(x + width, self.board.width), min(y + height, self.board.height)
+        x, y = max(x, 0), max(y, 0)
+        width, height = end_x - x, end_y - y
+        stride = self.cell_width + 3
+        start, end = x * stride, (x + width) * stride - 3
+        row_sep = f'\n{self.row_sep[start:end]}\n'
+        return row_sep.join(self.row(r)[start:end] for r in range(y, y + height))
+
+    def ansi_draw(self) -> str:
+        """
+        Render the whole board for a terminal, clearing the screen first. Resets changes reported by ansi_updates.
+
+        :return: ANSI escape sequences and grid representation
+        """
+        self.changed.clear()
+        return '\x1b[2J\x1b[H' + self.render() + '\n'
+
+    def ansi_updates(self) -> str:
+        """
+        Get ANSI escape sequences updating cells changed since the board was last drawn with ansi_draw or updated,
+        leaving the cursor below the grid.
+
+        :return: ANSI escape sequences, empty if no cell changed
+        """
+        if not self.changed:
+            return ''
+        width = self.board.width
+        stride = self.cell_width + 3
+        updates = []
+        for cell in sorted(self.changed):
+            r, c = divmod(cell - 1, width)
+            updates.append(f'\x1b[{2 * r + 1};{c * stride + self.idx_pad + 3}H{self.board.cells[cell - 1]}')
+        self.changed.clear()
+        updates.append(f'\x1b[{2 * self.board.height};1H')
+        return ''.join(updates)
@@ -0,0 +1,343 @@
+"""
+Asyncio game server hosting many concurrent matches.
+
+Clients talk to the server with a line based text protocol, over TCP or in process with LocalClient:
+
+- ``NEW <width> <height> <nb_marks> <players> [<move timeout>]``, players being distinct concatenated one character
+  markers other than ``.``: creates a match, answers ``OK <match id>``
+- ``JOIN <match id> <player>``: takes a player seat, answers ``OK <match id> <player>``
+- ``MOVE <match id> <player> <cell>``: plays a move for a joined player, answers ``OK <match id> <cell>``
+- ``BOARD <match id>``: answers ``OK <match id> <cells>``, empty cells being ``.``
+
+Errors are answered with ``ERROR <message>``. Joined clients are also notified of match events:
+``TURN <match id> <player>``, ``MOVED <match id> <player> <cell>``, ``WIN <match id> <player>``, ``DRAW <match id>``,
+``TIMEOUT <match id> <player>`` when a player did not move in time and lost the match, and ``EXPIRED <match id>``
+when players did not all join in time. Over TCP, the answer to a request is sent before the events it triggers.
+"""
+import asyncio
+import itertools
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tictactoe.game import Game
+
+WAITING, PLAYING, FINISHED = 'waiting', 'playing', 'finished'
+
+
+class MatchError(Exception):
+    """
+    Raised when a request cannot be applied to a match.
+    """
+
+
+class Match:
+    """
+    State machine of a game: waiting for players to join, playing, then finished.
+
+    Moves are submitted without blocking, and the player to move loses the match if no move is submitted
+    within move timeout: with 2 players, the other player wins. A match expires if its players did not all join
+    within join timeout.
+    """
+
+    def __init__(self, match_id: int, game: Game, move_timeout: Optional[float] = None,
+                 on_finish: Optional[Callable[['Match'], None]] = None, join_timeout: Optional[float] = None) -> None:
+        self.id = match_id
+        self.game = game
+        self.move_timeout = move_timeout
+        self.state = WAITING
+        self.seats: Dict[str, 'Session'] = {}
+        self.current_player = game.players[0]
+        self.winner: Optional[str] = None
+        self.timed_out: Optional[str] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.on_finish = on_finish
+        if join_timeout is not None:
+            self.timer = asyncio.get_running_loop().call_later(join_timeout, self.on_expire)
+
+    def notify(self, message: str) -> None:
+        for session in set(self.seats.values()):
+            session.send(message)
+
+    def join(self, session: 'Session', player: str) -> None:
+        """
+        Seat a session as given player, starting the match when every player has joined.
+
+        :param session: Joining client session
+        :param player: Player marker
+        """
+        if self.state != WAITING:
+            raise MatchError(f'match {self.id} is {self.state}')
+        if player not in self.game.players:
+            raise MatchError(f'unknown player {player}')
+        if player in self.seats:
+            raise MatchError(f'player {player} already joined')
+
+        self.seats[player] = session
+        if len(self.seats) == len(self.game.players):
+            if self.timer is not None:
+                self.timer.cancel()
+            self.state = PLAYING
+            self.start_turn()
+
+    def start_turn(self) -> None:
+        if self.move_timeout is not None:
+            self.timer = asyncio.get_running_loop().call_later(self.move_timeout, self.on_timeout)
+        self.notify(f'TURN {self.id} {self.current_player}')
+
+    def submit_move(self, session: 'Session', player: str, choice: str) -> int:
+        """
+        Play a move, validated with the same rules as Game.get_player_choice.
+
+        :param session: Client session submitting the move
+        :param player: Player marker
+        :param choice: Chosen cell number
+        :return: Played cell number
+        """
+        if self.state != PLAYING:
+            raise MatchError(f'match {self.id} is {self.state}')
+        if self.seats.get(player) is not session:
+            raise MatchError(f'player {player} is not yours')
+        if player != self.current_player:
+            raise MatchError(f'not your turn, player {self.current_player} is playing')
+        if not self.game.is_valid_choice(choice):
+            raise MatchError(f'"{choice}" is not a valid cell number')
+        if not self.game.is_available_choice(choice):
+            raise MatchError(f'"{choice}" cell is already taken')
+
+        if self.timer is not None:
+            self.timer.cancel()
+        cell = int(choice)
+        won = self.game.play_move(cell, player)
+        self.notify(f'MOVED {self.id} {player} {cell}')
+
+        if won:
+            self.finish(player)
+            self.notify(f'WIN {self.id} {player}')
+        elif self.game.board.is_full():
+            self.finish(None)
+            self.notify(f'DRAW {self.id}')
+        else:
+            self.current_player = self.game.get_next_player(player)
+            self.start_turn()
+        return cell
+
+    def on_timeout(self) -> None:
+        if self.state != PLAYING:
+            return
+        self.timed_out = self.current_player
+        players = self.game.players
+        self.finish(self.game.get_next_player(self.timed_out) if len(players) == 2 else None)
+        self.notify(f'TIMEOUT {self.id} {self.timed_out}')
+
+    def on_expire(self) -> None:
+        if self.state != WAITING:
+            return
+        self.finish(None)
+        self.notify(f'EXPIRED {self.id}')
+
+    def finish(self, winner: Optional[str]) -> None:
+        self.state = FINISHED
+        self.winner = self.game.winner = winner
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.on_finish is not None:
+            self.on_finish(self)
+
+
+class Session:
+    """
+    Client connection, receiving answers and match events through given send function.
+    """
+
+    def __init__(self, send: Callable[[str], None]) -> None:
+        self.send = send
+
+
+class GameServer:
+    """
+    Hosts matches and dispatches protocol requests to them.
+    """
+
+    def __init__(self, move_timeout: Optional[float] = 30.0, keep_finished: bool = False, max_size: int = 100,
+                 max_matches: int = 10_000, join_timeout: Optional[float] = 300.0) -> None:
+        """
+        :param move_timeout: Default time a player has to move, in seconds, None for no timeout
+        :param keep_finished: Keep finished matches, instead of forgetting them as soon as they end
+        :param max_size: Maximum board width and height
+        :param max_matches: Maximum number of matches hosted at the same time
+        :param join_timeout: Time players have to join a new match, in seconds, None for no timeout
+        """
+        self.move_timeout = move_timeout
+        self.keep_finished = keep_finished
+        self.max_size = max_size
+        self.max_matches = max_matches
+        self.join_timeout = join_timeout
+        self.matches: Dict[int, Match] = {}
+        self.ids = itertools.count(1)
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    def create_match(self, width: int = 3, height: int = 3, nb_marks: int = 3, players: List[str] = ('X', 'O'),
+                     move_timeout: Optional[float] = None) -> Match:
+        """
+        Create a match waiting for its players.
+
+        :param width: Board width
+        :param height: Board height
+        :param nb_marks: Number of adjacent marks to get a victory
+        :param players: Players markers, in playing order
+        :param move_timeout: Time a player has to move, in seconds, server default if None
+        :return: New match
+        """
+        if width < 1 or height < 1 or nb_marks < 1:
+            raise MatchError('width, height and nb_marks must be positive')
+        if width > self.max_size or height > self.max_size:
+            raise MatchError(f'width and height must not exceed {self.max_size}')
+        if len(set(players)) != len(players) or '.' in players:
+            raise MatchError('players must be distinct markers other than "."')
+        if move_timeout is not None and not (math.isfinite(move_timeout) and move_timeout > 0):
+            raise MatchError('move timeout must be a positive number of seconds')
+        if len(self.matches) >= self.max_matches:
+            raise MatchError(f'too many matches, at most {self.max_matches}')
+
+        match_id = next(self.ids)
+        timeout = self.move_timeout if move_timeout is None else move_timeout
+        on_finish = None if self.keep_finished else self.forget
+        match = Match(match_id, Game(width, height, nb_marks, list(players)), timeout, on_finish, self.join_timeout)
+        self.matches[match_id] = match
+        return match
+
+    def get_match(self, match_id: str) -> Match:
+        match = self.matches.get(int(match_id)) if match_id.isdigit() else None
+        if match is None:
+            raise MatchError(f'unknown match {match_id}')
+        return match
+
+    def forget(self, match: Match) -> None:
+        self.matches.pop(match.id, None)
+
+    def handle(self, session: Session, line: str) -> str:
+        """
+        Handle a protocol request.
+
+        :param session: Client session sending the request
+        :param line: Request line
+        :return: Answer line
+        """
+        args = line.split()
+        try:
+            command = args[0].upper() if args else ''
+            if command == 'NEW' and len(args) in (5, 6):
+                width, height, nb_marks = (int(arg) for arg in args[1:4])
+                timeout = float(args[5]) if len(args) == 6 else None
+                return f'OK {self.create_match(width, height, nb_marks, list(args[4]), timeout).id}'
+            if command == 'JOIN' and len(args) == 3:
+                match = self.get_match(args[1])
+                match.join(session, args[2])
+                return f'OK {match.id} {args[2]}'
+            if command == 'MOVE' and len(args) == 4:
+                match = self.get_match(args[1])
+                return f'OK {match.id} {match.submit_move(session, args[2], args[3])}'
+            if command == 'BOARD' and len(args) == 2:
+                match = self.get_match(args[1])
+                return f'OK {match.id} ' + ''.join(cell if cell != ' ' else '.' for cell in match.game.board.cells)
+            raise MatchError(f'invalid request "{line.strip()}"')
+        except (MatchError, ValueError) as e:
+            return f'ERROR {e}'
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Events triggered by a request of this connection are queued until the request is answered
+        queued: Optional[List[str]] = None
+
+        def send(message: str) -> None:
+            if queued is not None:
+                queued.append(message)
+            elif not writer.is_closing():
+                writer.write(message.encode() + b'\n')
+
+        session = Session(send)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                queued = []
+                answer = self.handle(session, line.decode(errors='replace'))
+                events, queued = queued, None
+                for message in (answer, *events):
+                    send(message)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765) -> Tuple[str, int]:
+        """
+        Start listening to TCP connections.
+
+        :param host: Host to listen on
+        :param port: Port to listen on, 0 for any free port
+        :return: Listened (host, port)
+        """
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+
+class LocalClient:
+    """
+    In process client, sending requests straight to a server and queueing received events.
+    """
+
+    def __init__(self, server: GameServer) -> None:
+        self.server = server
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.session = Session(self.events.put_nowait)
+
+    def request(self, line: str) -> str:
+        """
+        Send a request to the server.
+
+        :param line: Request line
+        :return: Answer line
+        """
+        return self.server.handle(self.session, line)
+
+    async def next_event(self, timeout: Optional[float] = None) -> str:
+        """
+        Wait for next match event.
+
+        :param timeout: Maximum time to wait, in seconds
+        :return: Event line
+        """
+        return await asyncio.wait_for(self.events.get(), timeout)
+
+    def pending_events(self) -> List[str]:
+        """
+        Get received events without waiting.
+
+        :return: Event lines
+        """
+        events = []
+        while not self.events.empty():
+            events.append(self.events.get_nowait())
+        return events
+
+
+def main(host: str = '127.0.0.1', port: int = 8765) -> None:
+    async def serve():
+        server = GameServer()
+        await server.start(host, port)
+        await server.server.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == '__main__':
+    main()
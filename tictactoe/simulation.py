@@ -0,0 +1,195 @@
+"""
+Headless self-play simulation, sharded across a process pool.
+
+Every shard plays its games with its own random generator, seeded from the run seed, the configuration and the shard
+number, so that a run gives the same statistics whatever the number of processes.
+"""
+import random
+from collections import Counter
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from tictactoe.ai import NegamaxPlayer
+from tictactoe.board import Board
+from tictactoe.game import Engine, Game
+
+
+def available_cells(board: Board) -> List[int]:
+    """
+    List cells where a marker can be placed.
+
+    :param board: Board to look at
+    :return: Available cell numbers
+    """
+    if isinstance(board, Board):
+        return sorted(board.free_cells())
+    return [cell_id + 1 for cell_id, cell in enumerate(board.cells) if cell == ' ']
+
+
+def wins_at(board: Board, cell: int, player: str, nb_marks: int) -> bool:
+    """
+    Check whether placing player's marker on given available cell wins the game. Board is left unchanged.
+
+    :param board: Board to look at
+    :param cell: Available cell number
+    :param player: Player marker
+    :param nb_marks: Number of adjacent marks to get a victory
+    :return: True if the move wins. False otherwise
+    """
+    board.place_choice(cell, player)
+    won = board.check_victory_at(cell, player, nb_marks)
+    board.undo()
+    return won
+
+
+class RandomPolicy:
+    """
+    Plays any available cell.
+    """
+
+    def __init__(self, rnd: random.Random) -> None:
+        self.rnd = rnd
+
+    def get_choice(self, game: Game, player: str) -> int:
+        if isinstance(game.board, Board):
+            return game.board.random_cell(self.rnd)
+        return self.rnd.choice(available_cells(game.board))
+
+
+class HeuristicPolicy(RandomPolicy):
+    """
+    Wins if possible, otherwise blocks a winning cell of another player, otherwise plays any available cell.
+    """
+
+    def get_choice(self, game: Game, player: str) -> int:
+        cells = available_cells(game.board)
+        for cell in cells:
+            if wins_at(game.board, cell, player, game.nb_marks):
+                return cell
+        for other in game.players:
+            if other != player:
+                for cell in cells:
+                    if wins_at(game.board, cell, other, game.nb_marks):
+                        return cell
+        return self.rnd.choice(cells)
+
+
+class SearchPolicy(NegamaxPlayer):
+    """
+    Negamax search limited by a node budget, so that results do not depend on machine speed.
+    """
+
+    def __init__(self, rnd: random.Random, max_nodes: int = 2000) -> None:
+        super().__init__(max_time=float('inf'), max_nodes=max_nodes)
+
+
+POLICIES = {
+    'random': RandomPolicy,
+    'heuristic': HeuristicPolicy,
+    'search': SearchPolicy,
+}
+
+
+class Config(NamedTuple):
+    width: int = 3
+    height: int = 3
+    nb_marks: int = 3
+    players: Tuple[str, ...] = ('X', 'O')
+
+
+class Stats:
+    """
+    Win/draw/loss statistics of a configuration.
+    """
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.draws = 0
+        self.wins: Counter = Counter()
+
+    def add(self, other: 'Stats') -> None:
+        """
+        Add statistics of other games.
+
+        :param other: Statistics to add
+        """
+        self.games += other.games
+        self.draws += other.draws
+        self.wins.update(other.wins)
+
+    def losses(self, player: str) -> int:
+        """
+        Count games lost by given player.
+
+        :param player: Player marker
+        :return: Number of games won by another player
+        """
+        return self.games - self.draws - self.wins[player]
+
+    def to_dict(self, players: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Get win/draw/loss counts by player.
+
+        :param players: Players markers
+        :return: Counts by player marker
+        """
+        return {p: {'wins': self.wins[p], 'draws': self.draws, 'losses': self.losses(p)} for p in players}
+
+
+def play_shard(config: Config, policies: Dict[str, str], nb_games: int, seed: str) -> Stats:
+    """
+    Play games of given configuration.
+
+    :param config: Board configuration and players
+    :param policies: Policy name by player marker
+    :param nb_games: Number of games to play
+    :param seed: Shard random seed
+    :return: Shard statistics
+    """
+    rnd = random.Random(seed)
+    engines: Dict[str, Engine] = {player: POLICIES[policies[player]](rnd) for player in config.players}
+    stats = Stats()
+    for _ in range(nb_games):
+        game = Game(config.width, config.height, config.nb_marks, list(config.players), engines=engines)
+        winner = game.play()
+        stats.games += 1
+        if winner is None:
+            stats.draws += 1
+        else:
+            stats.wins[winner] += 1
+    return stats
+
+
+def _play_shard(args: Tuple[Config, Dict[str, str], int, str]) -> Tuple[Config, Stats]:
+    return args[0], play_shard(*args)
+
+
+def simulate(configs: Sequence[Config], policies: Dict[str, str], nb_games: int, nb_shards: int = 16,
+             processes: Optional[int] = None, seed: int = 0) -> Dict[Config, Stats]:
+    """
+    Play games of every configuration between given policies, without any terminal I/O.
+
+    :param configs: Board configurations and players
+    :param policies: Policy name (key of POLICIES) by player marker
+    :param nb_games: Number of games to play for each configuration
+    :param nb_shards: Number of shards games of a configuration are split into
+    :param processes: Number of worker processes, None for one per CPU, 1 to play in current process
+    :param seed: Run seed
+    :return: Statistics by configuration
+    """
+    tasks = []
+    for config in configs:
+        for shard in range(nb_shards):
+            shard_games = nb_games // nb_shards + (1 if shard < nb_games % nb_shards else 0)
+            if shard_games:
+                tasks.append((config, policies, shard_games, f'{seed}:{tuple(config)}:{shard}'))
+
+    results = {config: Stats() for config in configs}
+    if processes == 1:
+        for config, stats in map(_play_shard, tasks):
+            results[config].add(stats)
+    else:
+        with Pool(processes) as pool:
+            for config, stats in pool.imap_unordered(_play_shard, tasks):
+                results[config].add(stats)
+    return results
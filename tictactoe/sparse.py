@@ -0,0 +1,243 @@
+from typing import Dict, Optional, Set, Tuple
+
+from tictactoe.board import DIRECTIONS
+from tictactoe.renderer import render
+
+FULL_RENDER_SIZE = 1024
+"""Bounded boards of at most this number of cells are printed whole, like Board"""
+
+
+class SparseBoard:
+    """
+    Board storing only occupied cells, in a dict keyed by (x, y) coordinates (0 based).
+
+    Without width and height, the board is unbounded: cells are then only addressed by coordinates,
+    with place_at and check_victory_at_xy, and the board is never full.
+    """
+
+    def __init__(self, width: Optional[int] = 3, height: Optional[int] = 3):
+        if (width is None) != (height is None):
+            raise ValueError('Both width and height must be given, or none of them for an unbounded board')
+        self.width = width
+        self.height = height
+        self.marks: Dict[Tuple[int, int], str] = {}
+        self.player_marks: Dict[str, Set[Tuple[int, int]]] = {}
+        self.occupied = 0
+        self.bounds: Optional[Tuple[int, int, int, int]] = None
+
+    @property
+    def bounded(self) -> bool:
+        return self.width is not None
+
+    def __len__(self):
+        if not self.bounded:
+            raise TypeError('Unbounded board has no size')
+        return self.width * self.height
+
+    def __str__(self):
+        if self.bounded and self.width * self.height <= FULL_RENDER_SIZE:
+            cells = [' '] * (self.width * self.height)
+            for (x, y), player in self.marks.items():
+                cells[x + y * self.width] = player
+            return render(cells, self.width, self.height)
+        return self.render(numbers=self.bounded)
+
+    def to_xy(self, cell: int) -> Optional[Tuple[int, int]]:
+        """
+        Get coordinates of given cell number, on a bounded board.
+
+        :param cell: Cell number (1 = top left, board size = bottom right)
+        :return: (x, y) coordinates (0 based), None if cell is out of board
+        """
+        if not self.bounded:
+            raise ValueError('Cells of an unbounded board are only addressed by coordinates')
+        if not 1 <= cell <= self.width * self.height:
+            return None
+        return (cell - 1) % self.width, (cell - 1) // self.width
+
+    def is_on_board(self, x: int, y: int) -> bool:
+        return not self.bounded or (0 <= x < self.width and 0 <= y < self.height)
+
+    def is_full(self) -> bool:
+        """
+        Checks whether board is full, i.e. no more marker can be added.
+
+        :return: True if no more marker can be added. False otherwise, always for unbounded boards
+        """
+        return self.bounded and self.occupied == self.width * self.height
+
+    def is_available(self, cell: int) -> bool:
+        """
+        Checks whether given cell is on board and has no marker yet.
+
+        :param cell: Cell number (1 = top left, board size = bottom right)
+        :return: True if a marker can be placed on given cell. False otherwise
+        """
+        xy = self.to_xy(cell)
+        return xy is not None and xy not in self.marks
+
+    def has_mark_at(self, cell: int, player: str) -> bool:
+        """
+        Check if player has marked given cell on board
+
+        :param cell: Cell number (1 = top left, board size = bottom right)
+        :param player: Player marker
+        :return: True if player has marked corresponding cell
+        or False if not or if index is out of board
+        """
+        xy = self.to_xy(cell)
+        return xy is not None and self.marks.get(xy) == player
+
+    def place_choice(self, cell: int, player: str) -> None:
+        """
+        Place given player's choice on board.
+
+        :param cell: Cell number (1 = top left, board size = bottom right)
+        :param player: Player marker
+        """
+        xy = self.to_xy(cell)
+        if xy is None:
+            return None
+
+        self.place_at(*xy, player)
+
+    def place_at(self, x: int, y: int, player: str) -> None:
+        """
+        Place given player's marker at given coordinates.
+
+        :param x: Column (0 based)
+        :param y: Row (0 based)
+        :param player: Player marker
+        """
+        if not self.is_on_board(x, y):
+            return None
+
+        previous = self.marks.get((x, y))
+        if previous is not None:
+            self.player_marks[previous].discard((x, y))
+        else:
+            self.occupied += 1
+        self.marks[(x, y)] = player
+        self.player_marks.setdefault(player, set()).add((x, y))
+
+        if self.bounds is None:
+            self.bounds = (x, y, x, y)
+        else:
+            min_x, min_y, max_x, max_y = self.bounds
+            self.bounds = (min(min_x, x), min(min_y, y), max(max_x, x), max(max_y, y))
+
+    def count_marks(self, x: int, y: int, player: str, add_x: int, add_y: int, limit: int) -> int:
+        """
+        Count player's consecutive marks next to given coordinates, into add_x/add_y direction, up to limit.
+
+        :param x: Column to count from (0 based)
+        :param y: Row to count from (0 based)
+        :param player: Player marker to look for
+        :param add_x: Offset to add to x coordinate
+        :param add_y: Offset to add to y coordinate
+        :param limit: Maximum number of marks to count
+        :return: Number of consecutive player marks found after given coordinates
+        """
+        count = 0
+        x, y = x + add_x, y + add_y
+        while count < limit and self.marks.get((x, y)) == player:
+            count += 1
+            x, y = x + add_x, y + add_y
+        return count
+
+    def check_victory_at_xy(self, x: int, y: int, player: str, nb_marks: int) -> bool:
+        """
+        Check if given player's mark at given coordinates is part of enough adjacent markers on board.
+
+        :param x: Column of the last placed marker (0 based)
+        :param y: Row of the last placed marker (0 based)
+        :param player: Player marker to look for
+        :param nb_marks: Number of adjacent marks to get a victory
+        :return: True if given player has marked enough adjacent marks through given cell. False otherwise
+        """
+        if self.marks.get((x, y)) != player:
+            return False
+
+        for add_x, add_y in DIRECTIONS:
+            count = 1 + self.count_marks(x, y, player, add_x, add_y, nb_marks - 1)
+            if count < nb_marks:
+                count += self.count_marks(x, y, player, -add_x, -add_y, nb_marks - count)
+            if count >= nb_marks:
+                return True
+        return False
+
+    def check_victory_at(self, cell: int, player: str, nb_marks: int) -> bool:
+        """
+        Check if given player's mark at given cell is part of enough adjacent markers on board.
+
+        :param cell: Cell number of the last placed marker
+        :param player: Player marker to look for
+        :param nb_marks: Number of adjacent marks to get a victory
+        :return: True if given player has marked enough adjacent marks through given cell. False otherwise
+        """
+        xy = self.to_xy(cell)
+        return xy is not None and self.check_victory_at_xy(*xy, player, nb_marks)
+
+    def check_victory(self, player: str, nb_marks: int) -> bool:
+        """
+        Check if given player has marked enough adjacent markers on board, only looking at player's marks.
+
+        :param player: Player marker to look for
+        :param nb_marks: Number of adjacent marks to get a victory
+        :return: True if given player has marked enough adjacent marks on board. False otherwise
+        """
+        for x, y in self.player_marks.get(player, ()):
+            for add_x, add_y in DIRECTIONS:
+                if self.marks.get((x - add_x, y - add_y)) == player:
+                    # Not the first mark of its run
+                    continue
+                if 1 + self.count_marks(x, y, player, add_x, add_y, nb_marks - 1) >= nb_marks:
+                    return True
+        return False
+
+    def render(self, x: Optional[int] = None, y: Optional[int] = None, width: Optional[int] = None,
+               height: Optional[int] = None, margin: int = 1, numbers: bool = False) -> str:
+        """
+        Render a window of the board, '.' standing for empty cells. Rows are prefixed with their y coordinate.
+
+        Window defaults to the area around placed marks, clipped to board bounds. A missing width or height
+        extends the window up to that area.
+
+        :param x: Left column of the window (0 based)
+        :param y: Top row of the window (0 based)
+        :param width: Window width
+        :param height: Window height
+        :param margin: Number of cells to show around placed marks, when window is not given
+        :param numbers: Show cells as "<cell number>: <marker>", like Board does, instead of y coordinates and '.'.
+        Only for bounded boards
+        :return: Window representation
+        """
+        if numbers and not self.bounded:
+            raise ValueError('Cells of an unbounded board are only addressed by coordinates')
+        min_x, min_y, max_x, max_y = self.bounds or (0, 0, 0, 0)
+        if x is None:
+            x = min_x - margin
+        if width is None:
+            width = max(max_x + margin + 1 - x, 1)
+        if y is None:
+            y = min_y - margin
+        if height is None:
+            height = max(max_y + margin + 1 - y, 1)
+        if self.bounded:
+            end_x, end_y = min(x + width, self.width), min(y + height, self.height)
+            x, y = max(x, 0), max(y, 0)
+            width, height = end_x - x, end_y - y
+
+        rows = []
+        if numbers:
+            idx_pad = len(str(self.width * self.height))
+            for row in range(y, y + height):
+                rows.append(' | '.join(f'{str(col + row * self.width + 1).rjust(idx_pad)}: '
+                                       f'{self.marks.get((col, row), " ")}' for col in range(x, x + width)))
+            return '\n'.join(rows)
+
+        label_pad = max(len(str(y)), len(str(y + height - 1)))
+        for row in range(y, y + height):
+            cells = ' '.join(self.marks.get((col, row), '.') for col in range(x, x + width))
+            rows.append(f'{str(row).rjust(label_pad)}: {cells}')
+        return '\n'.join(rows)
@@ -0,0 +1,380 @@
+"""
+Exhaustive enumeration of the reachable state space of a board configuration.
+
+Positions are enumerated depth by depth (number of marks on board), up to symmetry, and each depth is stored in a
+file of sorted position keys. Memory does not grow with the size of a depth: children are collected into sorted runs
+of at most RUN positions spilled to disk, which are merged into the next depth file, dropping duplicates. Values are
+then computed backwards, from deepest depth to empty board, only loading the keys and values of the next depth.
+
+Symmetric forms of a child are not encoded from scratch: they are the symmetric keys of its parent, plus the digit
+of the placed marker at the position the cell takes in each symmetric form.
+"""
+import heapq
+import os
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from operator import add
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from tictactoe.bitboard import win_masks
+from tictactoe.board import Board, BoardSnapshot
+from tictactoe.codec import codes, decode
+from tictactoe.symmetry import transforms
+
+CHUNK = 1 << 16
+RUN = 1 << 20
+
+
+class StateSpaceStats:
+    """
+    Counts of reachable positions, distinct up to symmetry unless told otherwise.
+    """
+
+    def __init__(self, players: Sequence[str]) -> None:
+        self.positions = 0
+        self.raw_positions = 0
+        self.by_depth: List[int] = []
+        self.wins: Dict[str, int] = {player: 0 for player in players}
+        self.draws = 0
+        self.value: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'positions': self.positions, 'raw_positions': self.raw_positions, 'by_depth': self.by_depth,
+            'wins': self.wins, 'draws': self.draws, 'value': self.value,
+        }
+
+
+def write_array(path: str, typecode: str, values: Iterable[int]) -> int:
+    """
+    Write values to a file by chunks, in given order.
+
+    :param path: File path
+    :param typecode: Array type code of values
+    :param values: Values to write
+    :return: Number of values written
+    """
+    count = 0
+    with open(path, 'wb') as f:
+        chunk = array(typecode)
+        for value in values:
+            chunk.append(value)
+            if len(chunk) == CHUNK:
+                chunk.tofile(f)
+                count += len(chunk)
+                chunk = array(typecode)
+        chunk.tofile(f)
+    return count + len(chunk)
+
+
+def read_array(path: str, typecode: str) -> Iterator[int]:
+    """
+    Read a file written by write_array, by chunks.
+
+    :param path: File path
+    :param typecode: Array type code of values
+    :return: Values
+    """
+    count = os.path.getsize(path) // array(typecode).itemsize
+    with open(path, 'rb') as f:
+        while count:
+            chunk = array(typecode)
+            chunk.fromfile(f, min(CHUNK, count))
+            count -= len(chunk)
+            yield from chunk
+
+
+def load_array(path: str, typecode: str) -> array:
+    """
+    Load a whole file written by write_array.
+
+    :param path: File path
+    :param typecode: Array type code of values
+    :return: Values
+    """
+    values = array(typecode)
+    with open(path, 'rb') as f:
+        values.fromfile(f, os.path.getsize(path) // values.itemsize)
+    return values
+
+
+def write_keys(path: str, keys: Set[int]) -> None:
+    write_array(path, 'Q', sorted(keys))
+
+
+def read_keys(path: str) -> Iterator[int]:
+    """
+    Read a keys file by chunks.
+
+    :param path: Keys file path
+    :return: Position keys
+    """
+    return read_array(path, 'Q')
+
+
+def write_run(path: str, orbits: Dict[int, int]) -> None:
+    """
+    Spill a run of positions, sorted by key.
+
+    :param path: Run file path. Orbits are written next to it
+    :param orbits: Number of distinct symmetric positions by position key
+    """
+    keys = sorted(orbits)
+    write_array(path, 'Q', keys)
+    write_array(path + '.orbits', 'B', (orbits[key] for key in keys))
+
+
+def merge_runs(paths: Sequence[str], path: str) -> Tuple[int, int]:
+    """
+    Merge spilled runs into a keys file, dropping duplicate positions, and delete the runs.
+
+    :param paths: Run files paths
+    :param path: Keys file path
+    :return: Number of distinct positions, and total number of their distinct symmetric positions
+    """
+    raw = 0
+
+    def merged() -> Iterator[int]:
+        nonlocal raw
+        previous = None
+        runs = [zip(read_array(run, 'Q'), read_array(run + '.orbits', 'B')) for run in paths]
+        for key, orbit in heapq.merge(*runs):
+            if key != previous:
+                previous = key
+                raw += orbit
+                yield key
+
+    count = write_array(path, 'Q', merged())
+    for run in paths:
+        os.remove(run)
+        os.remove(run + '.orbits')
+    return count, raw
+
+
+class StateSpace:
+    """
+    Enumerates every position reachable from the empty board of a configuration.
+    """
+
+    def __init__(self, width: int = 3, height: int = 3, nb_marks: int = 3, players: Sequence[str] = ('X', 'O'),
+                 symmetry: bool = True) -> None:
+        """
+        :param width: Board width
+        :param height: Board height
+        :param nb_marks: Number of adjacent marks to get a victory
+        :param players: Players markers, in playing order
+        :param symmetry: Count symmetric positions once
+        """
+        if (len(players) + 1) ** (width * height) > 1 << 64:
+            raise ValueError('Board is too large for 64 bits position keys')
+        self.width = width
+        self.height = height
+        self.nb_marks = nb_marks
+        self.players = list(players)
+        self.size = width * height
+        self.perms = transforms(width, height) if symmetry else (tuple(range(self.size)),)
+        self.powers = [(len(players) + 1) ** i for i in range(self.size)]
+        self.digits = codes(players)
+        _, self.cell_masks = win_masks(width, height, nb_marks)
+
+        # Key increment of each symmetric form, when a player's marker is placed on a cell
+        positions = []
+        for perm in self.perms:
+            position = [0] * self.size
+            for i, cell_id in enumerate(perm):
+                position[cell_id] = i
+            positions.append(position)
+        self.offsets = [[tuple((mover + 1) * self.powers[position[cell_id]] for position in positions)
+                         for cell_id in range(self.size)]
+                        for mover in range(len(players))]
+
+    def symmetric_keys(self, digits: Sequence[int]) -> List[int]:
+        """
+        Get keys of every symmetric form of a position, in transforms order.
+
+        :param digits: Digit of each cell (0 for an empty cell, i + 1 for i-th player)
+        :return: Position keys
+        """
+        return [sum(map(int.__mul__, [digits[cell_id] for cell_id in perm], self.powers)) for perm in self.perms]
+
+    def canonical(self, cells: Sequence[str]) -> Tuple[int, int]:
+        """
+        Get key of canonical form of a position.
+
+        :param cells: Board cells
+        :return: Smallest key of symmetric positions, and number of distinct symmetric positions
+        """
+        keys = set(self.symmetric_keys([self.digits[cell] for cell in cells]))
+        return min(keys), len(keys)
+
+    def orient(self, cells: Sequence[str]) -> Tuple[int, int]:
+        """
+        Get key of canonical form of a position, and the transform giving it.
+
+        :param cells: Board cells
+        :return: Smallest key of symmetric positions, and index of its transform in perms
+        """
+        keys = self.symmetric_keys([self.digits[cell] for cell in cells])
+        transform = keys.index(min(keys))
+        return keys[transform], transform
+
+    def children(self, key: int, depth: int) -> Iterator[Tuple[int, int, bool, int]]:
+        """
+        Generate positions reached by one move from a non terminal position.
+
+        :param key: Position key
+        :param depth: Number of marks of the position
+        :return: (cell index (0 based), canonical key, True if the move wins, number of distinct symmetric positions)
+        of each child
+        """
+        mover = depth % len(self.players)
+        digits = [0] * self.size
+        bits = 0
+        for cell_id in range(self.size):
+            key, digits[cell_id] = divmod(key, len(self.players) + 1)
+            if digits[cell_id] == mover + 1:
+                bits |= 1 << cell_id
+        keys = self.symmetric_keys(digits)
+        offsets = self.offsets[mover]
+
+        for cell_id, digit in enumerate(digits):
+            if digit:
+                continue
+            child_keys = set(map(add, keys, offsets[cell_id]))
+            child_bits = bits | 1 << cell_id
+            wins = any(child_bits & mask == mask for mask in self.cell_masks[cell_id])
+            yield cell_id, min(child_keys), wins, len(child_keys)
+
+    @staticmethod
+    def path(directory: str, kind: str, depth: int) -> str:
+        """
+        :param directory: Directory of depth files
+        :param kind: "open", "won", "values" or "moves"
+        :param depth: Number of marks of positions
+        :return: Path of depth file
+        """
+        return os.path.join(directory, f'{depth}.{kind}')
+
+    def enumerate(self, work_dir: Optional[str] = None) -> StateSpaceStats:
+        """
+        Enumerate every reachable position, counting positions, wins and draws, and solving the game value for
+        2 players (1 if first player wins, 0 for a draw, -1 if second player wins).
+
+        :param work_dir: Directory for the spilled depth files, system temporary directory if None
+        :return: State space statistics
+        """
+        with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+            stats = self.expand(tmp)
+            if len(self.players) == 2:
+                stats.value = self.solve(tmp, len(stats.by_depth) - 1)
+        return stats
+
+    def expand(self, directory: str) -> StateSpaceStats:
+        """
+        Enumerate positions depth by depth, writing open and won positions keys of each depth to files.
+
+        :param directory: Directory for the depth files
+        :return: State space statistics, without game value
+        """
+        stats = StateSpaceStats(self.players)
+        write_keys(self.path(directory, 'open', 0), {0})
+        write_keys(self.path(directory, 'won', 0), set())
+        stats.by_depth.append(1)
+        stats.positions = stats.raw_positions = 1
+
+        depth, nb_open = 0, 1
+        while depth < self.size and nb_open:
+            runs: Dict[str, List[str]] = {'open': [], 'won': []}
+            pending: Dict[str, Dict[int, int]] = {'open': {}, 'won': {}}
+
+            def spill(kind: str) -> None:
+                runs[kind].append(self.path(directory, f'{kind}.{len(runs[kind])}', depth + 1))
+                write_run(runs[kind][-1], pending[kind])
+                pending[kind].clear()
+
+            for key in read_keys(self.path(directory, 'open', depth)):
+                for _, child, wins, orbit in self.children(key, depth):
+                    kind = 'won' if wins else 'open'
+                    pending[kind][child] = orbit
+                    if len(pending[kind]) >= RUN:
+                        spill(kind)
+
+            counts = {}
+            for kind in ('open', 'won'):
+                spill(kind)
+                counts[kind], raw = merge_runs(runs[kind], self.path(directory, kind, depth + 1))
+                stats.raw_positions += raw
+
+            depth += 1
+            nb_open = counts['open']
+            stats.by_depth.append(counts['open'] + counts['won'])
+            stats.positions += counts['open'] + counts['won']
+            stats.wins[self.players[(depth - 1) % len(self.players)]] += counts['won']
+            if depth == self.size:
+                stats.draws += counts['open']
+        return stats
+
+    def board(self, key: int) -> Board:
+        """
+        Build the board of a position.
+
+        :param key: Position key
+        :return: Board
+        """
+        cells = decode(key, self.size, self.players)
+        return Board.from_snapshot(BoardSnapshot(self.width, self.height, tuple(cells)))
+
+    def solve(self, directory: str, max_depth: int) -> int:
+        """
+        Compute values and best moves of 2 players positions backwards, from deepest depth to empty board, and write
+        them to files aligned with the open positions files.
+
+        Only the keys and values of the depth below the solved one are kept in memory, to look children up.
+
+        :param directory: Directory of the depth files written by expand
+        :param max_depth: Deepest depth written
+        :return: Value of empty board for first player
+        """
+        next_keys, next_values = array('Q'), array('b')
+        for depth in range(max_depth, -1, -1):
+            keys = load_array(self.path(directory, 'open', depth), 'Q')
+            values, moves = array('b'), array('Q')
+            for key in keys:
+                best_value, best_moves = 0 if depth == self.size else -2, 0
+                for cell_id, child, wins, _ in self.children(key, depth):
+                    value = 1 if wins else -next_values[bisect_left(next_keys, child)]
+                    if value > best_value:
+                        best_value, best_moves = value, 0
+                    if value == best_value:
+                        best_moves |= 1 << cell_id
+                values.append(best_value)
+                moves.append(best_moves)
+            write_array(self.path(directory, 'values', depth), 'b', values)
+            write_array(self.path(directory, 'moves', depth), 'Q', moves)
+            next_keys, next_values = keys, values
+        return next_values[0]
+
+    def solved(self, directory: str, max_depth: int) -> Iterator[Tuple[int, int, int]]:
+        """
+        Read solved positions of every depth, merged by key.
+
+        :param directory: Directory of the depth files written by expand and solve
+        :param max_depth: Deepest depth written
+        :return: (canonical key, value for player to move: 1 win, 0 draw, -1 loss, best moves bitmask of canonical
+        board cells) of each position, sorted by key
+        """
+        depths = []
+        for depth in range(max_depth + 1):
+            depths.append(zip(read_keys(self.path(directory, 'open', depth)),
+                              read_array(self.path(directory, 'values', depth), 'b'),
+                              read_array(self.path(directory, 'moves', depth), 'Q')))
+            depths.append((key, -1, 0) for key in read_keys(self.path(directory, 'won', depth)))
+        return heapq.merge(*depths)
+
+
+if __name__ == '__main__':
+    width, height, nb_marks = int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3])
+    players = list(sys.argv[4]) if len(sys.argv) > 4 else ['X', 'O']
+    print(StateSpace(width, height, nb_marks, players).enumerate().to_dict())
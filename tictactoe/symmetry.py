@@ -0,0 +1,169 @@
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Tuple
+
+
+@lru_cache(maxsize=None)
+def transforms(width: int, height: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    List board symmetries as cell permutations: 8 on square boards, 4 on other ones.
+
+    For a permutation perm, cell index i of transformed board is cell index perm[i] of original board.
+    First permutation is identity.
+
+    :param width: Board width
+    :param height: Board height
+    :return: Permutations of 0 based cell indexes
+    """
+    w, h = width - 1, height - 1
+    coordinates = [
+        lambda x, y: (x, y),
+        lambda x, y: (w - x, h - y),
+        lambda x, y: (w - x, y),
+        lambda x, y: (x, h - y),
+    ]
+    if width == height:
+        coordinates += [
+            lambda x, y: (y, x),
+            lambda x, y: (w - y, h - x),
+            lambda x, y: (y, h - x),
+            lambda x, y: (w - y, x),
+        ]
+
+    perms = []
+    for coordinate in coordinates:
+        perm = []
+        for cell_id in range(width * height):
+            x, y = coordinate(cell_id % width, cell_id // width)
+            perm.append(x + y * width)
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+def canonicalize(cells: Sequence[str], width: int, height: int) -> Tuple[Tuple[str, ...], int]:
+    """
+    Get canonical form of given board cells, i.e. the smallest of its symmetric forms.
+
+    :param cells: Board cells
+    :param width: Board width
+    :param height: Board height
+    :return: Canonical cells, and index of transform used to get them
+    """
+    best, best_transform = None, 0
+    for transform, perm in enumerate(transforms(width, height)):
+        candidate = tuple(cells[i] for i in perm)
+        if best is None or candidate < best:
+            best, best_transform = candidate, transform
+    return best, best_transform
+
+
+def to_canonical(cell: int, transform: int, width: int, height: int) -> int:
+    """
+    Map a cell number of original board to the canonical board obtained with given transform.
+
+    :param cell: Cell number on original board
+    :param transform: Transform index, as given by canonicalize
+    :param width: Board width
+    :param height: Board height
+    :return: Cell number on canonical board
+    """
+    return 1 + transforms(width, height)[transform].index(cell - 1)
+
+
+def from_canonical(cell: int, transform: int, width: int, height: int) -> int:
+    """
+    Map a cell number of canonical board back to the original board it was obtained from with given transform.
+
+    :param cell: Cell number on canonical board
+    :param transform: Transform index, as given by canonicalize
+    :param width: Board width
+    :param height: Board height
+    :return: Cell number on original board
+    """
+    return 1 + transforms(width, height)[transform][cell - 1]
+
+
+class PositionCache:
+    """
+    Cache of position evaluations shared by all symmetric positions, with least recently used eviction.
+
+    Best moves are stored on canonical boards and mapped back to the orientation of the board they are asked for.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """
+        :param max_entries: Maximum number of stored positions, None for no limit
+        :param max_bytes: Maximum estimated memory used by stored positions, None for no limit
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def entry_size(key: Tuple, value: Any) -> int:
+        """
+        Estimate memory used by a cache entry.
+
+        :param key: Entry key
+        :param value: Entry value
+        :return: Estimated size in bytes
+        """
+        return sys.getsizeof(key) + sys.getsizeof(key[2]) + sys.getsizeof(value)
+
+    def get(self, cells: Sequence[str], width: int, height: int) -> Optional[Tuple[Any, Optional[int]]]:
+        """
+        Get stored evaluation of given position or of one of its symmetric positions.
+
+        :param cells: Board cells
+        :param width: Board width
+        :param height: Board height
+        :return: (value, best move cell number on given board) or None if position is unknown
+        """
+        canonical, transform = canonicalize(cells, width, height)
+        key = (width, height, canonical)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        value, move = entry
+        if move is not None:
+            move = from_canonical(move, transform, width, height)
+        return value, move
+
+    def put(self, cells: Sequence[str], width: int, height: int, value: Any, move: Optional[int] = None) -> None:
+        """
+        Store evaluation of given position, evicting least recently used positions if needed.
+
+        :param cells: Board cells
+        :param width: Board width
+        :param height: Board height
+        :param value: Position value (e.g. win/draw/loss)
+        :param move: Best move cell number on given board, if any
+        """
+        canonical, transform = canonicalize(cells, width, height)
+        key = (width, height, canonical)
+        if move is not None:
+            move = to_canonical(move, transform, width, height)
+
+        if key in self.entries:
+            self.nbytes -= self.entry_size(key, self.entries.pop(key))
+        entry = (value, move)
+        self.entries[key] = entry
+        self.nbytes += self.entry_size(key, entry)
+
+        while self.entries and (
+                (self.max_entries is not None and len(self.entries) > self.max_entries)
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            old_key, old_entry = self.entries.popitem(last=False)
+            self.nbytes -= self.entry_size(old_key, old_entry)
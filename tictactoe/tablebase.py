@@ -0,0 +1,227 @@
+"""
+Perfect play tablebase for small 2 players boards.
+
+The generator solves every reachable position once, up to symmetry, and writes it to a binary file, which is then
+memory-mapped by Tablebase so that lookups need no solving and no copy, and file pages are shared by all processes
+using it. Positions are enumerated and solved depth by depth by StateSpace, spilling each depth to disk, so that
+generation memory does not grow with the number of positions.
+
+File layout, little endian:
+
+- header: magic ``TTTB``, version, width, height, nb_marks, nb_players (unsigned bytes), record count (uint32),
+  then one byte per player marker
+- records sorted by canonical position key (smallest key of symmetric positions, see StateSpace): key (uint64),
+  value for player to move (int8: 1 win, 0 draw, -1 loss), best moves of the canonical position as a bitmask of cells
+  (uint32, bit i for cell number i + 1)
+"""
+import mmap
+import struct
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+from tictactoe.statespace import StateSpace
+
+if TYPE_CHECKING:
+    from tictactoe.game import Game
+
+MAGIC = b'TTTB'
+VERSION = 2
+HEADER = struct.Struct('<4sBBBBBI')
+RECORD = struct.Struct('<QbI')
+
+
+def solve_layers(width: int, height: int, nb_marks: int, players: Sequence[str], directory: str
+                 ) -> Tuple[int, Iterator[Tuple[int, int, int]]]:
+    """
+    Solve every position reachable from the empty board, up to symmetry, writing depth files to given directory.
+
+    :param width: Board width
+    :param height: Board height
+    :param nb_marks: Number of adjacent marks to get a victory
+    :param players: Players markers, exactly 2
+    :param directory: Directory for the depth files, which must be kept until solved positions are read
+    :return: Number of positions, and (canonical key, value for player to move, best moves bitmask) of each position,
+    sorted by key and read from depth files
+    """
+    if len(players) != 2:
+        raise ValueError(f'Tablebase needs exactly 2 players, got {len(players)}')
+    if width * height > 32:
+        raise ValueError(f'Tablebase supports boards up to 32 cells, got {width * height}')
+
+    space = StateSpace(width, height, nb_marks, players)
+    stats = space.expand(directory)
+    max_depth = len(stats.by_depth) - 1
+    space.solve(directory, max_depth)
+    return stats.positions, space.solved(directory, max_depth)
+
+
+def solve(width: int, height: int, nb_marks: int, players: Sequence[str]) -> Dict[int, Tuple[int, int]]:
+    """
+    Solve every position reachable from the empty board, up to symmetry, into memory.
+
+    :param width: Board width
+    :param height: Board height
+    :param nb_marks: Number of adjacent marks to get a victory
+    :param players: Players markers, exactly 2
+    :return: (value for player to move, best moves bitmask) by canonical position key
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        _, positions = solve_layers(width, height, nb_marks, players, tmp)
+        return {key: (value, moves) for key, value, moves in positions}
+
+
+def generate(path: str, width: int = 3, height: int = 3, nb_marks: int = 3, players: Sequence[str] = ('X', 'O'),
+             work_dir: Optional[str] = None) -> int:
+    """
+    Solve every reachable position of given configuration and write them to a tablebase file.
+
+    :param path: Tablebase file path
+    :param width: Board width
+    :param height: Board height
+    :param nb_marks: Number of adjacent marks to get a victory
+    :param players: Players markers, exactly 2, in playing order
+    :param work_dir: Directory for the depth files, system temporary directory if None
+    :return: Number of positions written
+    """
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        count, positions = solve_layers(width, height, nb_marks, players, tmp)
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, width, height, nb_marks, len(players), count))
+            f.write(''.join(players).encode('ascii'))
+            for key, value, moves in positions:
+                f.write(RECORD.pack(key, value, moves))
+    return count
+
+
+class SolvedLookup(Protocol):
+    """
+    Lookup of solved positions stored by canonical key. Implementations provide find, and get lookup.
+    """
+
+    space: StateSpace
+
+    def find(self, key: int) -> Optional[Tuple[int, int]]:
+        """
+        Get stored value and best moves of a canonical position.
+
+        :param key: Canonical position key
+        :return: (value for player to move, best moves bitmask of canonical position) or None if not stored
+        """
+
+    def lookup(self, cells: Sequence[str]) -> Optional[Tuple[int, List[int]]]:
+        """
+        Get game-theoretic value and best moves of given position.
+
+        :param cells: Board cells
+        :return: (value for player to move: 1 win, 0 draw, -1 loss, best cell numbers)
+        or None if position is not reachable
+        """
+        key, transform = self.space.orient(cells)
+        result = self.find(key)
+        if result is None:
+            return None
+        value, moves = result
+        perm = self.space.perms[transform]
+        return value, sorted(perm[cell_id] + 1 for cell_id in range(len(cells)) if moves >> cell_id & 1)
+
+
+class Tablebase(SolvedLookup):
+    """
+    Memory-mapped tablebase file, looked up by binary search without loading records.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.width, self.height, self.nb_marks, nb_players, self.count = HEADER.unpack_from(self.mmap)
+        if magic != MAGIC or version != VERSION:
+            self.mmap.close()
+            raise ValueError(f'{path} is not a version {VERSION} tablebase file')
+        self.players = list(self.mmap[HEADER.size:HEADER.size + nb_players].decode('ascii'))
+        self.offset = HEADER.size + nb_players
+        self.space = StateSpace(self.width, self.height, self.nb_marks, self.players)
+
+    def __enter__(self):
+        return self
+
+    def matches(self, width: int, height: int, nb_marks: int, players: Sequence[str]) -> bool:
+        """
+        Checks whether the tablebase solves given board configuration.
+
+        :param width: Board width
+        :param height: Board height
+        :param nb_marks: Number of adjacent marks to get a victory
+        :param players: Players markers, in playing order
+        :return: True if the tablebase was generated for this configuration. False otherwise
+        """
+        return (self.width, self.height, self.nb_marks, self.players) == (width, height, nb_marks, list(players))
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.mmap.close()
+
+    def find(self, key: int) -> Optional[Tuple[int, int]]:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, value, moves = RECORD.unpack_from(self.mmap, self.offset + middle * RECORD.size)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return value, moves
+        return None
+
+
+class SolvedPositions(SolvedLookup):
+    """
+    In-memory equivalent of a Tablebase, solving positions when created instead of reading a file.
+    """
+
+    def __init__(self, width: int = 3, height: int = 3, nb_marks: int = 3, players: Sequence[str] = ('X', 'O')
+                 ) -> None:
+        """
+        :param width: Board width
+        :param height: Board height
+        :param nb_marks: Number of adjacent marks to get a victory
+        :param players: Players markers, exactly 2, in playing order
+        """
+        self.players = list(players)
+        self.space = StateSpace(width, height, nb_marks, self.players)
+        self.solved = solve(width, height, nb_marks, self.players)
+
+    def find(self, key: int) -> Optional[Tuple[int, int]]:
+        return self.solved.get(key)
+
+
+class TablebasePlayer:
+    """
+    Computer player reading its moves from a tablebase.
+    """
+
+    def __init__(self, tablebase: Tablebase) -> None:
+        self.tablebase = tablebase
+
+    def get_choice(self, game: 'Game', player: str) -> int:
+        """
+        Choose the first best move of current position.
+
+        :param game: Game to play, with the tablebase configuration
+        :param player: Player marker
+        :return: Best cell number
+        """
+        if not self.tablebase.matches(game.board.width, game.board.height, game.nb_marks, game.players):
+            raise ValueError('Game configuration does not match tablebase')
+        result = self.tablebase.lookup(game.board.cells)
+        if result is None or not result[1]:
+            raise ValueError('Position is not in tablebase')
+        return result[1][0]
+
+
+if __name__ == '__main__':
+    width, height, nb_marks, path = int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]), sys.argv[4]
+    print(f'{generate(path, width, height, nb_marks)} positions written to {path}')
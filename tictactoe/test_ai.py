@@ -0,0 +1,186 @@
+import random
+import time
+
+import pytest
+
+from tictactoe.ai import EXACT, LOWER, WIN, NegamaxPlayer, TranspositionTable, from_table, to_table
+from tictactoe.game import Game
+
+
+class RandomEngine:
+
+    def __init__(self, seed):
+        self.rnd = random.Random(seed)
+
+    def get_choice(self, game, player):
+        return self.rnd.choice([c for c in range(1, len(game.board) + 1) if game.board.is_available(c)])
+
+
+class TestTranspositionTable:
+
+    def test_get_missing(self):
+        assert TranspositionTable(8).get(3) is None
+
+    def test_put_get(self):
+        # Given
+        table = TranspositionTable(8)
+
+        # When
+        table.put(11, depth=2, value=5, flag=EXACT, move=4)
+
+        # Then
+        assert table.get(11) == (2, 5, EXACT, 4)
+        assert table.get(3) is None
+
+    def test_replacement_keeps_deeper_entry(self):
+        # Given
+        table = TranspositionTable(8)
+        table.put(11, depth=4, value=5, flag=EXACT, move=4)
+
+        # When
+        table.put(3, depth=2, value=1, flag=LOWER, move=1)
+
+        # Then
+        assert table.get(11) == (4, 5, EXACT, 4)
+        assert table.get(3) is None
+
+    def test_replacement_of_previous_search(self):
+        # Given
+        table = TranspositionTable(8)
+        table.put(11, depth=4, value=5, flag=EXACT, move=4)
+        table.new_search()
+
+        # When
+        table.put(3, depth=2, value=1, flag=LOWER, move=1)
+
+        # Then
+        assert table.get(3) == (2, 1, LOWER, 1)
+
+    def test_clear(self):
+        # Given
+        table = TranspositionTable(8)
+        table.put(11, depth=4, value=5, flag=EXACT, move=4)
+
+        # When
+        table.clear()
+
+        # Then
+        assert table.get(11) is None
+
+    @pytest.mark.parametrize('value', [WIN - 5, -WIN + 5, 7, -WIN // 2])
+    def test_mate_values_relative_to_ply(self, value):
+        # When
+        stored = to_table(value, 3)
+
+        # Then
+        assert from_table(stored, 3) == value
+        if abs(value) > WIN // 2:
+            assert from_table(stored, 1) == value + (2 if value > 0 else -2)
+
+    def test_size_power_of_2(self):
+        with pytest.raises(ValueError):
+            TranspositionTable(10)
+
+
+class TestNegamaxPlayer:
+
+    @pytest.mark.parametrize('cells, expected', [
+        (['X', 'X', ' ', 'O', 'O', ' ', ' ', ' ', ' '], 3),
+        ([' ', ' ', ' ', 'O', 'O', ' ', 'X', ' ', 'X'], 8),
+    ])
+    def test_wins_when_possible(self, cells, expected):
+        # Given
+        game = Game()
+        game.board.cells = cells
+
+        # When
+        choice = NegamaxPlayer().get_choice(game, 'X')
+
+        # Then
+        assert choice == expected
+
+    def test_blocks(self):
+        # Given
+        game = Game()
+        game.board.cells = ['X', 'X', ' ', ' ', 'O', ' ', ' ', ' ', ' ']
+
+        # When
+        choice = NegamaxPlayer().get_choice(game, 'O')
+
+        # Then
+        assert choice == 3
+
+    def test_perfect_play_is_draw(self):
+        # Given
+        game = Game(engines={'X': NegamaxPlayer(), 'O': NegamaxPlayer()})
+
+        # When
+        start = time.perf_counter()
+        winner = game.play()
+
+        # Then
+        assert winner is None
+        assert time.perf_counter() - start < 2
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_never_loses_against_random(self, seed):
+        for ai_player in ('X', 'O'):
+            other = 'O' if ai_player == 'X' else 'X'
+            game = Game(engines={ai_player: NegamaxPlayer(), other: RandomEngine(seed)})
+            assert game.play() in (ai_player, None)
+
+    def test_node_budget_on_large_board(self):
+        # Given
+        engine = NegamaxPlayer(max_nodes=2000)
+        game = Game(7, 7, nb_marks=4, players=['X', 'O', '#'], engines={p: engine for p in ('X', 'O', '#')})
+
+        # When
+        choice = game.get_player_choice('X')
+
+        # Then
+        assert game.board.is_available(choice)
+        assert engine.depth_reached < 49
+
+    def test_three_players_takes_win(self):
+        # Given
+        game = Game(4, 4, nb_marks=3, players=['X', 'O', '#'])
+        for cell, player in ((1, '#'), (2, '#'), (5, 'X'), (6, 'X'), (9, 'O'), (10, 'O')):
+            game.board.place_choice(cell, player)
+
+        # When
+        choice = NegamaxPlayer(max_time=1).get_choice(game, 'O')
+
+        # Then
+        assert choice == 11
+
+    def test_three_players_shared_engine(self):
+        # Given
+        game = Game(4, 4, nb_marks=3, players=['X', 'O', '#'])
+        for cell, player in ((1, '#'), (2, '#'), (5, 'X'), (6, 'X'), (9, 'O'), (10, 'O')):
+            game.board.place_choice(cell, player)
+        engine = NegamaxPlayer(max_time=1)
+        engine.get_choice(game, 'X')
+
+        # When
+        choice = engine.get_choice(game, 'O')
+
+        # Then
+        assert choice == 11
+
+    def test_full_board(self):
+        game = Game()
+        game.board.cells = ['X', 'O', 'X', 'O', 'X', 'X', 'O', 'X', 'O']
+        with pytest.raises(ValueError):
+            NegamaxPlayer().get_choice(game, 'X')
+
+
+def test_game_asks_engine():
+    # Given
+    game = Game(engines={'X': NegamaxPlayer()})
+    game.board.cells = ['X', 'X', ' ', 'O', 'O', ' ', ' ', ' ', ' ']
+
+    # When
+    choice = game.get_player_choice('X')
+
+    # Then
+    assert choice == 3
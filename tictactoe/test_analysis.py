@@ -0,0 +1,213 @@
+import io
+import json
+
+import pytest
+
+from tictactoe.analysis import Aggregates, aggregate, analyze, annotate, blunders, main, parse_moves, read_inputs
+from tictactoe.record import GameRecord, RecordWriter
+from tictactoe.simulation import Config
+from tictactoe.tablebase import SolvedPositions, generate
+
+GAMES = '''# X wins on first row
+1 4 2 5 3
+
+5, 1, 9, 3, 2, 8, 7, 4, 6
+1 5 2 3
+'''
+
+
+@pytest.fixture()
+def solver():
+    return SolvedPositions()
+
+
+def test_parse_moves():
+    # When
+    records = list(parse_moves(GAMES.splitlines(), Config()))
+
+    # Then
+    assert [record.moves for record in records] == [(1, 4, 2, 5, 3), (5, 1, 9, 3, 2, 8, 7, 4, 6), (1, 5, 2, 3)]
+    assert records[0] == GameRecord(3, 3, 3, ('X', 'O'), (1, 4, 2, 5, 3))
+
+
+@pytest.mark.parametrize('line', ['1 2 x', '1 2 10', '1 2 0', '1 2 1', '1 2 -3'])
+def test_parse_moves_skips_invalid(line, capsys):
+    # When
+    records = list(parse_moves(['1 2 3', line, '4 5'], Config()))
+
+    # Then
+    assert [record.moves for record in records] == [(1, 2, 3), (4, 5)]
+    assert 'Skipping line 2' in capsys.readouterr().err
+
+
+def test_parse_moves_is_lazy():
+    # Given
+    def lines():
+        yield '1 2 3'
+        raise AssertionError('Read too far')
+
+    # Then
+    assert next(parse_moves(lines(), Config())).moves == (1, 2, 3)
+
+
+def test_annotate():
+    # When
+    games = list(annotate(parse_moves(GAMES.splitlines(), Config())))
+
+    # Then
+    assert [game.winner for game in games] == ['X', None, None]
+    assert [position.won for position in games[0].positions] == [False] * 4 + [True]
+    assert games[1].positions[-1].full
+    assert not games[2].positions[-1].full
+    assert games[0].positions[1].player == 'O'
+    assert all(position.value is None for game in games for position in game.positions)
+
+
+def test_annotate_stops_at_victory():
+    # Given
+    record = GameRecord(3, 3, 3, ('X', 'O'), (1, 4, 2, 5, 3, 6))
+
+    # When
+    game = next(annotate([record]))
+
+    # Then
+    assert len(game.positions) == 5
+
+
+def test_blunders(solver):
+    # Given X plays a corner, O answers on an edge and loses
+    records = parse_moves(['1 2 5 9 4 6 7'], Config())
+
+    # When
+    found = list(blunders(annotate(records, solver)))
+
+    # Then
+    assert [(position.ply, position.player, position.cell) for _, position in found] == [(1, 'O', 2)]
+    assert found[0][0].positions[0].value == 0
+    assert found[0][0].positions[1].value == -1
+
+
+def test_no_blunder_in_perfect_play(solver):
+    # Given
+    records = parse_moves(['5 1 9 3 2 8 7 4 6'], Config())
+
+    # Then
+    assert list(blunders(annotate(records, solver))) == []
+
+
+def test_aggregate():
+    # When
+    stats = aggregate(annotate(parse_moves(GAMES.splitlines(), Config())))
+
+    # Then
+    assert stats.to_dict() == {
+        'games': 3,
+        'average_length': 6.0,
+        'wins': {'X': 1},
+        'draws': 1,
+        'unfinished': 1,
+        'first_move_win_rates': {1: 0.5, 5: 0.0},
+        'blunders': {},
+    }
+
+
+def test_merge():
+    # Given
+    games = list(annotate(parse_moves(GAMES.splitlines(), Config())))
+    first, second = aggregate(games[:1]), aggregate(games[1:])
+
+    # When
+    first.merge(second)
+
+    # Then
+    assert first.to_dict() == aggregate(games).to_dict()
+
+
+@pytest.fixture()
+def inputs(tmp_path):
+    text = tmp_path / 'games.txt'
+    text.write_text(GAMES)
+    binary = str(tmp_path / 'games.ttr')
+    with RecordWriter(binary) as writer:
+        writer.write(GameRecord(3, 3, 3, ('X', 'O'), (1, 2, 5, 9, 4, 6, 7)))
+    return [str(text), binary]
+
+
+def test_read_inputs(inputs):
+    assert [record.moves[0] for record in read_inputs(inputs, Config())] == [1, 5, 1, 1]
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_analyze(inputs, processes):
+    # When
+    stats = analyze(inputs, Config(), solve_blunders=True, processes=processes)
+
+    # Then
+    assert stats.games == 4
+    assert stats.wins == {'X': 2}
+    assert stats.blunders['O'] >= 1
+
+
+def test_analyze_with_tablebase(inputs, tmp_path):
+    # Given
+    path = str(tmp_path / '3x3.ttb')
+    generate(path)
+
+    # When
+    stats = analyze(inputs, Config(), tablebase=path, processes=1)
+
+    # Then
+    assert stats.blunders == analyze(inputs, Config(), solve_blunders=True, processes=1).blunders
+
+
+def test_analyze_solver_per_record(tmp_path):
+    # Given
+    path = str(tmp_path / '3x3.ttb')
+    generate(path)
+    records = str(tmp_path / 'games.ttr')
+    with RecordWriter(records) as writer:
+        writer.write(GameRecord(3, 3, 3, ('X', 'O'), (1, 2, 5, 9, 4, 6, 7)))
+        writer.write(GameRecord(4, 3, 3, ('X', 'O'), (1, 2, 3, 4)))
+
+    # When
+    with_tablebase = analyze([records], Config(), tablebase=path, processes=1)
+    solved = analyze([records], Config(), solve_blunders=True, processes=1)
+
+    # Then
+    assert with_tablebase.games == solved.games == 2
+    assert with_tablebase.blunders == {'O': 1}
+    assert solved.blunders == {'O': 2, 'X': 1}
+
+
+def test_analyze_unsolvable_records(tmp_path):
+    # Given
+    records = str(tmp_path / 'games.ttr')
+    with RecordWriter(records) as writer:
+        writer.write(GameRecord(3, 3, 3, ('X', 'O'), (1, 2, 5, 9, 4, 6, 7)))
+        writer.write(GameRecord(4, 4, 3, ('X', 'O', '#'), (1, 2, 3, 5, 6, 7, 9)))
+        writer.write(GameRecord(5, 5, 4, ('X', 'O'), (1, 2, 7, 3, 13, 4, 19)))
+        writer.write(GameRecord(7, 7, 4, ('X', 'O'), (1, 2, 9, 3, 17, 4, 25)))
+
+    # When
+    stats = analyze([records], Config(), solve_blunders=True, processes=1)
+
+    # Then
+    assert stats.games == 4
+    assert stats.wins == {'X': 4}
+    assert stats.blunders == {'O': 1}
+
+
+def test_main_stdin(monkeypatch):
+    # Given
+    monkeypatch.setattr('sys.stdin', io.StringIO(GAMES))
+    stdout = io.StringIO()
+
+    # When
+    assert main([], stdout) == 0
+
+    # Then
+    assert json.loads(stdout.getvalue())['games'] == 3
+
+
+def test_empty_aggregates():
+    assert Aggregates().to_dict()['average_length'] == 0.0
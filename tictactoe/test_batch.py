@@ -0,0 +1,163 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from tictactoe.batch import check_victories, evaluate, has_line, playout, random_playouts, to_array  # noqa: E402
+from tictactoe.board import Board  # noqa: E402
+
+
+def random_boards(width, height, players, count, seed):
+    rnd = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = Board(width, height)
+        cells = list(range(1, width * height + 1))
+        rnd.shuffle(cells)
+        for i, cell in enumerate(cells[:rnd.randint(0, len(cells))]):
+            board.place_choice(cell, players[i % len(players)])
+        boards.append(board)
+    return boards
+
+
+def test_to_array():
+    # Given
+    board = Board(width=4, height=2)
+    board.place_choice(2, 'X')
+    board.place_choice(8, 'O')
+
+    # When
+    array = to_array([board], ['X', 'O'])
+
+    # Then
+    assert array.dtype == np.int8
+    assert array.tolist() == [[[0, 1, 0, 0], [0, 0, 0, 2]]]
+
+
+@pytest.mark.parametrize('nb_marks, expected', [(1, True), (3, True), (4, False)])
+def test_has_line_forward_diagonal(nb_marks, expected):
+    marks = np.zeros((1, 3, 3), dtype=bool)
+    marks[0, 0, 2] = marks[0, 1, 1] = marks[0, 2, 0] = True
+    assert has_line(marks, nb_marks).tolist() == [expected]
+
+
+@pytest.mark.parametrize('width, height, nb_marks, players', [
+    (3, 3, 3, ['X', 'O']),
+    (4, 4, 3, ['X', 'O', '#']),
+    (5, 3, 4, ['X', 'O']),
+    (6, 5, 2, ['X', 'O', '#', '@']),
+])
+def test_check_victories_same_as_board(width, height, nb_marks, players):
+    # Given
+    boards = random_boards(width, height, players, 200, seed=width * height + nb_marks)
+
+    # When
+    wins = check_victories(to_array(boards, players), nb_marks, len(players))
+
+    # Then
+    expected = [[board.check_victory(player, nb_marks) for player in players] for board in boards]
+    assert wins.tolist() == expected
+
+
+def test_evaluate():
+    # Given
+    won = Board()
+    for cell in (1, 2, 3):
+        won.place_choice(cell, 'O')
+    draw = Board()
+    for cell, player in enumerate(['X', 'O', 'X', 'O', 'X', 'X', 'O', 'X', 'O'], start=1):
+        draw.place_choice(cell, player)
+    ongoing = Board()
+    ongoing.place_choice(5, 'X')
+
+    # When
+    winners, terminal = evaluate(to_array([won, draw, ongoing], ['X', 'O']), nb_marks=3, nb_players=2)
+
+    # Then
+    assert winners.tolist() == [2, 0, 0]
+    assert terminal.tolist() == [True, True, False]
+
+
+def test_invalid_nb_marks():
+    with pytest.raises(ValueError):
+        check_victories(np.zeros((1, 3, 3), dtype=np.int8), 0, 2)
+
+
+@pytest.mark.parametrize('width, height, nb_marks, players', [
+    (3, 3, 3, ['X', 'O']),
+    (4, 4, 3, ['X', 'O', '#']),
+    (5, 5, 4, ['X', 'O']),
+    (9, 9, 4, ['X', 'O', '#', '@']),
+])
+def test_playout_same_as_game(width, height, nb_marks, players):
+    # Given
+    boards = [board for board in random_boards(width, height, players, 100, seed=width) if not board.is_full()]
+    to_move = np.array([len(board.history) % len(players) for board in boards])
+
+    # When
+    result = playout(to_array(boards, players), nb_marks, len(players), to_move, np.random.default_rng(0))
+
+    # Then
+    for i, board in enumerate(boards):
+        winners = [player for player in players if board.check_victory(player, nb_marks)]
+        if winners:
+            assert result.winners[i] == players.index(winners[0]) + 1
+            assert result.lengths[i] == 0
+            continue
+        player = players[to_move[i]]
+        winner = 0
+        moves = result.moves[i].tolist()
+        assert moves[result.lengths[i]:] == [0] * (len(moves) - result.lengths[i])
+        for cell in moves[:result.lengths[i]]:
+            assert board.is_available(cell)
+            board.place_choice(cell, player)
+            if board.check_victory_at(cell, player, nb_marks):
+                winner = players.index(player) + 1
+                break
+            player = players[(players.index(player) + 1) % len(players)]
+        assert result.winners[i] == winner
+        assert winner or board.is_full()
+
+
+def test_random_playouts_distribution():
+    # When
+    result = random_playouts(20000, seed=0)
+
+    # Then
+    draws, x_wins, o_wins = result.distribution(2)
+    assert draws == pytest.approx(0.127, abs=0.01)
+    assert x_wins == pytest.approx(0.585, abs=0.01)
+    assert o_wins == pytest.approx(0.288, abs=0.01)
+    assert sorted(set(result.lengths.tolist())) == [5, 6, 7, 8, 9]
+
+
+def test_random_playouts_seed():
+    # When
+    first = random_playouts(100, 6, 6, 4, 3, seed=1)
+    second = random_playouts(100, 6, 6, 4, 3, seed=1)
+
+    # Then
+    assert first.moves.tolist() == second.moves.tolist()
+    assert first.winners.tolist() == second.winners.tolist()
+
+
+def test_random_playouts_large_board():
+    # When
+    result = random_playouts(2, 200, 200, 5, seed=0)
+
+    # Then
+    assert result.moves.dtype == np.int32
+    assert result.moves.min() >= 0
+    assert result.moves.max() <= 200 * 200
+    for moves, length in zip(result.moves.tolist(), result.lengths.tolist()):
+        assert len(set(moves[:length])) == length
+
+
+def test_random_playouts_long_lines():
+    # When
+    result = random_playouts(3, 130, 1, 130, nb_players=1, seed=0)
+
+    # Then
+    assert result.winners.tolist() == [1, 1, 1]
+    assert result.lengths.tolist() == [130, 130, 130]
@@ -0,0 +1,69 @@
+import json
+
+from tictactoe.benchmark import cases, compare, main, measure, run
+
+
+def test_measure():
+    assert measure(lambda: None, min_time=0.001) > 0
+
+
+def test_run():
+    # When
+    results = run([(3, 3), (4, 3)], [3], [2, 3], min_time=0.001)
+
+    # Then
+    names = {result['name'] for result in results}
+    assert names == {'check_victory', 'check_victory_at', 'check_cells', 'next_cell', 'is_full', 'place_choice',
+                     '__str__', '__str__ cached', 'game'}
+    assert len(results) == 2 * 2 * len(names)
+
+
+def test_place_choice_leaves_board_unchanged():
+    # Given
+    funcs = dict(cases(5, 5, 4, ['X', 'O']))
+    board = funcs['is_full'].__self__
+    snapshot = board.snapshot()
+
+    # When
+    for _ in range(3):
+        funcs['place_choice']()
+
+    # Then
+    assert board.snapshot() == snapshot
+    assert len(board.history) == 12
+
+
+def test_compare():
+    # Given
+    baseline = [
+        {'name': 'is_full', 'width': 3, 'height': 3, 'nb_marks': 3, 'players': 2, 'seconds': 1.0},
+        {'name': 'game', 'width': 3, 'height': 3, 'nb_marks': 3, 'players': 2, 'seconds': 1.0},
+    ]
+    results = [
+        {'name': 'is_full', 'width': 3, 'height': 3, 'nb_marks': 3, 'players': 2, 'seconds': 1.05},
+        {'name': 'game', 'width': 3, 'height': 3, 'nb_marks': 3, 'players': 2, 'seconds': 2.0},
+        {'name': 'game', 'width': 4, 'height': 4, 'nb_marks': 3, 'players': 2, 'seconds': 2.0},
+    ]
+
+    # When
+    comparison = compare(results, baseline, threshold=0.1)
+
+    # Then
+    assert [(r['name'], r['ratio'], r['regression']) for r in comparison] == [
+        ('is_full', 1.05, False), ('game', 2.0, True),
+    ]
+
+
+def test_main_compare(tmp_path):
+    # Given
+    baseline = tmp_path / 'baseline.json'
+    args = ['--sizes', '3x3', '--nb-marks', '3', '--players', '2', '--min-time', '0.001']
+    main(args + ['--output', str(baseline)])
+
+    # When
+    status = main(args + ['--compare', str(baseline), '--threshold', '1000', '--output', str(tmp_path / 'out.json')])
+
+    # Then
+    assert status == 0
+    report = json.loads((tmp_path / 'out.json').read_text())
+    assert len(report['comparison']) == len(report['results'])
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from tictactoe.bitboard import BitBoard, win_masks
+from tictactoe.board import Board
+
+
+@pytest.mark.parametrize('width, height, nb_marks, expected', [(3, 3, 3, 8), (4, 4, 3, 24), (3, 4, 4, 3), (3, 3, 4, 0)])
+def test_win_masks_count(width, height, nb_marks, expected):
+    masks, cell_masks = win_masks(width, height, nb_marks)
+    assert len(masks) == expected
+    assert len(cell_masks) == width * height
+
+
+def test_cell_masks():
+    # When
+    masks, cell_masks = win_masks(5, 4, 3)
+
+    # Then
+    for cell_id, through in enumerate(cell_masks):
+        assert list(through) == [mask for mask in masks if mask >> cell_id & 1]
+
+
+def test_str_same_as_board():
+    # Given
+    board = Board(width=4)
+    bitboard = BitBoard(width=4)
+
+    # When
+    for cell, player in ((1, 'X'), (6, 'O'), (12, 'X')):
+        board.place_choice(cell, player)
+        bitboard.place_choice(cell, player)
+
+    # Then
+    assert str(bitboard) == str(board)
+    assert bitboard.cells == board.cells
+
+
+class TestIsFull:
+
+    def test_is_full(self):
+        assert BitBoard().is_full() is False
+
+    def test_is_full_totally_filled(self):
+        # Given
+        board = BitBoard()
+
+        # When
+        for cell, player in enumerate(['X', 'O', 'X', 'O', 'X', 'X', 'O', 'X', 'O'], start=1):
+            board.place_choice(cell, player)
+
+        # Then
+        assert board.is_full() is True
+        assert board.count() == 9
+
+
+class TestPlaceChoice:
+
+    @pytest.mark.parametrize('cell', [0, 10, -1])
+    def test_place_choice_outside_board(self, cell):
+        # Given
+        board = BitBoard()
+
+        # When
+        board.place_choice(cell, 'X')
+
+        # Then
+        assert board.count() == 0
+
+    def test_place_choice_overwrites(self):
+        # Given
+        board = BitBoard()
+        board.place_choice(1, 'X')
+
+        # When
+        board.place_choice(1, 'O')
+
+        # Then
+        assert board.has_mark_at(1, 'X') is False
+        assert board.has_mark_at(1, 'O') is True
+        assert board.is_available(1) is False
+        assert board.is_available(2) is True
+
+
+@pytest.mark.parametrize('width, height, nb_marks', [(3, 3, 3), (4, 4, 3), (5, 4, 4), (7, 6, 4)])
+def test_check_victory_same_as_board(width, height, nb_marks):
+    rnd = random.Random(width * height * nb_marks)
+    for _ in range(50):
+        board = Board(width, height)
+        bitboard = BitBoard(width, height)
+        cells = list(range(1, width * height + 1))
+        rnd.shuffle(cells)
+        players = ['X', 'O', '#']
+        for i, cell in enumerate(cells[:rnd.randint(1, len(cells))]):
+            player = players[i % len(players)]
+            board.place_choice(cell, player)
+            bitboard.place_choice(cell, player)
+            assert bitboard.check_victory_at(cell, player, nb_marks) is board.check_victory_at(cell, player, nb_marks)
+        for player in players:
+            assert bitboard.check_victory(player, nb_marks) is board.check_victory(player, nb_marks)
+        assert bitboard.is_full() is board.is_full()
@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 from tictactoe.board import Board
@@ -271,3 +273,362 @@ class TestCheckVictory:
 
         # Then
         assert result is expected
+
+
+class TestCountMarks:
+
+    @pytest.mark.parametrize('cell, add_x, add_y, limit, expected', [
+        (1, 1, 0, 2, 2), (1, 1, 0, 1, 1), (3, -1, 0, 2, 2), (2, 1, 0, 2, 1), (1, 0, 1, 2, 0), (3, 1, 0, 2, 0),
+    ])
+    def test_count_marks(self, board_winning_horizontal, cell, add_x, add_y, limit, expected):
+        assert board_winning_horizontal.count_marks(cell, 'X', add_x, add_y, limit) == expected
+
+
+class TestCheckVictoryAt:
+
+    @pytest.mark.parametrize('board_fixture, cell, expected', [
+        ('board_empty', 1, False),
+        ('board_draw', 5, False),
+        ('board_partial_horizontal', 2, False),
+        ('board_winning_horizontal', 1, True), ('board_winning_horizontal', 2, True),
+        ('board_winning_horizontal', 3, True), ('board_winning_horizontal', 4, False),
+        ('board_winning_vertical', 4, True),
+        ('board_winning_backward_diagonal', 5, True),
+        ('board_winning_forward_diagonal', 7, True),
+    ])
+    def test_check_victory_at(self, board_fixture, cell, expected, request):
+        board = request.getfixturevalue(board_fixture)
+        assert board.check_victory_at(cell, 'X', nb_marks=3) is expected
+
+    def test_other_player(self, board_winning_horizontal):
+        assert board_winning_horizontal.check_victory_at(1, 'O', nb_marks=3) is False
+
+    def test_large_board(self):
+        # Given
+        board = Board(100, 100)
+        for cell in (5055, 5156, 5257, 5358):
+            board.place_choice(cell, 'X')
+
+        # When
+        board.place_choice(4954, 'X')
+
+        # Then
+        assert board.check_victory_at(4954, 'X', nb_marks=5) is True
+        assert board.check_victory_at(4954, 'X', nb_marks=6) is False
+
+    def test_does_not_wrap_rows(self):
+        # Given
+        board = Board(3, 3)
+        for cell in (3, 4, 5):
+            board.place_choice(cell, 'X')
+
+        # Then
+        assert board.check_victory_at(4, 'X', nb_marks=3) is False
+
+
+class TestIsAvailable:
+
+    @pytest.mark.parametrize('cell, expected', [(1, False), (3, True), (9, True), (0, False), (10, False)])
+    def test_is_available(self, board_partial_horizontal, cell, expected):
+        assert board_partial_horizontal.is_available(cell) is expected
+
+    def test_len(self):
+        assert len(Board(4, 3)) == 12
+
+
+class TestScanLine:
+
+    @pytest.mark.parametrize('cell, add_x, add_y, nb_marks, expected', [
+        (1, 1, 0, 3, [1, 2, 3]), (1, 1, 0, 2, [1, 2]), (2, 1, 0, 3, [2, 3]), (1, 0, 1, 3, [1]), (4, 1, 0, 3, []),
+    ])
+    def test_scan_line(self, board_winning_horizontal, cell, add_x, add_y, nb_marks, expected):
+        assert board_winning_horizontal.scan_line(cell, 'X', add_x, add_y, nb_marks) == expected
+
+    def test_long_line(self):
+        # Given
+        board = Board(5000, 1)
+        for cell in range(1, 5001):
+            board.place_choice(cell, 'X')
+
+        # Then
+        assert board.check_cells(1, 'X', 1, 0, nb_marks=5000) is True
+        assert board.check_victory('X', nb_marks=5000) is True
+
+
+class TestLines:
+
+    @pytest.mark.parametrize('add_x, add_y, expected', [
+        (1, 0, [(0, 4), (4, 4), (8, 4)]),
+        (0, 1, [(0, 3), (1, 3), (2, 3), (3, 3)]),
+        (1, 1, [(0, 3), (1, 3), (2, 2), (3, 1), (4, 2), (8, 1)]),
+        (-1, 1, [(0, 1), (1, 2), (2, 3), (3, 3), (7, 2), (11, 1)]),
+    ])
+    def test_lines(self, add_x, add_y, expected):
+        assert list(Board(4, 3).lines(add_x, add_y)) == expected
+
+
+class TestWinningLine:
+
+    @pytest.mark.parametrize('board_fixture, expected', [
+        ('board_empty', None),
+        ('board_draw', None),
+        ('board_partial_horizontal', None),
+        ('board_winning_horizontal', [1, 2, 3]),
+        ('board_winning_vertical', [1, 4, 7]),
+        ('board_winning_backward_diagonal', [1, 5, 9]),
+        ('board_winning_forward_diagonal', [3, 5, 7]),
+    ])
+    def test_winning_line(self, board_fixture, expected, request):
+        assert request.getfixturevalue(board_fixture).winning_line('X', nb_marks=3) == expected
+
+    def test_run_after_other_marks(self):
+        # Given
+        board = Board(7, 1)
+        for cell, player in ((1, 'X'), (2, 'X'), (3, 'O'), (4, 'X'), (5, 'X'), (6, 'X')):
+            board.place_choice(cell, player)
+
+        # Then
+        assert board.winning_line('X', nb_marks=3) == [4, 5, 6]
+
+
+class TestUndoRedo:
+
+    def test_undo(self, board_empty):
+        # Given
+        board_empty.place_choice(1, 'X')
+        board_empty.place_choice(5, 'O')
+
+        # When
+        cell = board_empty.undo()
+
+        # Then
+        assert cell == 5
+        assert board_empty.cells == ['X'] + [' '] * 8
+
+    def test_undo_overwrite(self, board_empty):
+        # Given
+        board_empty.place_choice(1, 'X')
+        board_empty.place_choice(1, 'O')
+
+        # When
+        board_empty.undo()
+
+        # Then
+        assert board_empty.cells[0] == 'X'
+
+    def test_undo_empty_history(self, board_empty):
+        assert board_empty.undo() is None
+
+    def test_redo(self, board_empty):
+        # Given
+        board_empty.place_choice(1, 'X')
+        board_empty.place_choice(5, 'O')
+        board_empty.undo()
+        board_empty.undo()
+
+        # When
+        first = board_empty.redo()
+        second = board_empty.redo()
+
+        # Then
+        assert (first, second) == (1, 5)
+        assert board_empty.redo() is None
+        assert board_empty.cells == ['X', ' ', ' ', ' ', 'O', ' ', ' ', ' ', ' ']
+
+    def test_place_clears_redo(self, board_empty):
+        # Given
+        board_empty.place_choice(1, 'X')
+        board_empty.undo()
+
+        # When
+        board_empty.place_choice(2, 'O')
+
+        # Then
+        assert board_empty.redo() is None
+
+    def test_undo_rerenders(self, board_empty):
+        # Given
+        str(board_empty)
+        board_empty.place_choice(1, 'X')
+        str(board_empty)
+
+        # When
+        board_empty.undo()
+
+        # Then
+        assert str(board_empty) == str(Board())
+
+
+class TestSnapshot:
+
+    def test_snapshot_is_immutable_copy(self, board_winning_horizontal):
+        # When
+        snapshot = board_winning_horizontal.snapshot()
+        board_winning_horizontal.place_choice(5, 'O')
+
+        # Then
+        assert snapshot.cells == ('X', 'X', 'X', ' ', ' ', ' ', ' ', ' ', ' ')
+
+    def test_from_snapshot(self, board_draw):
+        # When
+        board = Board.from_snapshot(board_draw.snapshot())
+
+        # Then
+        assert board.cells == board_draw.cells
+        assert board.cells is not board_draw.cells
+        assert board.undo() is None
+
+
+class TestOccupancy:
+
+    def test_counters(self, board_empty):
+        # When
+        board_empty.place_choice(1, 'X')
+        board_empty.place_choice(5, 'O')
+        board_empty.place_choice(9, 'X')
+
+        # Then
+        assert board_empty.count() == 3
+        assert board_empty.count('X') == 2
+        assert board_empty.count('O') == 1
+        assert sorted(board_empty.free_cells()) == [2, 3, 4, 6, 7, 8]
+
+    def test_undo_redo(self, board_empty):
+        # Given
+        board_empty.place_choice(1, 'X')
+        board_empty.place_choice(1, 'O')
+
+        # When
+        board_empty.undo()
+
+        # Then
+        assert board_empty.count('X') == 1
+        assert board_empty.count('O') == 0
+        board_empty.undo()
+        assert board_empty.count() == 0
+        assert sorted(board_empty.free_cells()) == list(range(1, 10))
+        board_empty.redo()
+        assert sorted(board_empty.free_cells()) == list(range(2, 10))
+
+    def test_cells_replaced(self, board_draw):
+        # Then
+        assert board_draw.is_full()
+        assert board_draw.count('X') == 5
+        assert board_draw.free_cells() == []
+
+    def test_cells_changed_in_place(self, board_empty):
+        # When
+        board_empty.cells[0:3] = ['X'] * 3
+        board_empty.cells[-1] = 'O'
+
+        # Then
+        assert board_empty.check_victory('X', 3)
+        assert board_empty.count('X') == 3
+        assert board_empty.count('O') == 1
+        assert sorted(board_empty.free_cells()) == [4, 5, 6, 7, 8]
+        board_empty.place_choice(4, 'O')
+        board_empty.cells[3] = ' '
+        assert board_empty.count('O') == 1
+        assert sorted(board_empty.free_cells()) == [4, 5, 6, 7, 8]
+
+    def test_filled_in_place(self, board_empty):
+        # When
+        for cell_id in range(9):
+            board_empty.cells[cell_id] = 'XO'[cell_id % 2]
+
+        # Then
+        assert board_empty.is_full()
+        assert board_empty.random_cell(random.Random(0)) is None
+
+    def test_is_full(self, board_empty):
+        # When
+        for cell in range(1, 10):
+            assert not board_empty.is_full()
+            board_empty.place_choice(cell, 'XO'[cell % 2])
+
+        # Then
+        assert board_empty.is_full()
+
+    def test_random_cell(self, board_empty):
+        # Given
+        rnd = random.Random(0)
+        seen = set()
+
+        # When
+        while not board_empty.is_full():
+            cell = board_empty.random_cell(rnd)
+            assert board_empty.is_available(cell)
+            seen.add(cell)
+            board_empty.place_choice(cell, 'X')
+
+        # Then
+        assert seen == set(range(1, 10))
+        assert board_empty.random_cell(rnd) is None
+
+
+class TestZobrist:
+
+    def test_key_incremental(self, board_empty):
+        # Given
+        keys = [board_empty.key()]
+
+        # When
+        for cell, player in [(5, 'X'), (1, 'O'), (9, '#')]:
+            board_empty.place_choice(cell, player)
+            keys.append(board_empty.key())
+
+        # Then
+        assert len(set(keys)) == 4
+        assert keys[0] == 0
+        for expected in reversed(keys[:-1]):
+            board_empty.undo()
+            assert board_empty.key() == expected
+        board_empty.redo()
+        assert board_empty.key() == keys[1]
+
+    def test_same_position_same_key(self):
+        # Given
+        first, second = Board(), Board()
+
+        # When
+        for cell, player in [(1, 'X'), (5, 'O'), (9, 'X')]:
+            first.place_choice(cell, player)
+        for cell, player in [(9, 'X'), (5, 'O'), (1, 'X')]:
+            second.place_choice(cell, player)
+
+        # Then
+        assert first.key() == second.key()
+        assert first == second
+        assert len({first, second}) == 1
+
+    def test_side_to_move(self, board_winning_horizontal):
+        # When
+        keys = {board_winning_horizontal.key(player) for player in ('X', 'O', '#')}
+
+        # Then
+        assert len(keys) == 3
+        assert board_winning_horizontal.key() not in keys
+
+    def test_snapshot_same_key(self):
+        # Given
+        board = Board()
+        for cell, player in [(1, 'X'), (5, 'O'), (9, 'X')]:
+            board.place_choice(cell, player)
+
+        # When
+        restored = Board.from_snapshot(board.snapshot())
+
+        # Then
+        assert restored == board
+        assert restored.key() == board.key()
+        assert restored.key('O') == board.key('O')
+
+    def test_cells_replaced(self, board_draw):
+        # Given
+        board = Board()
+        for cell, player in enumerate(board_draw.cells, start=1):
+            board.set_cell(cell, player)
+
+        # Then
+        assert board.key() == board_draw.key()
+        assert board.key() == Board.from_snapshot(board_draw.snapshot()).key()
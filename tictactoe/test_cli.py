@@ -0,0 +1,144 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from tictactoe import benchmark
+from tictactoe.cli import main, parse_ints, parse_sizes
+from tictactoe.record import GameRecord, RecordWriter
+from tictactoe.tablebase import generate
+
+
+@pytest.mark.parametrize('argv, expected', [
+    (['solve', '--moves', '5 1'], {'player': 'X', 'value': 0, 'moves': [2, 3, 4, 6, 7, 8, 9]}),
+    (['solve', '--moves', '1,4,2,5'], {'player': 'X', 'value': 1, 'moves': [3]}),
+    (['solve', '--width', '4', '--height', '1', '--nb-marks', '3'], {'player': 'X', 'value': 0, 'moves': [1, 2, 3, 4]}),
+    (['--width', '4', '--height', '1', 'solve', '--nb-marks', '3'], {'player': 'X', 'value': 0, 'moves': [1, 2, 3, 4]}),
+    (['--width', '4', '--height', '3', 'solve', '--moves', '1'], {'player': 'O', 'value': -1, 'moves': list(range(2, 13))}),
+])
+def test_solve(argv, expected, capsys):
+    # When
+    assert main(argv) == 0
+
+    # Then
+    assert json.loads(capsys.readouterr().out) == expected
+
+
+def test_solve_large_board(capsys):
+    # When
+    main(['solve', '--width', '4', '--height', '4', '--players', 'XO#', '--moves', '1 2 3', '--max-time', '0.1'])
+
+    # Then
+    result = json.loads(capsys.readouterr().out)
+    assert result['player'] == 'X'
+    assert len(result['moves']) == 1
+
+
+@pytest.mark.parametrize('moves, error', [
+    ('1 1', 'Cell 1 is not available'),
+    ('1 4 2 5 3', 'Game is already over'),
+    ('1 4 2 5 3 6', 'Game is already over'),
+    ('1 2 3 5 4 6 8 7 9', 'Game is already over'),
+])
+def test_solve_game_over(moves, error, capsys):
+    with pytest.raises(SystemExit):
+        main(['solve', '--moves', moves])
+    assert error in capsys.readouterr().err
+
+
+def test_solve_tablebase(tmp_path, capsys):
+    # Given
+    path = str(tmp_path / '3x3.ttt')
+    generate(path)
+
+    # When
+    main(['solve', '--moves', '1,4,2,5', '--tablebase', path])
+
+    # Then
+    assert json.loads(capsys.readouterr().out) == {'player': 'X', 'value': 1, 'moves': [3]}
+    with pytest.raises(SystemExit):
+        main(['solve', '--width', '4', '--tablebase', path])
+
+
+def test_batch(capsys):
+    # When
+    main(['batch', '--games', '20', '--processes', '1', '--policies', 'X=heuristic,O=random'])
+
+    # Then
+    result = json.loads(capsys.readouterr().out)
+    assert result['games'] == 20
+    assert result['players']['X']['wins'] > result['players']['O']['wins']
+
+
+def test_replay(tmp_path, capsys):
+    # Given
+    path = str(tmp_path / 'games.ttr')
+    with RecordWriter(path) as writer:
+        writer.write(GameRecord(3, 3, 3, ('X', 'O'), (1, 4, 2, 5, 3)))
+
+    # When
+    main(['replay', path])
+
+    # Then
+    output = capsys.readouterr().out
+    assert output.startswith('Game 1: 3x3, 3 marks, moves [1, 4, 2, 5, 3]\n')
+    assert output.count('+') == 4
+
+
+def test_parse_lists():
+    assert parse_sizes('3x3,100x20') == [(3, 3), (100, 20)]
+    assert parse_ints('3,5') == [3, 5]
+
+
+def test_bench(monkeypatch):
+    # Given
+    calls = []
+    monkeypatch.setattr(benchmark, 'main', lambda argv: calls.append(argv) or 0)
+
+    # When
+    assert main(['bench', '--sizes', '3x3']) == 0
+    assert main(['--width', '4', '--nb-marks', '4', 'bench', '--min-time', '0.01']) == 0
+    assert main(['--players', 'XO#', 'bench', '--players', '2']) == 0
+
+    # Then
+    assert calls == [
+        ['--sizes', '3x3'],
+        ['--sizes', '4x3', '--nb-marks', '4', '--min-time', '0.01'],
+        ['--players', '3', '--players', '2'],
+    ]
+
+
+def test_unknown_option(capsys):
+    with pytest.raises(SystemExit):
+        main(['play', '--speed', '2'])
+    assert 'unrecognized arguments: --speed 2' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('argv', [[], ['play'], ['play', '--ai', 'O']])
+def test_play(argv, monkeypatch, capsys):
+    # Given
+    inputs = iter(['1', '4', '2', '5', '3', '6', '7', '8', '9'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(inputs))
+
+    # When
+    main(argv)
+
+    # Then
+    output = capsys.readouterr().out
+    assert 'Congratulations' in output or "It's a draw!" in output
+
+
+def test_lazy_imports():
+    # Given
+    code = ('import sys\n'
+            'from tictactoe.cli import main\n'
+            'main(["solve", "--moves", "5"])\n'
+            'print(sorted(m for m in ("numpy", "tictactoe.ai", "tictactoe.simulation", "multiprocessing.pool") '
+            'if m in sys.modules))')
+
+    # When
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+
+    # Then
+    assert output.splitlines()[-1] == '[]'
@@ -0,0 +1,107 @@
+import pickle
+import sys
+
+import pytest
+
+from tictactoe.board import Board
+from tictactoe.codec import Position, bits_per_cell, decode, encode, pack, unpack
+
+PLAYERS = ('X', 'O')
+
+
+@pytest.fixture()
+def board():
+    board = Board(4, 3)
+    for cell, player in [(1, 'X'), (6, 'O'), (12, 'X'), (7, '#')]:
+        board.place_choice(cell, player)
+    return board
+
+
+def test_encode():
+    assert encode([' ', 'X', 'O'], PLAYERS) == 1 * 3 + 2 * 9
+
+
+@pytest.mark.parametrize('players', [('X',), ('X', 'O'), ('X', 'O', '#'), ('X', 'O', '#', '@', '+')])
+def test_round_trips(board, players):
+    # Given
+    cells = [cell if cell in players else ' ' for cell in board.cells]
+
+    # Then
+    assert decode(encode(cells, players), len(cells), players) == cells
+    assert unpack(pack(cells, players), len(cells), players) == cells
+
+
+@pytest.mark.parametrize('nb_players, expected', [(1, 1), (2, 2), (3, 2), (4, 3), (7, 3), (8, 4)])
+def test_bits_per_cell(nb_players, expected):
+    assert bits_per_cell(nb_players) == expected
+
+
+def test_pack():
+    # Given
+    cells = ['X', ' ', 'O', 'X', 'X', ' ', ' ', ' ', 'O']
+
+    # When
+    data = pack(cells, PLAYERS)
+
+    # Then
+    assert data == bytes([0b01_10_00_01, 0b00_00_00_01, 0b10])
+
+
+class TestPosition:
+
+    def test_board_round_trip(self, board):
+        # When
+        position = Position.from_board(board, ('X', 'O', '#'))
+
+        # Then
+        assert position.cells == board.cells
+        assert position.to_board().cells == board.cells
+        assert position.to_board().count('#') == 1
+
+    def test_bytes_round_trip(self, board):
+        # Given
+        position = Position.from_board(board, ('X', 'O', '#'))
+
+        # Then
+        assert len(position.to_bytes()) == 3
+        assert Position.from_bytes(4, 3, ('X', 'O', '#'), position.to_bytes()) == position
+
+    def test_immutable(self, board):
+        # Given
+        position = Position.from_board(board, ('X', 'O', '#'))
+
+        # Then
+        with pytest.raises(AttributeError):
+            position.key = 0
+        with pytest.raises(AttributeError):
+            del position.width
+        with pytest.raises(AttributeError):
+            position.other = 0
+
+    def test_hash_and_equality(self):
+        # Given
+        first = Position.from_cells(3, 3, PLAYERS, ['X'] + [' '] * 8)
+        same = Position(3, 3, PLAYERS, 1)
+        other_size = Position(9, 1, PLAYERS, 1)
+
+        # Then
+        assert first == same
+        assert first != other_size
+        assert len({first, same, other_size}) == 2
+
+    def test_pickle(self):
+        # Given
+        position = Position(3, 3, PLAYERS, 12345)
+
+        # Then
+        assert pickle.loads(pickle.dumps(position)) == position
+
+    def test_compact(self):
+        # Given
+        board = Board()
+        board.place_choice(5, 'X')
+        position = Position.from_board(board, PLAYERS)
+
+        # Then
+        assert sys.getsizeof(position) + sys.getsizeof(position.key) < 100
+        assert not hasattr(position, '__dict__')
@@ -1,6 +1,9 @@
 import pytest
 
+from tictactoe.bitboard import BitBoard
+from tictactoe.board import Board
 from tictactoe.game import Game
+from tictactoe.sparse import SparseBoard
 
 
 @pytest.mark.parametrize('players, current_player, expected', [
@@ -19,3 +22,104 @@ def test_get_next_player(players, current_player, expected):
 
     # Then
     assert actual == expected
+
+
+@pytest.mark.parametrize('board_class', [Board, BitBoard, SparseBoard])
+def test_board_class(board_class):
+    # Given
+    game = Game(width=4, height=2, board_class=board_class)
+
+    # Then
+    assert isinstance(game.board, board_class)
+    assert len(game.board) == 8
+
+
+class ScriptedEngine:
+
+    def __init__(self, cells):
+        self.cells = iter(cells)
+
+    def get_choice(self, game, player):
+        return next(self.cells)
+
+
+@pytest.mark.parametrize('x_cells, o_cells, expected', [
+    ([1, 2, 3], [4, 5], 'X'),
+    ([1, 2, 9], [4, 5, 6], 'O'),
+    ([1, 3, 4, 8, 9], [2, 5, 6, 7], None),
+])
+def test_play(x_cells, o_cells, expected):
+    # Given
+    game = Game(engines={'X': ScriptedEngine(x_cells), 'O': ScriptedEngine(o_cells)})
+
+    # When
+    winner = game.play()
+
+    # Then
+    assert winner == expected
+
+
+@pytest.mark.parametrize('choice, valid, available', [
+    ('1', True, False), ('2', True, True), ('9', True, True), ('0', False, None), ('10', False, None),
+    ('-1', False, None), ('a', False, None), ('', False, None),
+])
+def test_choice_validation(choice, valid, available):
+    # Given
+    game = Game()
+    game.board.place_choice(1, 'X')
+
+    # Then
+    assert game.is_valid_choice(choice) is valid
+    if valid:
+        assert game.is_available_choice(choice) is available
+
+
+def test_run_with_take_back(monkeypatch, capsys):
+    # Given
+    inputs = iter(['1', '4', 'u', '5', '2', '9', '3'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(inputs))
+    game = Game()
+
+    # When
+    game.run()
+
+    # Then
+    assert game.moves == [1, 5, 2, 9, 3]
+    assert game.board.cells == ['X', 'X', 'X', ' ', 'O', ' ', ' ', ' ', 'O']
+    assert 'Congratulations X, you won!' in capsys.readouterr().out
+
+
+def test_run_with_take_back_against_engine(monkeypatch, capsys):
+    # Given
+    inputs = iter(['4', 'u', '2', '3'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(inputs))
+    game = Game(engines={'X': ScriptedEngine([1, 5, 9, 5])})
+
+    # When
+    game.run()
+
+    # Then
+    assert game.moves == [1, 2, 9, 3, 5]
+    assert game.board.cells == ['X', 'O', 'O', ' ', 'X', ' ', ' ', ' ', 'X']
+    assert 'Congratulations X, you won!' in capsys.readouterr().out
+
+
+def test_take_back_not_offered_before_first_move(monkeypatch):
+    # Given
+    inputs = iter(['u', '1'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(inputs))
+
+    # Then
+    assert Game().get_player_choice('X') == 1
+
+
+def test_take_back_not_offered_after_engine_move_only(monkeypatch):
+    # Given
+    inputs = iter(['u', '2'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(inputs))
+    game = Game(engines={'X': ScriptedEngine([1])})
+    game.play_move(game.get_player_choice('X'), 'X')
+
+    # Then
+    assert game.can_take_back() is False
+    assert game.get_player_choice('O') == 2
@@ -0,0 +1,152 @@
+import json
+import math
+import random
+
+import pytest
+
+from tictactoe.bitboard import BitBoard
+from tictactoe.board import Board
+from tictactoe.game import Game
+from tictactoe.instrument import Histogram, Instrumentation
+from tictactoe.simulation import HeuristicPolicy
+from tictactoe.sparse import SparseBoard
+
+
+class ScriptedEngine:
+
+    def __init__(self, cells):
+        self.cells = iter(cells)
+
+    def get_choice(self, game, player):
+        return next(self.cells)
+
+
+def scripted_game(instrumentation, board_class=Board):
+    engines = {'X': ScriptedEngine([1, 2, 3]), 'O': ScriptedEngine([4, 5])}
+    return Game(engines=engines, board_class=board_class, instrumentation=instrumentation)
+
+
+def test_histogram():
+    # Given
+    histogram = Histogram((0.1, 1.0, math.inf))
+
+    # When
+    for value in (0.05, 0.5, 0.7, 5.0):
+        histogram.observe(value)
+
+    # Then
+    assert histogram.buckets == [1, 2, 1]
+    assert histogram.cumulative() == [1, 3, 4]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(6.25)
+    assert histogram.to_dict()['buckets'] == {'0.1': 1, '1.0': 3, '+Inf': 4}
+
+
+@pytest.mark.parametrize('board_class', [Board, BitBoard, SparseBoard])
+def test_play(board_class):
+    # Given
+    instrumentation = Instrumentation()
+    game = scripted_game(instrumentation, board_class)
+
+    # When
+    winner = game.play()
+
+    # Then
+    assert winner == 'X'
+    assert game.winner == 'X'
+    assert instrumentation.counters['moves', '3x3/3'] == 5
+    assert instrumentation.counters['checks', '3x3/3'] == 5
+    assert instrumentation.games == {('3x3/3', 'X'): 1}
+    assert instrumentation.histograms['3x3/3', 'input'].count == 5
+    assert instrumentation.histograms['3x3/3', 'place'].count == 5
+    assert instrumentation.histograms['3x3/3', 'full'].count == 5
+
+
+def test_engine_probes_not_recorded():
+    # Given
+    instrumentation = Instrumentation()
+    rnd = random.Random(0)
+    game = Game(5, 5, 4, engines={'X': HeuristicPolicy(rnd), 'O': HeuristicPolicy(rnd)},
+                instrumentation=instrumentation)
+    moves = []
+    instrumentation.add_hook('on_move', lambda game, player, cell, seconds: moves.append(cell))
+
+    # When
+    game.play()
+
+    # Then
+    assert moves == game.moves
+    assert instrumentation.counters['moves', '5x5/4'] == len(game.moves)
+    assert instrumentation.counters['checks', '5x5/4'] == len(game.moves)
+    assert instrumentation.histograms['5x5/4', 'full'].count == len(game.moves) + (game.winner is None)
+
+
+def test_hooks():
+    # Given
+    instrumentation = Instrumentation()
+    moves, checks, ends = [], [], []
+    instrumentation.add_hook('on_move', lambda game, player, cell, seconds: moves.append((player, cell)))
+    instrumentation.add_hook('on_check',
+                             lambda game, player, cell, won, visited, seconds: checks.append((won, visited)))
+    instrumentation.add_hook('on_game_end', lambda game, winner: ends.append(winner))
+
+    # When
+    scripted_game(instrumentation).play()
+
+    # Then
+    assert moves == [('X', 1), ('O', 4), ('X', 2), ('O', 5), ('X', 3)]
+    assert [won for won, _ in checks] == [False] * 4 + [True]
+    assert sum(visited for _, visited in checks) == instrumentation.counters['cells_visited', '3x3/3'] > 0
+    assert ends == ['X']
+
+
+def test_unknown_hook():
+    with pytest.raises(ValueError):
+        Instrumentation().add_hook('on_nothing', print)
+
+
+def test_run_renders(monkeypatch, capsys):
+    # Given
+    inputs = iter(['1', '4', '2', '5', '6', '3', '7', '8', '9'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(inputs))
+    instrumentation = Instrumentation()
+    renders = []
+    instrumentation.add_hook('on_render', lambda game, seconds: renders.append(seconds))
+
+    # When
+    Game(instrumentation=instrumentation).run()
+
+    # Then
+    assert "It's a draw!" in capsys.readouterr().out
+    assert len(renders) == 10
+    assert instrumentation.games == {('3x3/3', 'draw'): 1}
+
+
+def test_not_attached():
+    # Given
+    game = Game()
+
+    # Then
+    assert game.board.place_choice.__func__ is Board.place_choice
+    assert 'play' not in vars(game)
+
+
+def test_export(tmp_path):
+    # Given
+    instrumentation = Instrumentation()
+    scripted_game(instrumentation).play()
+
+    # When
+    instrumentation.write(str(tmp_path / 'metrics.json'))
+    instrumentation.write(str(tmp_path / 'metrics.prom'))
+
+    # Then
+    metrics = json.loads((tmp_path / 'metrics.json').read_text())['3x3/3']
+    assert metrics['counters']['moves'] == 5
+    assert metrics['games'] == {'X': 1}
+    assert metrics['phases']['place']['buckets']['+Inf'] == 5
+    text = (tmp_path / 'metrics.prom').read_text()
+    assert 'tictactoe_phase_seconds_bucket{config="3x3/3",phase="place",le="+Inf"} 5\n' in text
+    assert 'tictactoe_phase_seconds_count{config="3x3/3",phase="check"} 5\n' in text
+    assert 'tictactoe_moves_total{config="3x3/3"} 5\n' in text
+    assert 'tictactoe_games_total{config="3x3/3",result="X"} 1\n' in text
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+from tictactoe.game import Game
+from tictactoe.mcts import MCTSPlayer, Node, OverlayBoard, search
+
+
+class TestOverlayBoard:
+
+    def test_copy_on_write(self):
+        # Given
+        cells = ['X', ' ', ' ', ' ']
+        board = OverlayBoard(cells, 2, 2, [1, 2, 3])
+
+        # When
+        board.place(1, 'O')
+
+        # Then
+        assert cells == ['X', ' ', ' ', ' ']
+        assert [board.get(c) for c in range(4)] == ['X', 'O', ' ', ' ']
+        assert board.is_full() is False
+
+    def test_random_free(self):
+        # Given
+        board = OverlayBoard([' '] * 9, 3, 3, list(range(9)))
+        for cell_id in range(8):
+            board.place(cell_id, 'X')
+
+        # Then
+        assert board.random_free(random.Random(0)) == 8
+
+    @pytest.mark.parametrize('cells, cell_id, expected', [
+        (['X', 'X', 'X', ' ', ' ', ' ', ' ', ' ', ' '], 1, True),
+        (['X', ' ', ' ', ' ', 'X', ' ', ' ', ' ', 'X'], 8, True),
+        ([' ', ' ', 'X', ' ', 'X', ' ', 'X', ' ', ' '], 4, True),
+        (['X', 'X', ' ', 'X', ' ', ' ', ' ', ' ', ' '], 0, False),
+        ([' ', ' ', 'X', 'X', 'X', ' ', ' ', ' ', ' '], 3, False),
+    ])
+    def test_check_victory_at(self, cells, cell_id, expected):
+        board = OverlayBoard(cells, 3, 3, [])
+        assert board.check_victory_at(cell_id, 'X', 3) is expected
+
+
+def test_search_counts_visits():
+    # Given
+    root = Node(None, 1, None, list(range(9)))
+
+    # When
+    playouts = search(root, [' '] * 9, 3, 3, 3, ['X', 'O'], float('inf'), 500, 1.4, random.Random(0))
+
+    # Then
+    assert playouts == 500
+    assert root.visits == 500
+    assert sum(child.visits for child in root.children.values()) == 500
+
+
+class TestMCTSPlayer:
+
+    def test_wins(self):
+        # Given
+        game = Game()
+        game.board.cells = ['X', 'X', ' ', 'O', 'O', ' ', ' ', ' ', ' ']
+
+        # When
+        choice = MCTSPlayer(max_iterations=2000).get_choice(game, 'X')
+
+        # Then
+        assert choice == 3
+
+    def test_blocks(self):
+        # Given
+        game = Game()
+        game.board.cells = ['X', 'X', ' ', ' ', 'O', ' ', ' ', ' ', ' ']
+
+        # When
+        choice = MCTSPlayer(max_iterations=3000).get_choice(game, 'O')
+
+        # Then
+        assert choice == 3
+
+    def test_tree_reuse(self):
+        # Given
+        engine = MCTSPlayer(max_iterations=500)
+        game = Game(engines={'X': engine})
+        game.play_move(game.get_player_choice('X'), 'X')
+        reply = next(c for c in range(1, 10) if game.board.is_available(c))
+        expected_root = engine.root.children[reply - 1]
+        game.play_move(reply, 'O')
+
+        # When
+        game.get_player_choice('X')
+
+        # Then
+        assert expected_root.visits >= 500
+        assert engine.playouts == 500
+        assert engine.playouts_per_second > 0
+
+    def test_three_players_game(self):
+        engine = MCTSPlayer(max_iterations=200)
+        game = Game(5, 5, nb_marks=4, players=['X', 'O', '#'], engines={p: engine for p in 'XO#'})
+        assert game.play() in ('X', 'O', '#', None)
+
+    def test_root_parallel(self):
+        # Given
+        engine = MCTSPlayer(max_iterations=1000, processes=2)
+        game = Game()
+        game.board.cells = ['X', 'X', ' ', 'O', 'O', ' ', ' ', ' ', ' ']
+
+        # When
+        try:
+            choice = engine.get_choice(game, 'X')
+        finally:
+            engine.close()
+
+        # Then
+        assert choice == 3
+        assert engine.playouts == 2000
@@ -0,0 +1,109 @@
+import io
+import os
+
+import pytest
+
+from tictactoe.game import Game
+from tictactoe.record import (
+    GameRecord, RecordWriter, decode_record, decode_varint, encode_record, encode_varint, read_records, read_stream,
+    replay,
+)
+
+
+@pytest.fixture()
+def record():
+    return GameRecord(3, 3, 3, ('X', 'O'), (5, 1, 9, 3, 2, 8, 7))
+
+
+@pytest.mark.parametrize('value, expected', [(0, b'\x00'), (127, b'\x7f'), (128, b'\x80\x01'), (300, b'\xac\x02')])
+def test_varint(value, expected):
+    out = bytearray()
+    encode_varint(value, out)
+    assert bytes(out) == expected
+    assert decode_varint(b'\xff' + expected, 1) == (value, 1 + len(expected))
+
+
+def test_record_round_trip(record):
+    # When
+    data = encode_record(record)
+
+    # Then
+    assert len(data) == 4 + 2 * 2 + 1 + 7
+    assert decode_record(data) == (record, len(data))
+
+
+def test_large_board_record():
+    record = GameRecord(1000, 1000, 5, ('X', 'O', 'éé'), (1, 999_999, 1_000_000))
+    assert decode_record(encode_record(record))[0] == record
+
+
+def test_from_game():
+    # Given
+    game = Game(4, 3, nb_marks=3, players=['X', 'O', '#'])
+
+    # When
+    for cell, player in ((1, 'X'), (5, 'O'), (12, '#')):
+        game.play_move(cell, player)
+
+    # Then
+    assert GameRecord.from_game(game) == GameRecord(4, 3, 3, ('X', 'O', '#'), (1, 5, 12))
+
+
+class TestFile:
+
+    def test_write_read(self, tmp_path, record):
+        # Given
+        path = str(tmp_path / 'games.tttr')
+        records = [record._replace(moves=record.moves[:i]) for i in range(8)] * 50
+
+        # When
+        with RecordWriter(path, chunk_size=100) as writer:
+            for r in records:
+                writer.write(r)
+
+        # Then
+        assert list(read_records(path)) == records
+        assert os.path.getsize(path) < sum(len(encode_record(r)) for r in records)
+
+    def test_append(self, tmp_path, record):
+        # Given
+        path = str(tmp_path / 'games.tttr')
+        with RecordWriter(path) as writer:
+            writer.write(record)
+
+        # When
+        with RecordWriter(path) as writer:
+            writer.write(record._replace(nb_marks=2))
+
+        # Then
+        assert [r.nb_marks for r in read_records(path)] == [3, 2]
+
+    def test_streaming(self, record):
+        # Given
+        stream = io.BytesIO()
+        writer = RecordWriter(stream, chunk_size=1)
+        for _ in range(3):
+            writer.write(record)
+        stream.seek(0)
+
+        # When
+        records = read_stream(stream)
+
+        # Then
+        assert next(records) == record
+        assert stream.tell() < len(stream.getvalue())
+        assert len(list(records)) == 2
+
+    def test_invalid_stream(self):
+        with pytest.raises(ValueError):
+            list(read_stream(io.BytesIO(b'nope')))
+
+
+def test_replay(record):
+    # When
+    boards = [board.cells.copy() for board in replay(record)]
+
+    # Then
+    assert len(boards) == 7
+    assert boards[0] == [' ', ' ', ' ', ' ', 'X', ' ', ' ', ' ', ' ']
+    assert boards[-1] == ['O', 'X', 'O', ' ', 'X', ' ', 'X', 'O', 'X']
@@ -0,0 +1,104 @@
+import pytest
+
+from tictactoe.board import Board
+from tictactoe.renderer import BoardRenderer, render
+
+
+@pytest.fixture()
+def board():
+    board = Board(4, 3)
+    board.place_choice(1, 'X')
+    board.place_choice(12, 'O')
+    return board
+
+
+def test_render(board):
+    assert render(board.cells, 4, 3) == ''' 1: X |  2:   |  3:   |  4:  
+------+-------+-------+------
+ 5:   |  6:   |  7:   |  8:  
+------+-------+-------+------
+ 9:   | 10:   | 11:   | 12: O'''
+
+
+def test_renderer_same_as_render(board):
+    assert BoardRenderer(board).render() == render(board.cells, 4, 3)
+
+
+class TestCache:
+
+    def test_only_dirty_rows_rendered(self, board):
+        # Given
+        str(board)
+        first, second, third = board.renderer.rows
+
+        # When
+        board.place_choice(6, 'X')
+        output = str(board)
+
+        # Then
+        assert board.renderer.rows[0] is first
+        assert board.renderer.rows[1] != second
+        assert board.renderer.rows[2] is third
+        assert output == render(board.cells, 4, 3)
+
+    def test_cells_replaced(self, board):
+        # Given
+        str(board)
+
+        # When
+        board.cells = ['O'] * 12
+
+        # Then
+        assert str(board) == render(['O'] * 12, 4, 3)
+
+    def test_invalidate(self, board):
+        # Given
+        str(board)
+
+        # When
+        board.cells[1] = 'O'
+        board.renderer.invalidate(2)
+
+        # Then
+        assert str(board) == render(board.cells, 4, 3)
+
+
+class TestWindow:
+
+    def test_window(self, board):
+        assert board.renderer.render_window(2, 1, 2, 2) == ''' 7:   |  8:  
+------+------
+11:   | 12: O'''
+
+    def test_window_clipped(self, board):
+        assert board.renderer.render_window(-1, -1, 2, 2) == ' 1: X'
+
+    def test_large_board(self):
+        # Given
+        board = Board(1000, 1000)
+        board.place_choice(500_501, 'X')
+
+        # When
+        window = board.renderer.render_window(499, 499, 3, 3)
+
+        # Then
+        assert window.splitlines()[0] == ' 499500:   |  499501:   |  499502:  '
+        assert window.splitlines()[2] == ' 500500:   |  500501: X |  500502:  '
+        assert board.renderer.rows.count(None) == 997
+
+
+class TestAnsi:
+
+    def test_draw(self, board):
+        assert board.renderer.ansi_draw() == '\x1b[2J\x1b[H' + str(board) + '\n'
+
+    def test_updates(self, board):
+        # Given
+        board.renderer.ansi_draw()
+
+        # When
+        board.place_choice(7, 'X')
+
+        # Then
+        assert board.renderer.ansi_updates() == '\x1b[3;21HX\x1b[6;1H'
+        assert board.renderer.ansi_updates() == ''
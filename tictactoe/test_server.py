@@ -0,0 +1,188 @@
+import asyncio
+
+import pytest
+
+from tictactoe.record import GameRecord
+from tictactoe.server import FINISHED, PLAYING, WAITING, GameServer, LocalClient
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_full_match():
+    async def scenario():
+        server = GameServer(keep_finished=True)
+        x, o = LocalClient(server), LocalClient(server)
+
+        assert x.request('NEW 3 3 3 XO') == 'OK 1'
+        match = server.matches[1]
+        assert x.request('JOIN 1 X') == 'OK 1 X'
+        assert match.state == WAITING
+        assert o.request('JOIN 1 O') == 'OK 1 O'
+        assert match.state == PLAYING
+
+        for client, player, cell in ((x, 'X', 1), (o, 'O', 4), (x, 'X', 2), (o, 'O', 5)):
+            assert client.request(f'MOVE 1 {player} {cell}') == f'OK 1 {cell}'
+        assert x.request('MOVE 1 X 3') == 'OK 1 3'
+
+        assert match.state == FINISHED
+        assert match.winner == 'X'
+        assert GameRecord.from_game(match.game) == GameRecord(3, 3, 3, ('X', 'O'), (1, 4, 2, 5, 3))
+        assert match.game.winner == 'X'
+        assert x.request('BOARD 1') == 'OK 1 XXXOO....'
+        events = o.pending_events()
+        assert events[0] == 'TURN 1 X'
+        assert events[-2:] == ['MOVED 1 X 3', 'WIN 1 X']
+
+    run(scenario())
+
+
+def test_invalid_moves():
+    async def scenario():
+        server = GameServer()
+        x, o = LocalClient(server), LocalClient(server)
+        x.request('NEW 3 3 3 XO')
+        assert x.request('MOVE 1 X 1') == 'ERROR match 1 is waiting'
+        x.request('JOIN 1 X')
+        assert o.request('JOIN 1 X') == 'ERROR player X already joined'
+        assert o.request('JOIN 1 #') == 'ERROR unknown player #'
+        o.request('JOIN 1 O')
+
+        assert o.request('MOVE 1 O 1') == 'ERROR not your turn, player X is playing'
+        assert o.request('MOVE 1 X 1') == 'ERROR player X is not yours'
+        assert x.request('MOVE 1 X 10') == 'ERROR "10" is not a valid cell number'
+        assert x.request('MOVE 1 X a') == 'ERROR "a" is not a valid cell number'
+        x.request('MOVE 1 X 1')
+        assert o.request('MOVE 1 O 1') == 'ERROR "1" cell is already taken'
+        assert x.request('MOVE 2 X 1') == 'ERROR unknown match 2'
+        assert x.request('HELLO') == 'ERROR invalid request "HELLO"'
+        assert x.request('NEW 3 3 three XO').startswith('ERROR')
+
+    run(scenario())
+
+
+@pytest.mark.parametrize('request_line, error', [
+    ('NEW 0 3 3 XO', 'ERROR width, height and nb_marks must be positive'),
+    ('NEW 101 3 3 XO', 'ERROR width and height must not exceed 100'),
+    ('NEW 3 1000000 3 XO', 'ERROR width and height must not exceed 100'),
+    ('NEW 3 3 3 XX', 'ERROR players must be distinct markers other than "."'),
+    ('NEW 3 3 3 X.', 'ERROR players must be distinct markers other than "."'),
+    ('NEW 3 3 3 XO -1', 'ERROR move timeout must be a positive number of seconds'),
+    ('NEW 3 3 3 XO 0', 'ERROR move timeout must be a positive number of seconds'),
+    ('NEW 3 3 3 XO nan', 'ERROR move timeout must be a positive number of seconds'),
+    ('NEW 3 3 3 XO inf', 'ERROR move timeout must be a positive number of seconds'),
+])
+def test_invalid_new(request_line, error):
+    async def scenario():
+        server = GameServer()
+        assert LocalClient(server).request(request_line) == error
+        assert server.matches == {}
+
+    run(scenario())
+
+
+def test_max_matches():
+    async def scenario():
+        server = GameServer(max_matches=2)
+        client = LocalClient(server)
+        client.request('NEW 3 3 3 XO')
+        client.request('NEW 3 3 3 XO')
+        assert client.request('NEW 3 3 3 XO') == 'ERROR too many matches, at most 2'
+
+    run(scenario())
+
+
+def test_join_timeout():
+    async def scenario():
+        server = GameServer(join_timeout=0.01)
+        x = LocalClient(server)
+        x.request('NEW 3 3 3 XO')
+        x.request('JOIN 1 X')
+        x.request('NEW 3 3 3 XO')
+        x.request('JOIN 2 X')
+        x.request('JOIN 2 O')
+
+        assert await x.next_event(1) == 'TURN 2 X'
+        assert await x.next_event(1) == 'EXPIRED 1'
+        assert list(server.matches) == [2]
+        await asyncio.sleep(0.02)
+        assert x.pending_events() == []
+
+    run(scenario())
+
+
+def test_finished_matches_are_forgotten():
+    async def scenario():
+        server = GameServer()
+        client = LocalClient(server)
+        client.request('NEW 1 1 1 X')
+        client.request('JOIN 1 X')
+        client.request('MOVE 1 X 1')
+        assert server.matches == {}
+
+    run(scenario())
+
+
+def test_move_timeout():
+    async def scenario():
+        server = GameServer(move_timeout=0.01)
+        x, o = LocalClient(server), LocalClient(server)
+        x.request('NEW 3 3 3 XO')
+        match = server.matches[1]
+        x.request('JOIN 1 X')
+        o.request('JOIN 1 O')
+        x.request('MOVE 1 X 5')
+
+        assert await o.next_event(1) == 'TURN 1 X'
+        assert await o.next_event(1) == 'MOVED 1 X 5'
+        assert await o.next_event(1) == 'TURN 1 O'
+        assert await o.next_event(1) == 'TIMEOUT 1 O'
+        assert match.state == FINISHED
+        assert match.timed_out == 'O'
+        assert match.winner == match.game.winner == 'X'
+
+    run(scenario())
+
+
+def test_many_concurrent_matches():
+    async def scenario():
+        server = GameServer()
+        client = LocalClient(server)
+        nb_matches = 2000
+        for _ in range(nb_matches):
+            match_id = client.request('NEW 3 3 3 XO').split()[1]
+            client.request(f'JOIN {match_id} X')
+            client.request(f'JOIN {match_id} O')
+
+        for cell, player in ((1, 'X'), (4, 'O'), (2, 'X'), (5, 'O'), (3, 'X')):
+            for match_id in range(1, nb_matches + 1):
+                assert client.request(f'MOVE {match_id} {player} {cell}') == f'OK {match_id} {cell}'
+
+        assert server.matches == {}
+
+    run(scenario())
+
+
+def test_tcp():
+    async def scenario():
+        server = GameServer()
+        host, port = await server.start('127.0.0.1', 0)
+        reader, writer = await asyncio.open_connection(host, port)
+
+        async def request(line):
+            writer.write(line.encode() + b'\n')
+            await writer.drain()
+            return (await reader.readline()).decode().strip()
+
+        assert await request('NEW 3 3 3 XO') == 'OK 1'
+        assert await request('JOIN 1 X') == 'OK 1 X'
+        assert await request('JOIN 1 O') == 'OK 1 O'
+        assert (await reader.readline()).decode().strip() == 'TURN 1 X'
+        assert await request('MOVE 1 X 5') == 'OK 1 5'
+        assert (await reader.readline()).decode().strip() == 'MOVED 1 X 5'
+
+        writer.close()
+        await server.stop()
+
+    run(scenario())
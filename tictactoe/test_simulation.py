@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from tictactoe.game import Game
+from tictactoe.simulation import Config, HeuristicPolicy, Stats, play_shard, simulate, wins_at
+
+
+def test_wins_at_leaves_board_unchanged():
+    # Given
+    board = Game().board
+    board.cells = ['X', 'X', ' ', ' ', 'O', ' ', ' ', ' ', ' ']
+
+    # Then
+    assert wins_at(board, 3, 'X', 3) is True
+    assert wins_at(board, 4, 'X', 3) is False
+    assert board.cells == ['X', 'X', ' ', ' ', 'O', ' ', ' ', ' ', ' ']
+
+
+@pytest.mark.parametrize('cells, expected', [
+    (['X', 'X', ' ', 'O', 'O', ' ', ' ', ' ', ' '], 6),
+    (['X', 'X', ' ', ' ', 'O', ' ', ' ', ' ', ' '], 3),
+])
+def test_heuristic_policy(cells, expected):
+    # Given
+    game = Game()
+    game.board.cells = cells
+
+    # When
+    choice = HeuristicPolicy(random.Random(0)).get_choice(game, 'O')
+
+    # Then
+    assert choice == expected
+
+
+def test_stats():
+    # Given
+    stats = Stats()
+    other = Stats()
+    other.games, other.draws = 3, 1
+    other.wins['X'] = 2
+
+    # When
+    stats.add(other)
+    stats.add(other)
+
+    # Then
+    assert stats.to_dict(['X', 'O']) == {
+        'X': {'wins': 4, 'draws': 2, 'losses': 0},
+        'O': {'wins': 0, 'draws': 2, 'losses': 4},
+    }
+
+
+def test_play_shard_is_deterministic():
+    config = Config(4, 4, 3, ('X', 'O', '#'))
+    policies = {'X': 'random', 'O': 'heuristic', '#': 'random'}
+    first = play_shard(config, policies, 20, 'seed')
+    second = play_shard(config, policies, 20, 'seed')
+    assert (first.wins, first.draws) == (second.wins, second.draws)
+    assert first.games == 20
+
+
+def test_simulate():
+    # Given
+    configs = [Config(), Config(4, 4, 3, ('X', 'O', '#'))]
+    policies = {'X': 'search', 'O': 'random', '#': 'heuristic'}
+
+    # When
+    results = simulate(configs, policies, nb_games=10, nb_shards=3, processes=1, seed=1)
+
+    # Then
+    assert [results[config].games for config in configs] == [10, 10]
+    assert results[Config()].losses('X') == 0
+
+
+def test_simulate_same_results_in_process_pool():
+    configs = [Config()]
+    policies = {'X': 'random', 'O': 'heuristic'}
+    inline = simulate(configs, policies, nb_games=30, nb_shards=4, processes=1, seed=2)
+    pooled = simulate(configs, policies, nb_games=30, nb_shards=4, processes=2, seed=2)
+    assert inline[Config()].to_dict('XO') == pooled[Config()].to_dict('XO')
@@ -0,0 +1,182 @@
+import random
+
+import pytest
+
+from tictactoe.board import Board
+from tictactoe.sparse import SparseBoard
+
+
+def test_invalid_dimensions():
+    with pytest.raises(ValueError):
+        SparseBoard(3, None)
+
+
+def test_huge_board_stays_sparse():
+    # Given
+    board = SparseBoard(10_000, 10_000)
+
+    # When
+    board.place_choice(1, 'X')
+    board.place_choice(100_000_000, 'O')
+
+    # Then
+    assert board.marks == {(0, 0): 'X', (9999, 9999): 'O'}
+    assert len(board) == 100_000_000
+    assert board.is_full() is False
+
+
+class TestPlaceChoice:
+
+    @pytest.mark.parametrize('cell', [0, 10, -1])
+    def test_outside_board(self, cell):
+        board = SparseBoard()
+        board.place_choice(cell, 'X')
+        assert board.occupied == 0
+
+    def test_overwrite(self):
+        # Given
+        board = SparseBoard()
+        board.place_choice(5, 'X')
+
+        # When
+        board.place_choice(5, 'O')
+
+        # Then
+        assert board.occupied == 1
+        assert board.has_mark_at(5, 'O') is True
+        assert board.check_victory('X', 1) is False
+
+    def test_is_full(self):
+        # Given
+        board = SparseBoard(2, 2)
+
+        # When
+        for cell in range(1, 5):
+            board.place_choice(cell, 'X')
+
+        # Then
+        assert board.is_full() is True
+        assert board.is_available(1) is False
+
+
+@pytest.mark.parametrize('width, height, nb_marks', [(3, 3, 3), (5, 4, 4), (7, 7, 4)])
+def test_check_victory_same_as_board(width, height, nb_marks):
+    rnd = random.Random(width * height)
+    for _ in range(30):
+        board = Board(width, height)
+        sparse = SparseBoard(width, height)
+        cells = list(range(1, width * height + 1))
+        rnd.shuffle(cells)
+        for i, cell in enumerate(cells[:rnd.randint(1, len(cells))]):
+            player = 'XO'[i % 2]
+            board.place_choice(cell, player)
+            sparse.place_choice(cell, player)
+            assert sparse.check_victory_at(cell, player, nb_marks) is board.check_victory_at(cell, player, nb_marks)
+        for player in 'XO':
+            assert sparse.check_victory(player, nb_marks) is board.check_victory(player, nb_marks)
+        assert sparse.is_full() is board.is_full()
+
+
+class TestUnbounded:
+
+    def test_victory_far_away(self):
+        # Given
+        board = SparseBoard(None, None)
+        for i in range(4):
+            board.place_at(-1_000_000 + i, 5_000_000 - i, 'X')
+
+        # When
+        board.place_at(-1_000_000 + 4, 5_000_000 - 4, 'X')
+
+        # Then
+        assert board.check_victory_at_xy(-999_996, 4_999_996, 'X', nb_marks=5) is True
+        assert board.check_victory('X', nb_marks=5) is True
+        assert board.check_victory('X', nb_marks=6) is False
+        assert board.is_full() is False
+
+    def test_no_cell_numbers(self):
+        with pytest.raises(ValueError):
+            SparseBoard(None, None).place_choice(1, 'X')
+        with pytest.raises(TypeError):
+            len(SparseBoard(None, None))
+
+
+class TestRender:
+
+    def test_around_marks(self):
+        # Given
+        board = SparseBoard(None, None)
+        board.place_at(10, 10, 'X')
+        board.place_at(11, 9, 'O')
+
+        # Then
+        assert str(board) == ''' 8: . . . .
+ 9: . . O .
+10: . X . .
+11: . . . .'''
+
+    def test_clipped_to_board(self):
+        # Given
+        board = SparseBoard(3, 2)
+        board.place_choice(1, 'X')
+
+        # Then
+        assert board.render() == '0: X .\n1: . .'
+
+    def test_cell_numbers(self):
+        # Given
+        board = SparseBoard(40, 40)
+        board.place_choice(42, 'X')
+
+        # Then
+        assert str(board) == '''   1:   |    2:   |    3:  
+  41:   |   42: X |   43:  
+  81:   |   82:   |   83:  '''
+
+    @pytest.mark.parametrize('width, height', [(3, 3), (4, 3), (32, 32)])
+    def test_small_board_whole(self, width, height):
+        # Given
+        board, sparse = Board(width, height), SparseBoard(width, height)
+        for cell in (2, 6):
+            board.place_choice(cell, 'X')
+            sparse.place_choice(cell, 'X')
+
+        # Then
+        assert str(SparseBoard(width, height)) == str(Board(width, height))
+        assert str(sparse) == str(board)
+
+    def test_unbounded_has_no_cell_numbers(self):
+        with pytest.raises(ValueError):
+            SparseBoard(None, None).render(numbers=True)
+
+    def test_window(self):
+        # Given
+        board = SparseBoard(100, 100)
+        board.place_choice(1, 'X')
+
+        # Then
+        assert board.render(0, 0, 3, 1) == '0: X . .'
+
+    @pytest.mark.parametrize('args, expected', [
+        ({'x': 11}, '3: . .\n4: O .\n5: . .\n6: . .'),
+        ({'y': 5, 'height': 1}, '5: . X . .'),
+        ({'width': 2}, '3: . .\n4: . .\n5: . X\n6: . .'),
+    ])
+    def test_partial_window(self, args, expected):
+        # Given
+        board = SparseBoard(None, None)
+        board.place_at(10, 5, 'X')
+        board.place_at(11, 4, 'O')
+
+        # Then
+        assert board.render(**args) == expected
+
+    def test_negative_rows_aligned(self):
+        # Given
+        board = SparseBoard(None, None)
+        board.place_at(0, -12, 'X')
+        board.place_at(0, -1, 'O')
+
+        # Then
+        assert board.render().splitlines()[-3:] == [' -2: . . .', ' -1: . O .', '  0: . . .']
+        assert board.render().splitlines()[0] == '-13: . . .'
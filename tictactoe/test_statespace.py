@@ -0,0 +1,70 @@
+import pytest
+
+from tictactoe.codec import decode, encode
+from tictactoe.statespace import StateSpace, read_keys, write_keys
+
+
+def test_decode():
+    cells = [' ', 'X', 'O', '#']
+    assert decode(encode(cells, ['X', 'O', '#']), 4, ['X', 'O', '#']) == cells
+
+
+def test_keys_file(tmp_path, monkeypatch):
+    monkeypatch.setattr('tictactoe.statespace.CHUNK', 3)
+    path = str(tmp_path / 'keys')
+    write_keys(path, {5, 1, 2 ** 63, 7, 3})
+    assert list(read_keys(path)) == [1, 3, 5, 7, 2 ** 63]
+
+
+class TestStateSpace:
+
+    def test_3x3(self, tmp_path):
+        # When
+        stats = StateSpace().enumerate(str(tmp_path))
+
+        # Then
+        assert stats.positions == 765
+        assert stats.raw_positions == 5478
+        assert stats.by_depth == [1, 3, 12, 38, 108, 174, 204, 153, 57, 15]
+        assert stats.wins == {'X': 91, 'O': 44}
+        assert stats.draws == 3
+        assert stats.value == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_spilled_runs(self, monkeypatch):
+        # Given
+        monkeypatch.setattr('tictactoe.statespace.RUN', 16)
+
+        # When
+        stats = StateSpace().enumerate()
+
+        # Then
+        assert stats.positions == 765
+        assert stats.raw_positions == 5478
+        assert stats.value == 0
+
+    def test_3x3_without_symmetry(self):
+        # When
+        stats = StateSpace(symmetry=False).enumerate()
+
+        # Then
+        assert stats.positions == 5478
+        assert stats.wins == {'X': 626, 'O': 316}
+        assert stats.draws == 16
+
+    @pytest.mark.parametrize('width, height, nb_marks, expected', [(3, 3, 2, 1), (1, 1, 1, 1), (4, 1, 3, 0)])
+    def test_values(self, width, height, nb_marks, expected):
+        assert StateSpace(width, height, nb_marks).enumerate().value == expected
+
+    def test_three_players(self):
+        # When
+        stats = StateSpace(3, 3, 3, ['X', 'O', '#']).enumerate()
+
+        # Then
+        assert stats.value is None
+        assert stats.by_depth[0] == 1
+        assert sum(stats.by_depth) == stats.positions
+
+    def test_too_large(self):
+        with pytest.raises(ValueError):
+            StateSpace(9, 9)
@@ -0,0 +1,100 @@
+import pytest
+
+from tictactoe.symmetry import PositionCache, canonicalize, from_canonical, to_canonical, transforms
+
+
+@pytest.mark.parametrize('width, height, expected', [(3, 3, 8), (4, 4, 8), (4, 3, 4), (1, 5, 4)])
+def test_transforms_count(width, height, expected):
+    perms = transforms(width, height)
+    assert len(perms) == expected
+    assert perms[0] == tuple(range(width * height))
+    for perm in perms:
+        assert sorted(perm) == list(range(width * height))
+
+
+def test_canonicalize_corners():
+    # Given
+    corners = [1, 3, 7, 9]
+    forms = set()
+
+    # When
+    for corner in corners:
+        cells = [' '] * 9
+        cells[corner - 1] = 'X'
+        forms.add(canonicalize(cells, 3, 3)[0])
+
+    # Then
+    assert len(forms) == 1
+
+
+def test_canonicalize_non_square_keeps_shape():
+    # Given
+    cells = [' '] * 6
+    cells[0] = 'X'
+
+    # When
+    canonical, _ = canonicalize(cells, 3, 2)
+
+    # Then
+    assert canonical.count('X') == 1
+    assert canonicalize([' ', ' ', ' ', ' ', ' ', 'X'], 3, 2)[0] == canonical
+    assert canonicalize([' ', 'X', ' ', ' ', ' ', ' '], 3, 2)[0] != canonical
+
+
+@pytest.mark.parametrize('width, height', [(3, 3), (4, 3)])
+def test_cell_mapping_round_trip(width, height):
+    for transform in range(len(transforms(width, height))):
+        for cell in range(1, width * height + 1):
+            assert from_canonical(to_canonical(cell, transform, width, height), transform, width, height) == cell
+
+
+class TestPositionCache:
+
+    def test_shared_across_symmetries(self):
+        # Given
+        cache = PositionCache()
+        cells = ['X', 'X', ' ', ' ', 'O', ' ', 'O', ' ', ' ']
+        cache.put(cells, 3, 3, value='win', move=3)
+
+        # When
+        mirrored = ['X', ' ', 'O', 'X', 'O', ' ', ' ', ' ', ' ']
+        result = cache.get(mirrored, 3, 3)
+
+        # Then
+        assert result == ('win', 7)
+        assert len(cache) == 1
+
+    def test_miss(self):
+        cache = PositionCache()
+        assert cache.get([' '] * 9, 3, 3) is None
+        assert cache.misses == 1
+
+    def test_lru_eviction(self):
+        # Given
+        cache = PositionCache(max_entries=2)
+        first, second, third = (['X'] + [' '] * 8), ([' '] * 4 + ['X'] + [' '] * 4), ([' ', 'X'] + [' '] * 7)
+        cache.put(first, 3, 3, value=1)
+        cache.put(second, 3, 3, value=2)
+        cache.get(first, 3, 3)
+
+        # When
+        cache.put(third, 3, 3, value=3)
+
+        # Then
+        assert cache.get(first, 3, 3) == (1, None)
+        assert cache.get(second, 3, 3) is None
+        assert cache.get(third, 3, 3) == (3, None)
+
+    def test_memory_cap(self):
+        # Given
+        cache = PositionCache(max_bytes=1000)
+
+        # When
+        for cell in range(16):
+            cells = [' '] * 16
+            cells[cell] = 'X'
+            cache.put(cells, 16, 1, value=cell)
+
+        # Then
+        assert cache.nbytes <= 1000
+        assert 0 < len(cache) < 16
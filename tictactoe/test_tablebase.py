@@ -0,0 +1,139 @@
+import pytest
+
+from tictactoe.board import Board
+from tictactoe.codec import encode
+from tictactoe.game import Game
+from tictactoe.tablebase import SolvedPositions, Tablebase, TablebasePlayer, generate, solve
+
+
+@pytest.fixture(scope='module')
+def tablebase_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('tablebase') / '3x3.ttt'
+    generate(str(path))
+    return path
+
+
+def test_encode():
+    assert encode([' ', 'X', 'O'], ['X', 'O']) == 1 * 3 + 2 * 9
+
+
+def test_solve_3x3_state_count():
+    # 5478 legal positions are reachable in standard tic-tac-toe, 765 up to symmetry
+    assert len(solve(3, 3, 3, ['X', 'O'])) == 765
+
+
+def test_solve_needs_2_players():
+    with pytest.raises(ValueError):
+        solve(3, 3, 3, ['X', 'O', '#'])
+
+
+class TestTablebase:
+
+    def test_header(self, tablebase_path):
+        with Tablebase(str(tablebase_path)) as tablebase:
+            assert (tablebase.width, tablebase.height, tablebase.nb_marks) == (3, 3, 3)
+            assert tablebase.players == ['X', 'O']
+            assert tablebase.count == 765
+
+    def test_empty_board_is_draw(self, tablebase_path):
+        with Tablebase(str(tablebase_path)) as tablebase:
+            value, moves = tablebase.lookup([' '] * 9)
+            assert value == 0
+            assert moves == list(range(1, 10))
+
+    def test_winning_position(self, tablebase_path):
+        with Tablebase(str(tablebase_path)) as tablebase:
+            assert tablebase.lookup(['X', 'X', ' ', 'O', 'O', ' ', ' ', ' ', ' ']) == (1, [3])
+
+    @pytest.mark.parametrize('cells, expected', [
+        ([' ', 'X', 'X', ' ', 'O', 'O', ' ', ' ', ' '], (1, [1])),
+        (['X', ' ', ' ', 'X', ' ', ' ', ' ', 'O', 'O'], (1, [7])),
+        (['X', ' ', ' ', ' ', 'O', ' ', ' ', ' ', ' '], (0, [2, 3, 4, 6, 7, 8, 9])),
+        ([' ', ' ', 'X', ' ', 'O', ' ', ' ', ' ', ' '], (0, [1, 2, 4, 6, 7, 8, 9])),
+    ])
+    def test_symmetric_positions(self, tablebase_path, cells, expected):
+        with Tablebase(str(tablebase_path)) as tablebase:
+            assert tablebase.lookup(cells) == expected
+
+    def test_lost_position(self, tablebase_path):
+        with Tablebase(str(tablebase_path)) as tablebase:
+            assert tablebase.lookup(['X', 'X', 'X', 'O', 'O', ' ', ' ', ' ', ' ']) == (-1, [])
+
+    def test_unreachable_position(self, tablebase_path):
+        with Tablebase(str(tablebase_path)) as tablebase:
+            assert tablebase.lookup(['O'] * 9) is None
+
+    def test_invalid_file(self, tmp_path):
+        path = tmp_path / 'invalid.ttt'
+        path.write_bytes(b'\0' * 64)
+        with pytest.raises(ValueError):
+            Tablebase(str(path))
+
+
+def test_tablebase_player(tablebase_path):
+    with Tablebase(str(tablebase_path)) as tablebase:
+        # Given
+        game = Game(engines={'O': TablebasePlayer(tablebase)})
+        game.board.cells = ['X', 'X', ' ', ' ', 'O', ' ', ' ', ' ', ' ']
+
+        # When
+        choice = game.get_player_choice('O')
+
+        # Then
+        assert choice == 3
+
+
+@pytest.mark.parametrize('width, height, nb_marks, players', [
+    (4, 4, 3, ['X', 'O']), (3, 4, 3, ['X', 'O']), (3, 3, 2, ['X', 'O']), (3, 3, 3, ['O', 'X']),
+])
+def test_tablebase_player_other_config(tablebase_path, width, height, nb_marks, players):
+    with Tablebase(str(tablebase_path)) as tablebase:
+        game = Game(width, height, nb_marks, players)
+        with pytest.raises(ValueError):
+            TablebasePlayer(tablebase).get_choice(game, players[0])
+
+
+def test_solved_positions_same_as_tablebase(tablebase_path):
+    # Given
+    solved = SolvedPositions()
+    positions = [[' '] * 9, ['X', 'X', ' ', 'O', 'O', ' ', ' ', ' ', ' '], ['O'] * 9]
+
+    # Then
+    with Tablebase(str(tablebase_path)) as tablebase:
+        for cells in positions:
+            assert solved.lookup(cells) == tablebase.lookup(cells)
+
+
+def test_every_position_same_as_plain_search(tablebase_path):
+    # Given
+    board = Board()
+    expected = {}
+
+    def search(player, other):
+        if tuple(board.cells) in expected:
+            return expected[tuple(board.cells)][0]
+        moves = {}
+        for cell in range(1, 10):
+            if board.is_available(cell):
+                board.place_choice(cell, player)
+                if board.check_victory_at(cell, player, 3):
+                    expected[tuple(board.cells)] = (-1, [])
+                    moves[cell] = 1
+                elif board.is_full():
+                    expected[tuple(board.cells)] = (0, [])
+                    moves[cell] = 0
+                else:
+                    moves[cell] = -search(other, player)
+                board.undo()
+        value = max(moves.values())
+        expected[tuple(board.cells)] = (value, [cell for cell, move in moves.items() if move == value])
+        return value
+
+    # When
+    search('X', 'O')
+
+    # Then
+    assert len(expected) == 5478
+    with Tablebase(str(tablebase_path)) as tablebase:
+        for cells, result in expected.items():
+            assert tablebase.lookup(cells) == result
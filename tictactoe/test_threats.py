@@ -0,0 +1,206 @@
+import random
+import time
+
+import pytest
+
+from tictactoe.ai import NegamaxPlayer
+from tictactoe.board import Board
+from tictactoe.game import Game
+from tictactoe.threats import ThreatTracker, windows
+
+
+@pytest.mark.parametrize('width, height, nb_marks, expected', [(3, 3, 3, 8), (15, 15, 5, 2 * 11 * 11 + 2 * 15 * 11)])
+def test_windows(width, height, nb_marks, expected):
+    cells_windows, windows_by_cell = windows(width, height, nb_marks)
+    assert len(cells_windows) == expected
+    assert sum(len(w) for w in windows_by_cell) == expected * nb_marks
+
+
+class TestThreatTracker:
+
+    def test_runs(self):
+        # Given
+        board = Board()
+        tracker = ThreatTracker(board, 3, ['X', 'O']).attach()
+
+        # When
+        board.place_choice(1, 'X')
+        board.place_choice(2, 'X')
+        board.place_choice(5, 'O')
+
+        # Then
+        # X: first row and first column are open, second column and backward diagonal are blocked by O
+        assert tracker.runs[0] == [0, 1, 1, 0]
+        # O: second row and forward diagonal are open, second column and backward diagonal are blocked by X
+        assert tracker.runs[1] == [0, 2, 0, 0]
+
+    def test_remove_restores_counts(self):
+        # Given
+        board = Board(7, 7)
+        tracker = ThreatTracker(board, 4, ['X', 'O', '#'])
+        rnd = random.Random(0)
+        moves = rnd.sample(range(1, 50), 20)
+        for i, cell in enumerate(moves[:10]):
+            tracker.place(cell, 'XO#'[i % 3])
+        runs = [list(r) for r in tracker.runs]
+        candidates = tracker.candidates()
+
+        # When
+        for i, cell in enumerate(moves[10:]):
+            tracker.place(cell, 'XO#'[i % 3])
+        for i, cell in reversed(list(enumerate(moves[10:]))):
+            tracker.remove(cell, 'XO#'[i % 3])
+
+        # Then
+        assert tracker.runs == runs
+        assert tracker.candidates() == candidates
+
+    def test_same_as_fresh_tracker(self):
+        # Given
+        board = Board(9, 9)
+        tracker = ThreatTracker(board, 5, ['X', 'O']).attach()
+
+        # When
+        for i, cell in enumerate(random.Random(1).sample(range(1, 82), 30)):
+            board.place_choice(cell, 'XO'[i % 2])
+        board.place_choice(board.cells.index('X') + 1, 'O')
+
+        # Then
+        assert tracker.runs == ThreatTracker(board, 5, ['X', 'O']).runs
+
+    def test_candidates_same_as_fresh_tracker(self):
+        # Given
+        board = Board(9, 9)
+        tracker = ThreatTracker(board, 5, ['X', 'O']).attach()
+        rnd = random.Random(2)
+
+        # When
+        for i, cell in enumerate(rnd.sample(range(1, 82), 20)):
+            board.place_choice(cell, 'XO'[i % 2])
+        for _ in range(8):
+            board.undo()
+
+        # Then
+        assert tracker.candidates() == ThreatTracker(board, 5, ['X', 'O']).candidates()
+
+    def test_follows_cells_changes(self):
+        # Given
+        board = Board(9, 9)
+        tracker = ThreatTracker(board, 5, ['X', 'O']).attach()
+        board.place_choice(41, 'X')
+
+        # When
+        board.cells[42] = 'O'
+        board.cells[30:32] = ['X', 'X']
+        board.cells = [' '] * 81
+        board.cells[10] = 'O'
+
+        # Then
+        fresh = ThreatTracker(board, 5, ['X', 'O'])
+        assert tracker.marks == fresh.marks == {10: 1}
+        assert tracker.runs == fresh.runs
+        assert tracker.candidates() == fresh.candidates()
+
+    def test_follows_undo(self):
+        # Given
+        board = Board(9, 9)
+        tracker = ThreatTracker(board, 5, ['X', 'O']).attach()
+        board.place_choice(41, 'X')
+        runs = [list(r) for r in tracker.runs]
+
+        # When
+        board.place_choice(42, 'O')
+        board.place_choice(41, 'O')
+        board.undo()
+        board.undo()
+
+        # Then
+        assert tracker.runs == runs
+        assert tracker.marks == {40: 0}
+
+    def test_candidates(self):
+        # Given
+        board = Board(9, 9)
+        tracker = ThreatTracker(board, 5, ['X', 'O'], radius=1)
+
+        # Then
+        assert tracker.candidates() == [41]
+
+        # When
+        tracker.place(1, 'X')
+
+        # Then
+        assert tracker.candidates() == [2, 10, 11]
+
+    def test_ordered_moves(self):
+        # Given
+        board = Board(15, 15)
+        tracker = ThreatTracker(board, 5, ['X', 'O']).attach()
+        for cell in (17, 18, 19, 20):
+            board.place_choice(cell, 'X')
+        for cell in (100, 101, 102, 103):
+            board.place_choice(cell, 'O')
+
+        # Then
+        assert tracker.ordered_moves('X')[:2] in ([16, 21], [21, 16])
+        assert tracker.threat(21, 'X') == (True, False, tracker.threat(21, 'X')[2])
+        assert tracker.threat(99, 'X')[:2] == (False, True)
+        assert tracker.ordered_moves('O')[:2] in ([99, 104], [104, 99])
+
+    def test_evaluate(self):
+        # Given
+        board = Board(15, 15)
+        tracker = ThreatTracker(board, 5, ['X', 'O']).attach()
+
+        # When
+        board.place_choice(113, 'X')
+
+        # Then
+        assert tracker.evaluate('X') > 0
+        assert tracker.evaluate('O') == -tracker.evaluate('X')
+
+
+class TestThreatSearch:
+
+    def test_blocks_open_four_on_15x15(self):
+        # Given
+        engine = NegamaxPlayer(max_time=1)
+        game = Game(15, 15, nb_marks=5)
+        for cell in (107, 108, 109):
+            game.board.place_choice(cell, 'X')
+        for cell in (1, 225):
+            game.board.place_choice(cell, 'O')
+
+        # When
+        choice = engine.get_choice(game, 'O')
+
+        # Then
+        assert choice in (106, 110)
+
+    @pytest.mark.parametrize('max_time', [0.05, 0.3])
+    def test_time_budget_on_15x15(self, max_time):
+        # Given
+        engine = NegamaxPlayer(max_time=max_time)
+        game = Game(15, 15, nb_marks=5)
+        game.board.place_choice(113, 'X')
+
+        # When
+        start = time.perf_counter()
+        engine.get_choice(game, 'O')
+
+        # Then
+        assert time.perf_counter() - start < max_time + 0.2
+
+    def test_wins_on_15x15(self):
+        # Given
+        game = Game(15, 15, nb_marks=5)
+        for cell in (107, 108, 109, 110):
+            game.board.place_choice(cell, 'X')
+        for cell in (1, 2, 3, 4):
+            game.board.place_choice(cell, 'O')
+
+        # When
+        choice = NegamaxPlayer(max_time=1).get_choice(game, 'X')
+
+        # Then
+        assert choice in (106, 111)
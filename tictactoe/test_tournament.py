@@ -0,0 +1,134 @@
+
+import pytest
+
+from tictactoe import tournament
+from tictactoe.simulation import Config
+from tictactoe.tournament import EloTable, Match, Standing, Tournament, play_match, round_robin, swiss
+
+
+def test_play_match():
+    # Given
+    match = Match(0, Config(), 'heuristic', 'random', 6, 'seed')
+
+    # When
+    result = play_match(match)
+
+    # Then
+    assert len(result.scores) == 6
+    assert set(result.scores) <= {0, 0.5, 1}
+    assert sum(result.scores) >= 3
+    assert play_match(match) == result
+
+
+def test_elo():
+    # Given
+    elo = EloTable(['a', 'b'])
+
+    # When
+    elo.update('a', 'b', 1)
+
+    # Then
+    assert elo.ratings == {'a': 1508, 'b': 1492}
+    assert elo.expected('a', 'b') + elo.expected('b', 'a') == pytest.approx(1)
+    assert elo.expected('a', 'b') > 0.5
+
+
+def test_round_robin():
+    # When
+    matches = round_robin(['a', 'b', 'c'], [Config(3, 3, 3), Config(4, 4, 3)], 0, 2, seed=1)
+
+    # Then
+    assert [match.id for match in matches] == [
+        '0:3x3/3:a:b', '0:3x3/3:a:c', '0:3x3/3:b:c', '0:4x4/3:a:b', '0:4x4/3:a:c', '0:4x4/3:b:c',
+    ]
+    assert len({match.seed for match in matches}) == 6
+
+
+def test_swiss():
+    # Given
+    standings = {policy: Standing() for policy in 'abcde'}
+    standings['c'].wins = standings['d'].wins = 2
+    standings['c'].opponents = ['d']
+    ratings = dict.fromkeys('abcde', 1500.0)
+
+    # When
+    pairs, bye = swiss(standings, ratings)
+
+    # Then
+    assert bye == 'e'
+    assert pairs == [('c', 'a'), ('d', 'b')]
+
+
+class TestTournament:
+
+    @pytest.fixture()
+    def configs(self):
+        return [Config(3, 3, 3), Config(4, 4, 3)]
+
+    def test_round_robin(self, configs):
+        # When
+        table = Tournament(['random', 'heuristic'], configs, rounds=2, nb_games=4, processes=1).run()
+
+        # Then
+        assert [row['policy'] for row in table] == ['heuristic', 'random']
+        assert table[0]['rating'] > table[1]['rating']
+        assert sum(row['wins'] + row['draws'] / 2 for row in table) == 2 * 2 * 4
+
+    def test_swiss(self, configs):
+        # When
+        table = Tournament(['random', 'heuristic', 'search'], configs[:1], 'swiss', rounds=3, nb_games=2,
+                           processes=1).run()
+
+        # Then
+        assert sum(row['byes'] for row in table) == 3 * 2
+        assert table[-1]['policy'] == 'random'
+
+    def test_same_standings_in_process_pool(self, configs):
+        # When
+        in_process = Tournament(['random', 'heuristic'], configs, nb_games=4, processes=1).run()
+        in_pool = Tournament(['random', 'heuristic'], configs, nb_games=4, processes=2).run()
+
+        # Then
+        for row in in_process + in_pool:
+            del row['rating']
+        assert in_pool == in_process
+
+    def test_resume(self, configs, tmp_path, monkeypatch):
+        # Given
+        path = str(tmp_path / 'checkpoint.json')
+        expected = Tournament(['random', 'heuristic', 'search'], configs, 'swiss', 2, 2, 1, checkpoint=path).run()
+        with open(f'{path}.results') as f:
+            lines = f.readlines()
+        with open(f'{path}.results', 'w') as f:
+            f.writelines(lines[:2])
+            f.write(lines[2][:10])
+        played = []
+        monkeypatch.setattr(tournament, 'play_match', lambda match: played.append(match) or play_match(match))
+
+        # When
+        table = Tournament(['random', 'heuristic', 'search'], configs, 'swiss', 2, 2, 1, checkpoint=path).run()
+
+        # Then
+        assert len(played) == 2
+        with open(f'{path}.results') as f:
+            assert len(f.readlines()) == len(lines)
+        assert [{k: v for k, v in row.items() if k != 'rating'} for row in table] == \
+            [{k: v for k, v in row.items() if k != 'rating'} for row in expected]
+
+    def test_other_settings_checkpoint(self, configs, tmp_path):
+        # Given
+        path = str(tmp_path / 'checkpoint.json')
+        Tournament(['random', 'heuristic'], configs, nb_games=2, processes=1, checkpoint=path).run()
+
+        # Then
+        with pytest.raises(ValueError):
+            Tournament(['random', 'heuristic'], configs, nb_games=4, processes=1, checkpoint=path).run()
+
+    @pytest.mark.parametrize('policies, configs, tournament_format', [
+        (['random', 'unknown'], [Config()], 'round-robin'),
+        (['random', 'heuristic'], [Config(players=('X', 'O', '#'))], 'round-robin'),
+        (['random', 'heuristic'], [Config()], 'knockout'),
+    ])
+    def test_invalid(self, policies, configs, tournament_format):
+        with pytest.raises(ValueError):
+            Tournament(policies, configs, tournament_format)
@@ -0,0 +1,227 @@
+"""
+Threat-space move generation and evaluation for large boards.
+
+Every segment of nb_marks cells along the four directions walked by Board.check_victory is a window. A window only
+marked by one player is an open run of that player, its length being the number of marks in the window.
+Open runs counts are updated incrementally for each placed mark, in O(nb_marks) windows.
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from tictactoe.board import DIRECTIONS, Board
+
+
+@lru_cache(maxsize=None)
+def windows(width: int, height: int, nb_marks: int) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]:
+    """
+    List every window of nb_marks cells of a board, once per board configuration.
+
+    :param width: Board width
+    :param height: Board height
+    :param nb_marks: Number of adjacent marks to get a victory
+    :return: Cell indexes (0 based) of each window, and for each cell index the windows going through it
+    """
+    cells_windows: List[Tuple[int, ...]] = []
+    for y in range(height):
+        for x in range(width):
+            for add_x, add_y in DIRECTIONS:
+                end_x = x + add_x * (nb_marks - 1)
+                end_y = y + add_y * (nb_marks - 1)
+                if 0 <= end_x < width and end_y < height:
+                    cells_windows.append(tuple(x + add_x * i + (y + add_y * i) * width for i in range(nb_marks)))
+
+    windows_by_cell: List[List[int]] = [[] for _ in range(width * height)]
+    for window, cells in enumerate(cells_windows):
+        for cell_id in cells:
+            windows_by_cell[cell_id].append(window)
+    return tuple(cells_windows), tuple(tuple(w) for w in windows_by_cell)
+
+
+class ThreatTracker:
+    """
+    Open runs counts and candidate moves of a board, kept up to date as markers are placed or removed.
+    Candidate moves are the empty cells with a mark within radius, kept in a set.
+
+    Once attached, the tracker follows every change of its board cells, rebuilding its state when cells are replaced
+    or changed other than cell by cell. Changes of a board the tracker is not attached to must be reported with place
+    and remove.
+    """
+
+    def __init__(self, board: Board, nb_marks: int, players: Sequence[str], radius: int = 2) -> None:
+        """
+        :param board: Board to track, possibly already marked
+        :param nb_marks: Number of adjacent marks to get a victory
+        :param players: Players markers
+        :param radius: Distance to existing marks within which cells are candidate moves
+        """
+        self.board = board
+        self.nb_marks = nb_marks
+        self.players = list(players)
+        self.radius = radius
+        self.windows, self.cell_windows = windows(board.width, board.height, nb_marks)
+        self.weights = [0] + [10 ** k for k in range(nb_marks)]
+        self.neighbours = self.compute_neighbours()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Rebuild open runs counts and candidate moves from board cells.
+        """
+        self.counts = [[0] * len(self.players) for _ in self.windows]
+        self.runs = [[0] * (self.nb_marks + 1) for _ in self.players]
+        self.marks: Dict[int, int] = {}
+        self.near = [0] * len(self.board)
+        self.open: Set[int] = set()
+        for cell_id, cell in enumerate(self.board.cells):
+            if cell in self.players:
+                self.place(cell_id + 1, cell)
+
+    def compute_neighbours(self) -> List[Tuple[int, ...]]:
+        width, height, radius = self.board.width, self.board.height, self.radius
+        neighbours = []
+        for cell_id in range(width * height):
+            x, y = cell_id % width, cell_id // width
+            neighbours.append(tuple(
+                nx + ny * width
+                for ny in range(max(0, y - radius), min(height, y + radius + 1))
+                for nx in range(max(0, x - radius), min(width, x + radius + 1))
+                if (nx, ny) != (x, y)
+            ))
+        return neighbours
+
+    def attach(self) -> 'ThreatTracker':
+        """
+        Follow changes of tracked board.
+
+        :return: This tracker
+        """
+        self.board.listeners.append(self)
+        return self
+
+    def on_place(self, cell: int, player: str) -> None:
+        self.place(cell, player)
+
+    def on_remove(self, cell: int, player: str) -> None:
+        self.remove(cell, player)
+
+    def on_reset(self) -> None:
+        self.reset()
+
+    def run_of(self, window: int) -> Optional[Tuple[int, int]]:
+        """
+        Get open run of a window.
+
+        :param window: Window index
+        :return: (player index, number of marks) if only one player marked the window, None otherwise
+        """
+        run = None
+        for player, count in enumerate(self.counts[window]):
+            if count:
+                if run is not None:
+                    return None
+                run = (player, count)
+        return run
+
+    def update(self, cell: int, player: str, delta: int) -> None:
+        player_idx = self.players.index(player)
+        for window in self.cell_windows[cell - 1]:
+            run = self.run_of(window)
+            if run is not None:
+                self.runs[run[0]][run[1]] -= 1
+            self.counts[window][player_idx] += delta
+            run = self.run_of(window)
+            if run is not None:
+                self.runs[run[0]][run[1]] += 1
+
+    def place(self, cell: int, player: str) -> None:
+        """
+        Report a marker placed on an empty cell.
+
+        :param cell: Cell number
+        :param player: Player marker
+        """
+        self.update(cell, player, 1)
+        self.marks[cell - 1] = self.players.index(player)
+        self.open.discard(cell - 1)
+        for neighbour in self.neighbours[cell - 1]:
+            self.near[neighbour] += 1
+            if neighbour not in self.marks:
+                self.open.add(neighbour)
+
+    def remove(self, cell: int, player: str) -> None:
+        """
+        Report a marker removed from a cell.
+
+        :param cell: Cell number
+        :param player: Player marker that was on the cell
+        """
+        self.update(cell, player, -1)
+        del self.marks[cell - 1]
+        if self.near[cell - 1]:
+            self.open.add(cell - 1)
+        for neighbour in self.neighbours[cell - 1]:
+            self.near[neighbour] -= 1
+            if not self.near[neighbour]:
+                self.open.discard(neighbour)
+
+    def candidates(self) -> List[int]:
+        """
+        List empty cells near existing marks, or the center cell of an empty board.
+
+        :return: Candidate cell numbers
+        """
+        if not self.marks:
+            return [1 + self.board.width // 2 + (self.board.height // 2) * self.board.width]
+        return [cell_id + 1 for cell_id in sorted(self.open)]
+
+    def threat(self, cell: int, player: str) -> Tuple[bool, bool, int]:
+        """
+        Evaluate threat level of a move.
+
+        :param cell: Empty cell number
+        :param player: Player marker
+        :return: (True if the move wins, True if it blocks a winning move of another player,
+        score of the runs it extends or blocks)
+        """
+        player_idx = self.players.index(player)
+        wins = blocks = False
+        score = 0
+        for window in self.cell_windows[cell - 1]:
+            run = self.run_of(window)
+            if run is None:
+                if not any(self.counts[window]):
+                    score += 1
+                continue
+            owner, count = run
+            if count == self.nb_marks - 1:
+                if owner == player_idx:
+                    wins = True
+                else:
+                    blocks = True
+            score += self.weights[count + 1] if owner == player_idx else self.weights[count]
+        return wins, blocks, score
+
+    def ordered_moves(self, player: str, limit: Optional[int] = None) -> List[int]:
+        """
+        List candidate moves, most threatening first: immediate wins, forced blocks, then by score.
+
+        :param player: Player marker
+        :param limit: Maximum number of moves, None for all candidates
+        :return: Candidate cell numbers
+        """
+        moves = sorted(self.candidates(), key=lambda cell: self.threat(cell, player), reverse=True)
+        return moves if limit is None else moves[:limit]
+
+    def evaluate(self, player: str) -> int:
+        """
+        Heuristic value of the board for a player: weighted open runs of the player minus those of the others.
+
+        :param player: Player marker
+        :return: Board value
+        """
+        player_idx = self.players.index(player)
+        value = 0
+        for idx, runs in enumerate(self.runs):
+            score = sum(weight * count for weight, count in zip(self.weights, runs))
+            value += score if idx == player_idx else -score
+        return value
@@ -0,0 +1,397 @@
+"""
+Tournaments between move policies, played across a process pool, with Elo ratings.
+
+Matches are dispatched one at a time to pool workers with imap_unordered, so that a worker done with a short match
+takes the next pending one instead of waiting for a pre-assigned batch. Results are streamed into the ratings as soon
+as they arrive, and appended to a results log next to the checkpoint file, one JSON line each, so that an interrupted
+tournament resumes without replaying finished matches. The checkpoint file itself only holds settings and schedules,
+and is rewritten once per round.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, TextIO, Tuple
+
+from tictactoe.cli import parse_ints, parse_sizes
+from tictactoe.game import Game
+from tictactoe.simulation import POLICIES, Config
+
+FORMATS = ('round-robin', 'swiss')
+
+
+class Match(NamedTuple):
+    """
+    Games between two policies on a board configuration, each policy playing first in turn.
+    """
+    round_number: int
+    config: Config
+    first: str
+    second: str
+    nb_games: int
+    seed: str
+
+    @property
+    def id(self) -> str:
+        config = f'{self.config.width}x{self.config.height}/{self.config.nb_marks}'
+        return f'{self.round_number}:{config}:{self.first}:{self.second}'
+
+
+class MatchResult(NamedTuple):
+    match: Match
+    scores: List[float]
+    """Score of match first policy in each game: 1 for a win, 0.5 for a draw, 0 for a loss"""
+
+
+def play_match(match: Match) -> MatchResult:
+    """
+    Play the games of a match.
+
+    :param match: Match to play
+    :return: Match result
+    """
+    rnd = random.Random(match.seed)
+    players = match.config.players
+    scores = []
+    for i in range(match.nb_games):
+        policies = (match.first, match.second) if i % 2 == 0 else (match.second, match.first)
+        engines = {player: POLICIES[policy](rnd) for player, policy in zip(players, policies)}
+        game = Game(match.config.width, match.config.height, match.config.nb_marks, list(players), engines=engines)
+        winner = game.play()
+        if winner is None:
+            scores.append(0.5)
+        else:
+            scores.append(1.0 if (winner == players[0]) == (i % 2 == 0) else 0.0)
+    return MatchResult(match, scores)
+
+
+class EloTable:
+    """
+    Elo ratings, updated after every game.
+    """
+
+    def __init__(self, policies: Iterable[str], k: float = 16.0, initial: float = 1500.0) -> None:
+        """
+        :param policies: Rated policies names
+        :param k: Maximum rating change of a game
+        :param initial: Rating of a policy before its first game
+        """
+        self.k = k
+        self.ratings = {policy: initial for policy in policies}
+
+    def expected(self, first: str, second: str) -> float:
+        """
+        Get expected score of a policy against another one.
+
+        :param first: Policy name
+        :param second: Opponent policy name
+        :return: Expected score of first policy, between 0 and 1
+        """
+        return 1 / (1 + 10 ** ((self.ratings[second] - self.ratings[first]) / 400))
+
+    def update(self, first: str, second: str, score: float) -> None:
+        """
+        Update ratings of two policies with a game result.
+
+        :param first: Policy name
+        :param second: Opponent policy name
+        :param score: Score of first policy: 1 for a win, 0.5 for a draw, 0 for a loss
+        """
+        delta = self.k * (score - self.expected(first, second))
+        self.ratings[first] += delta
+        self.ratings[second] -= delta
+
+
+class Standing:
+    """
+    Games results of a policy.
+    """
+
+    def __init__(self) -> None:
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.byes = 0
+        self.opponents: List[str] = []
+
+    @property
+    def points(self) -> float:
+        return self.wins + self.draws / 2 + self.byes
+
+    def to_dict(self) -> Dict:
+        return {'wins': self.wins, 'draws': self.draws, 'losses': self.losses, 'byes': self.byes,
+                'points': self.points}
+
+
+def round_robin(policies: Sequence[str], configs: Sequence[Config], round_number: int, nb_games: int,
+                seed: int) -> List[Match]:
+    """
+    Schedule matches of every policy against every other one, on every configuration.
+
+    :param policies: Policies names
+    :param configs: Board configurations
+    :param round_number: Round number, from 0
+    :param nb_games: Number of games per match
+    :param seed: Tournament seed
+    :return: Matches of the round
+    """
+    pairs = [(first, second) for i, first in enumerate(policies) for second in policies[i + 1:]]
+    return schedule(pairs, configs, round_number, nb_games, seed)
+
+
+def swiss(standings: Dict[str, Standing], ratings: Dict[str, float]) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    """
+    Pair policies with close results, avoiding rematches when possible.
+
+    :param standings: Standing by policy name
+    :param ratings: Rating by policy name, breaking points ties
+    :return: Pairs of policies, and the policy left without opponent (bye) if their number is odd
+    """
+    ranking = sorted(standings, key=lambda p: (-standings[p].points, -ratings[p], p))
+    bye = None
+    if len(ranking) % 2:
+        # Lowest ranked policy which had the fewest byes sits out
+        bye = min(reversed(ranking), key=lambda p: standings[p].byes)
+        ranking.remove(bye)
+
+    pairs = []
+    while ranking:
+        first = ranking.pop(0)
+        second = next((p for p in ranking if p not in standings[first].opponents), ranking[0])
+        ranking.remove(second)
+        pairs.append((first, second))
+    return pairs, bye
+
+
+def schedule(pairs: Sequence[Tuple[str, str]], configs: Sequence[Config], round_number: int, nb_games: int,
+             seed: int) -> List[Match]:
+    """
+    Create matches of given pairs on every configuration.
+
+    :param pairs: Pairs of policies names
+    :param configs: Board configurations
+    :param round_number: Round number, from 0
+    :param nb_games: Number of games per match
+    :param seed: Tournament seed
+    :return: Matches of the round
+    """
+    matches = []
+    for config in configs:
+        for first, second in pairs:
+            match = Match(round_number, config, first, second, nb_games, '')
+            matches.append(match._replace(seed=f'{seed}:{match.id}'))
+    return matches
+
+
+class Tournament:
+    """
+    Round-robin or Swiss tournament between move policies, on several board configurations.
+    """
+
+    def __init__(self, policies: Sequence[str], configs: Sequence[Config], tournament_format: str = 'round-robin',
+                 rounds: int = 1, nb_games: int = 2, processes: Optional[int] = None, seed: int = 0,
+                 checkpoint: Optional[str] = None) -> None:
+        """
+        :param policies: Policies names (keys of POLICIES)
+        :param configs: Board configurations, with 2 players
+        :param tournament_format: One of FORMATS
+        :param rounds: Number of rounds. Every round of a round-robin plays all pairs
+        :param nb_games: Number of games per match, policies playing first in turn
+        :param processes: Number of worker processes, None for one per CPU, 1 to play in current process
+        :param seed: Tournament seed
+        :param checkpoint: JSON file progress is saved to and resumed from, if any. Results are logged to the same
+        path, with a ".results" suffix
+        """
+        if tournament_format not in FORMATS:
+            raise ValueError(f'Unknown tournament format "{tournament_format}"')
+        for policy in policies:
+            if policy not in POLICIES:
+                raise ValueError(f'Unknown policy "{policy}"')
+        for config in configs:
+            if len(config.players) != 2:
+                raise ValueError('Tournament games are played by 2 players')
+        self.policies = list(policies)
+        self.configs = list(configs)
+        self.format = tournament_format
+        self.rounds = rounds
+        self.nb_games = nb_games
+        self.processes = processes
+        self.seed = seed
+        self.checkpoint = checkpoint
+        self.results_log = f'{checkpoint}.results' if checkpoint else None
+
+        self.elo = EloTable(self.policies)
+        self.standings = {policy: Standing() for policy in self.policies}
+        self.schedules: List[List[Match]] = []
+        self.results: Dict[str, MatchResult] = {}
+
+    def settings(self) -> Dict:
+        return {
+            'policies': self.policies,
+            'configs': [list(config) for config in self.configs],
+            'format': self.format,
+            'rounds': self.rounds,
+            'nb_games': self.nb_games,
+            'seed': self.seed,
+        }
+
+    def record(self, result: MatchResult) -> None:
+        """
+        Stream a match result into ratings and standings.
+
+        :param result: Result of a scheduled match
+        """
+        match = result.match
+        self.results[match.id] = result
+        first, second = self.standings[match.first], self.standings[match.second]
+        first.opponents.append(match.second)
+        second.opponents.append(match.first)
+        for score in result.scores:
+            self.elo.update(match.first, match.second, score)
+            if score == 0.5:
+                first.draws += 1
+                second.draws += 1
+            elif score == 1:
+                first.wins += 1
+                second.losses += 1
+            else:
+                first.losses += 1
+                second.wins += 1
+
+    def schedule_round(self, round_number: int) -> List[Match]:
+        """
+        Schedule matches of a round, once previous rounds are over.
+
+        :param round_number: Round number, from 0
+        :return: Matches of the round
+        """
+        if self.format == 'round-robin':
+            return round_robin(self.policies, self.configs, round_number, self.nb_games, self.seed)
+        pairs, bye = swiss(self.standings, self.elo.ratings)
+        if bye is not None:
+            self.standings[bye].byes += self.nb_games * len(self.configs)
+        return schedule(pairs, self.configs, round_number, self.nb_games, self.seed)
+
+    def save(self) -> None:
+        """
+        Write settings and schedules to checkpoint file, atomically so that a crash never leaves a truncated file.
+        """
+        data = {
+            'settings': self.settings(),
+            'schedules': [[match.id for match in matches] for matches in self.schedules],
+            'byes': {policy: standing.byes for policy, standing in self.standings.items()},
+        }
+        tmp_path = f'{self.checkpoint}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.checkpoint)
+
+    @staticmethod
+    def log(log: TextIO, result: MatchResult) -> None:
+        """
+        Append a match result to the results log.
+
+        :param log: Results log, opened for appending
+        :param result: Match result
+        """
+        log.write(json.dumps({'match': result.match.id, 'scores': result.scores}) + '\n')
+        log.flush()
+
+    def load(self) -> None:
+        """
+        Restore progress from checkpoint file, replaying logged results in order.
+        """
+        with open(self.checkpoint) as f:
+            data = json.load(f)
+        if data['settings'] != json.loads(json.dumps(self.settings())):
+            raise ValueError(f'Checkpoint {self.checkpoint} was saved by a tournament with other settings')
+
+        matches = {}
+        for round_number, ids in enumerate(data['schedules']):
+            pairs = [tuple(match_id.split(':')[2:]) for match_id in ids[:len(ids) // len(self.configs)]]
+            scheduled = schedule(pairs, self.configs, round_number, self.nb_games, self.seed)
+            self.schedules.append(scheduled)
+            matches.update((match.id, match) for match in scheduled)
+        for policy, byes in data['byes'].items():
+            self.standings[policy].byes = byes
+        if not os.path.exists(self.results_log):
+            return
+        size = 0
+        with open(self.results_log, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                size += len(line)
+                result = json.loads(line)
+                self.record(MatchResult(matches[result['match']], result['scores']))
+        # Drop a result partially written by an interruption: its match is played again
+        os.truncate(self.results_log, size)
+
+    def run(self) -> List[Dict]:
+        """
+        Play every round of the tournament, resuming from checkpoint file if it exists.
+
+        :return: Final standings, best first
+        """
+        log = None
+        if self.checkpoint:
+            resumed = os.path.exists(self.checkpoint)
+            if resumed:
+                self.load()
+            log = open(self.results_log, 'a' if resumed else 'w')
+
+        pool = Pool(self.processes) if self.processes != 1 else None
+        try:
+            for round_number in range(self.rounds):
+                if round_number == len(self.schedules):
+                    self.schedules.append(self.schedule_round(round_number))
+                    if self.checkpoint:
+                        self.save()
+                pending = [match for match in self.schedules[round_number] if match.id not in self.results]
+                results = pool.imap_unordered(play_match, pending) if pool else map(play_match, pending)
+                for result in results:
+                    self.record(result)
+                    if log:
+                        self.log(log, result)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+            if log:
+                log.close()
+        return self.table()
+
+    def table(self) -> List[Dict]:
+        """
+        :return: Standings and ratings of every policy, best first
+        """
+        rows = [{'policy': policy, 'rating': round(self.elo.ratings[policy], 1), **standing.to_dict()}
+                for policy, standing in self.standings.items()]
+        return sorted(rows, key=lambda row: (-row['points'], -row['rating'], row['policy']))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Play a tournament between move policies')
+    parser.add_argument('--policies', default=','.join(POLICIES), help=f'e.g. {",".join(POLICIES)}')
+    parser.add_argument('--format', choices=FORMATS, default='round-robin')
+    parser.add_argument('--rounds', type=int, default=1)
+    parser.add_argument('--games', type=int, default=10, help='number of games per match')
+    parser.add_argument('--sizes', type=parse_sizes, default=[(3, 3)], help='e.g. 3x3,5x5')
+    parser.add_argument('--nb-marks', type=parse_ints, default=[3], help='e.g. 3,4')
+    parser.add_argument('--processes', type=int, help='number of worker processes, one per CPU by default')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--checkpoint', help='JSON file to save progress to and resume from')
+    args = parser.parse_args(argv)
+
+    configs = [Config(width, height, nb_marks) for width, height in args.sizes for nb_marks in args.nb_marks
+               if nb_marks <= max(width, height)]
+    tournament = Tournament(args.policies.split(','), configs, args.format, args.rounds, args.games,
+                            args.processes, args.seed, args.checkpoint)
+    print(json.dumps(tournament.run(), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())